@@ -26,6 +26,7 @@ from src.domain.schemas import (
     ResponsePadrao,
 )
 from src.exceptions import BusinessException
+from src.infrastructure.env import PROTOCOLO_STREAM_DELTA, PROTOCOLO_STREAM_PADRAO
 from src.infrastructure.realtimeaudio.openai_realtime_client import OpenAIRealTimeClient
 from src.infrastructure.realtimeaudio.tools_realtime import TOOLS
 from src.infrastructure.realtimeaudio.util_realtime import ConfigRealtime, UtilStreams
@@ -123,6 +124,13 @@ async def protected_prompt(
     if client_app_header != "chat-tcu-playground":
         client_app_header = "outros-clientes"
 
+    # clientes que não enviam o header mantêm o formato original do stream
+    protocolo_stream = (
+        PROTOCOLO_STREAM_DELTA
+        if request.headers.get("X-Stream-Protocol") == str(PROTOCOLO_STREAM_DELTA)
+        else PROTOCOLO_STREAM_PADRAO
+    )
+
     try:
         inicio = time.time()
 
@@ -134,6 +142,7 @@ async def protected_prompt(
             token=request.state.decoded_token,
             app_origem=app_origem,
             client_app_header=client_app_header,
+            protocolo_stream=protocolo_stream,
         )
 
         fim = time.time()
@@ -1,8 +1,50 @@
 from fastapi import APIRouter, status
 
+from src.domain.llm.callback.agrupador_tokens import AgrupadorTokens
+from src.domain.llm.retriever.busca_especulativa import BuscaEspeculativa
+from src.domain.llm.util.sumarizador_map_reduce import SumarizadorMapReduce
+from src.infrastructure.azure_blob.blob_client_pool import BlobClientPool
+from src.infrastructure.cognitive_search.embedding_cache import EmbeddingCache
+from src.infrastructure.cognitive_search.filtro_busca_cache import FiltroBuscaCache
+from src.infrastructure.cognitive_search.query_vector_memo import QueryVectorMemo
+from src.infrastructure.cognitive_search.resposta_semantica_cache import (
+    RespostaSemanticaCache,
+)
+from src.infrastructure.cognitive_search.search_client_pool import SearchClientPool
+from src.infrastructure.elasticsearch.elasticsearch_pool import ElasticSearchPool
+from src.infrastructure.entraid_cache import JwksCache, TokenValidadoCache
+from src.infrastructure.event_loop.monitor_event_loop import MonitorEventLoop
+from src.infrastructure.parser_pool.parser_pool import ParserPool
+from src.infrastructure.write_behind.write_behind_queue import WriteBehindQueue
+from src.service.imagem_historico_cache import ImagemHistoricoCache
+from src.service.token_servico_broker import TokenServicoBroker
+
 router = APIRouter()
 
 
 @router.get("/check", status_code=status.HTTP_200_OK, include_in_schema=False)
 def health_check():
     return {"status": "Ok"}
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK, include_in_schema=False)
+def metrics():
+    return {
+        "elasticsearch": ElasticSearchPool.metricas(),
+        "parser_pool": ParserPool.metricas(),
+        "embedding_cache": EmbeddingCache.metricas(),
+        "query_vector_memo": QueryVectorMemo.metricas(),
+        "filtros_busca": FiltroBuscaCache.metricas(),
+        "respostas_em_cache": RespostaSemanticaCache.metricas(),
+        "search_clients": SearchClientPool.metricas(),
+        "blob_clients": BlobClientPool.metricas(),
+        "write_behind": WriteBehindQueue.metricas(),
+        "jwks": JwksCache.metricas(),
+        "tokens_validados": TokenValidadoCache.metricas(),
+        "tokens_servico": TokenServicoBroker.metricas(),
+        "stream_agrupamento": AgrupadorTokens.metricas(),
+        "busca_especulativa": BuscaEspeculativa.metricas(),
+        "sumarizacao_map_reduce": SumarizadorMapReduce.metricas(),
+        "event_loop": MonitorEventLoop.metricas(),
+        "imagens_historico": ImagemHistoricoCache.metricas(),
+    }
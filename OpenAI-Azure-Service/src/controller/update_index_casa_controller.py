@@ -5,6 +5,10 @@ from fastapi import APIRouter, Depends, Request
 from opentelemetry import trace
 
 from src.domain.schemas import ServicoSegedam, ServicoSegedamList
+from src.infrastructure.cognitive_search.resposta_semantica_cache import (
+    RespostaSemanticaCache,
+)
+from src.infrastructure.env import INDEX_NAME_SISTEMA_CASA
 from src.infrastructure.role_checker import RoleChecker
 from src.infrastructure.roles import APEX, COMUM, DESENVOLVEDOR
 from src.service.segedam_service import autaliza_integral, autaliza_parcial
@@ -25,6 +29,9 @@ async def atualizacao_parcial(servicos: ServicoSegedamList, request: Request):
     usr_roles = request.state.decoded_token.roles
     await autaliza_parcial(servicos.root, usr_roles=usr_roles)
 
+    # as respostas em cache podem citar serviços alterados
+    RespostaSemanticaCache.invalidar(INDEX_NAME_SISTEMA_CASA)
+
 
 @router.post(
     "/update/integral",
@@ -35,3 +42,5 @@ async def atualizacao_parcial(servicos: ServicoSegedamList, request: Request):
 async def atualizacao_integral(servicos: ServicoSegedamList, request: Request):
     usr_roles = request.state.decoded_token.roles
     await autaliza_integral(servicos.root, usr_roles=usr_roles)
+
+    RespostaSemanticaCache.invalidar(INDEX_NAME_SISTEMA_CASA)
@@ -446,7 +446,12 @@ async def download_itens(id_item: str, request: Request):
     try:
         login = request.state.decoded_token.login
 
-        return await download_item(id_item, login)
+        return await download_item(
+            id_item,
+            login,
+            range_header=request.headers.get("range"),
+            if_none_match=request.headers.get("if-none-match"),
+        )
     except Exception as erro:
         logger.error(f"Erro ao realizar download do item: {erro}")
         traceback.print_exc()
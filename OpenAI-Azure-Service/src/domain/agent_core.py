@@ -2,6 +2,7 @@ import ast
 import asyncio
 import json
 import logging
+import re
 import time
 import traceback
 from typing import Optional, Union
@@ -15,15 +16,32 @@ from starlette.responses import StreamingResponse
 from src.domain.agent import Agent
 from src.domain.enum.type_tools_enum import TypeToolsEnum
 from src.domain.llm.base.llm_base import LLMBase
+from src.domain.llm.callback.agrupador_tokens import AgrupadorTokens
 from src.domain.llm.rag.retriever_relevant_documents_factory import (
     RetrieverRelevantDocumentsFactory,
 )
 from src.domain.llm.retriever.base_chattcu_retriever import BaseChatTCURetriever
+from src.domain.llm.retriever.busca_especulativa import BuscaEspeculativa
 from src.domain.schemas import ChatGptInput, ChatLLMResponse
-from src.domain.trecho import trecho_para_dict
-from src.infrastructure.env import MODELO_PADRAO_FILTROS, MODELOS, VERBOSE
+from src.domain.trecho import Trecho, trecho_para_dict
+from src.infrastructure.cognitive_search.cognitive_search import CognitiveSearch
+from src.infrastructure.cognitive_search.filtro_busca_cache import FiltroBuscaCache
+from src.infrastructure.cognitive_search.resposta_semantica_cache import (
+    RespostaSemanticaCache,
+)
+from src.infrastructure.env import (
+    INDEX_NAME_SISTEMA_CASA,
+    MODELO_PADRAO_FILTROS,
+    MODELOS,
+    PROTOCOLO_STREAM_DELTA,
+    PROTOCOLO_STREAM_PADRAO,
+    RESPOSTA_CACHE_ATIVO,
+    RESPOSTA_CACHE_TOOLS,
+    VERBOSE,
+)
 from src.infrastructure.env_agent_config import get_agent_config
 from src.infrastructure.security_tokens import DecodedToken
+from src.infrastructure.write_behind.write_behind_queue import WriteBehindQueue
 from src.messaging.chatstop import ChatStop
 
 logger = logging.getLogger(__name__)
@@ -39,6 +57,7 @@ class AgentCore(LLMBase):
         app_origem: str,
         token: DecodedToken,
         client_app_header: str = "chat-tcu-playground",
+        protocolo_stream: int = PROTOCOLO_STREAM_PADRAO,
     ):
         super().__init__(
             chat_id=chat_id, chatinput=chatinput, verbose=VERBOSE, token_usr=token
@@ -48,6 +67,9 @@ class AgentCore(LLMBase):
         self.app_origem = app_origem
         self.token = token
         self.client_app_header = client_app_header
+        self.protocolo_stream = protocolo_stream
+        self.resposta_em_cache: Optional[dict] = None
+        self.chave_cache_resposta: Optional[tuple] = None
 
     async def _prepara_prompt(self):
         if (
@@ -76,7 +98,9 @@ class AgentCore(LLMBase):
         self._acoes_ao_preparar_prompt(self.chatinput, self.agent)
         return self.msg
 
-    async def _buscar_docs_relevantes(self, chatinput: ChatGptInput, resp=None):
+    async def _buscar_docs_relevantes(
+        self, chatinput: ChatGptInput, resp=None, top_documentos=None
+    ):
         logger.info("Buscando documentos do RAG DOCUMENTOS")
 
         separator = ","
@@ -93,7 +117,7 @@ class AgentCore(LLMBase):
         return await self._find_trechos_relevantes(
             token=self.token,
             docs_sel=docs_sel,
-            top_documents=chatinput.top_documentos,
+            top_documents=top_documentos or chatinput.top_documentos,
             resp=resp,
         )
 
@@ -117,7 +141,11 @@ class AgentCore(LLMBase):
                 f"Aguardando a Task {chatinput.correlacao_chamada_id} registrada."
             )
             print("chat_stop agent_core", chat_stop)
-            return await task
+            resposta = await task
+
+            self._armazenar_resposta_em_cache(resposta)
+
+            return resposta
 
         except asyncio.CancelledError:
             logger.info(f"Tarefa {chatinput.correlacao_chamada_id} foi cancelada.")
@@ -133,7 +161,10 @@ class AgentCore(LLMBase):
         inicio = time.time()
 
         try:
-            if self.agent.use_llm_chain:
+            if self.resposta_em_cache is not None:
+                task = asyncio.ensure_future(asyncio.sleep(0))
+                tokens = self._reproduzir_resposta_em_cache()
+            elif self.agent.use_llm_chain:
                 task = self._get_task_llm(
                     self._get_llm(arg_model=chatinput.parametro_modelo_llm),
                     self.prompt,
@@ -156,7 +187,18 @@ class AgentCore(LLMBase):
                     self.callback,
                 )
 
-            async for chunk in self.callback.aiter():
+            if self.resposta_em_cache is None:
+                tokens = self.callback.aiter()
+
+            if self.protocolo_stream == PROTOCOLO_STREAM_DELTA:
+                async for evento in self._gerar_eventos_delta(tokens, task, titulo):
+                    yield evento
+
+                self._armazenar_resposta_em_cache(self.msg2.conteudo)
+
+                return
+
+            async for chunk in AgrupadorTokens().agrupar(tokens):
                 resp = {
                     "chat_id": self.chat_id,
                     "chat_titulo": titulo,
@@ -174,6 +216,8 @@ class AgentCore(LLMBase):
                 yield f"{json.dumps(resp)}\n\n"
 
             await task
+
+            self._armazenar_resposta_em_cache(self.msg2.conteudo)
         except RateLimitError as error:
             error_message = error.message.replace("Error code: 429 - ", "")
             error_message = ast.literal_eval(error_message)
@@ -185,7 +229,7 @@ class AgentCore(LLMBase):
                 "message": f"Erro durante a transmissão: {error_message['message']}",
             }
 
-            yield json.dumps(error_resp)
+            yield self._formatar_erro(error_resp)
         except Exception as error:
             traceback.print_exc()
             error_resp = {
@@ -193,12 +237,90 @@ class AgentCore(LLMBase):
                 "message": f"Erro durante a transmissão: {error}",
             }
 
-            yield json.dumps(error_resp)
+            yield self._formatar_erro(error_resp)
         finally:
             fim = time.time()
 
             logger.info(f"## Tempo total da resposta LLM: {(fim - inicio)}")
 
+    async def _gerar_eventos_delta(self, tokens, task, titulo: str):
+        """Protocolo 2 do stream: um evento "inicio" com os identificadores,
+        um evento "token" por chunk contendo apenas o delta, um evento
+        "trechos" somente quando o conjunto de trechos utilizados muda e um
+        evento "fim" com o resumo da resposta."""
+        yield self._formatar_evento(
+            {
+                "tipo": "inicio",
+                "versao": PROTOCOLO_STREAM_DELTA,
+                "chat_id": self.chat_id,
+                "chat_titulo": titulo,
+                "codigo_prompt": self.msg1.codigo,
+                "codigo_response": self.msg2.codigo,
+                "arquivos_busca": self.msg.arquivos_busca,
+            }
+        )
+
+        trechos_enviados = ()
+        quantidade_chunks = 0
+
+        async for chunk in AgrupadorTokens().agrupar(tokens):
+            quantidade_chunks += 1
+
+            yield self._formatar_evento({"tipo": "token", "response": chunk})
+
+            evento, trechos_enviados = self._evento_trechos_alterados(
+                trechos_enviados
+            )
+
+            if evento:
+                yield evento
+
+        await task
+
+        # trechos identificados após o último chunk
+        evento, trechos_enviados = self._evento_trechos_alterados(trechos_enviados)
+
+        if evento:
+            yield evento
+
+        yield self._formatar_evento(
+            {
+                "tipo": "fim",
+                "codigo_response": self.msg2.codigo,
+                "quantidade_chunks": quantidade_chunks,
+                "quantidade_trechos": len(self.msg2.trechos),
+                "arquivos_busca": self.msg.arquivos_busca,
+            }
+        )
+
+    def _evento_trechos_alterados(self, trechos_enviados: tuple):
+        # a lista de trechos é substituída/ampliada pelo callback durante o
+        # stream; a identidade dos objetos basta para detectar a mudança
+        trechos_atuais = tuple(id(trecho) for trecho in self.msg2.trechos)
+
+        if trechos_atuais == trechos_enviados:
+            return None, trechos_enviados
+
+        evento = self._formatar_evento(
+            {
+                "tipo": "trechos",
+                "trechos": [trecho_para_dict(trecho) for trecho in self.msg2.trechos],
+                "arquivos_busca": self.msg.arquivos_busca,
+            }
+        )
+
+        return evento, trechos_atuais
+
+    @staticmethod
+    def _formatar_evento(evento: dict) -> str:
+        return f"{json.dumps(evento)}\n\n"
+
+    def _formatar_erro(self, error_resp: dict) -> str:
+        if self.protocolo_stream == PROTOCOLO_STREAM_DELTA:
+            return self._formatar_evento({"tipo": "erro", **error_resp})
+
+        return json.dumps(error_resp)
+
     async def executar_prompt(self) -> Union[StreamingResponse, ChatLLMResponse]:
         logger.info(
             "Definindo o modelo selecionado para a devida adição ao registro da mensagem"
@@ -221,6 +343,9 @@ class AgentCore(LLMBase):
                 chat_id=self.chat_id, login=self.token.login
             )
 
+        if await self._buscar_resposta_em_cache():
+            return await self._responder_do_cache(titulo)
+
         await self._prepara_prompt()
 
         await self._registrar_mensagens(chat_id=self.chat_id, chatinput=self.chatinput)
@@ -243,7 +368,121 @@ class AgentCore(LLMBase):
 
         return self._enviar_resposta_por_stream(chatinput=self.chatinput, titulo=titulo)
 
-    async def _prepara_prompt_documentos(self):
+    def _cache_resposta_elegivel(self) -> bool:
+        # respostas que dependem do histórico ou de imagens não são reaproveitadas
+        return (
+            RESPOSTA_CACHE_ATIVO
+            and self.chatinput.tool_selecionada in RESPOSTA_CACHE_TOOLS
+            and not self.historico
+            and not self.chatinput.imagens
+        )
+
+    async def _buscar_resposta_em_cache(self) -> Optional[dict]:
+        if not self._cache_resposta_elegivel():
+            return None
+
+        prompt = self.chatinput.prompt_usuario
+
+        try:
+            # mesmo modelo de embedding (e cache de vetores) da busca do CASA
+            vetor = await CognitiveSearch(
+                index_name=INDEX_NAME_SISTEMA_CASA,
+                chunk_size=1,
+                usr_roles=self.token.roles,
+                login=self.token.login,
+            ).obter_vetor(prompt)
+        except Exception as erro:
+            logger.warning(f"Erro ao gerar o vetor para o cache de respostas: {erro}")
+            return None
+
+        particao = RespostaSemanticaCache.gerar_particao(
+            self.chatinput.tool_selecionada,
+            self.modelo["deployment_name"],
+            self.agent.msg_sistema,
+        )
+
+        self.resposta_em_cache = RespostaSemanticaCache.buscar(particao, prompt, vetor)
+
+        if self.resposta_em_cache is None:
+            # a resposta gerada será armazenada ao final
+            self.chave_cache_resposta = (particao, prompt, vetor)
+
+        return self.resposta_em_cache
+
+    def _armazenar_resposta_em_cache(self, resposta: str):
+        if self.chave_cache_resposta is None or not resposta:
+            return
+
+        particao, prompt, vetor = self.chave_cache_resposta
+        self.chave_cache_resposta = None
+
+        RespostaSemanticaCache.armazenar(
+            particao,
+            prompt,
+            vetor,
+            resposta=resposta,
+            trechos=[trecho_para_dict(trecho) for trecho in self.msg.trechos],
+            arquivos_busca=self.msg.arquivos_busca,
+            indice=(
+                INDEX_NAME_SISTEMA_CASA
+                if self.chatinput.tool_selecionada == "ADMINISTRATIVA"
+                else None
+            ),
+        )
+
+    async def _responder_do_cache(self, titulo: str):
+        """Registra a pergunta e a resposta em cache no chat e a envia no
+        mesmo formato (stream ou não) de uma resposta gerada pelo LLM."""
+        logger.info(f">> {self.token.login} - Respondendo a partir do cache")
+
+        self.msg = self._create_mensagem(
+            chat_id=self.chat_id,
+            chatinput=self.chatinput,
+            agent=self.agent,
+            modelo=self.modelo,
+            historico=self.historico,
+        )
+        self.msg.arquivos_busca = self.resposta_em_cache["arquivos_busca"]
+        self.msg.trechos = [
+            Trecho(**trecho) for trecho in self.resposta_em_cache["trechos"]
+        ]
+
+        self._acoes_ao_preparar_prompt(self.chatinput, self.agent)
+
+        await self._registrar_mensagens(chat_id=self.chat_id, chatinput=self.chatinput)
+
+        self.msg2.conteudo = self.resposta_em_cache["resposta"]
+        self.msg2.trechos = self.msg.trechos
+        self.msg2.arquivos_busca = self.msg.arquivos_busca
+
+        await WriteBehindQueue.enfileirar(
+            self._adicionar_mensagens, self.chat_id, [self.msg, self.msg1, self.msg2]
+        )
+
+        if not self.chatinput.stream and not (
+            self.chatinput.parametro_modelo_llm
+            and self.chatinput.parametro_modelo_llm.startswith("o1")
+            and self.client_app_header == "chat-tcu-playground"
+        ):
+            return ChatLLMResponse(
+                chat_id=self.chat_id,
+                chat_titulo=titulo,
+                codigo_prompt=self.msg1.codigo,
+                response=self.msg2.conteudo,
+                codigo_response=self.msg2.codigo,
+                trechos=self.msg2.trechos,
+                arquivos_busca=self.msg.arquivos_busca,
+            )
+
+        return self._enviar_resposta_por_stream(chatinput=self.chatinput, titulo=titulo)
+
+    async def _reproduzir_resposta_em_cache(self):
+        # palavra a palavra, como os tokens do LLM; o AgrupadorTokens
+        # reúne as palavras em frames
+        for palavra in re.findall(r"\s*\S+\s*", self.resposta_em_cache["resposta"]):
+            yield palavra
+
+    async def _extrair_filtro_documentos(self):
         try:
             self.prompt = (
                 "Responda OBRIGATORIAMENTE em formato json sem markdown "
@@ -255,23 +494,34 @@ class AgentCore(LLMBase):
                 + "texto a seguir: {input}"
             )
 
-            default_callback = self.callback
+            resp = await FiltroBuscaCache.obter(
+                "documentos", self.chatinput.prompt_usuario
+            )
+
+            if resp is None:
+                default_callback = self.callback
 
-            self.callback = OpenAICallbackHandler()
+                self.callback = OpenAICallbackHandler()
 
-            llm = self._get_llm(arg_model=MODELOS[MODELO_PADRAO_FILTROS])
+                llm = self._get_llm(arg_model=MODELOS[MODELO_PADRAO_FILTROS])
 
-            chain = PromptTemplate.from_template(self.prompt) | llm | StrOutputParser()
+                chain = (
+                    PromptTemplate.from_template(self.prompt) | llm | StrOutputParser()
+                )
 
-            a = await chain.ainvoke({"input": self.chatinput.prompt_usuario})
+                a = await chain.ainvoke({"input": self.chatinput.prompt_usuario})
 
-            logger.info(a)
+                logger.info(a)
 
-            resp = json.loads(a)
+                resp = json.loads(a)
 
-            logger.info(resp)
+                self.callback = default_callback
 
-            self.callback = default_callback
+                await FiltroBuscaCache.armazenar(
+                    "documentos", self.chatinput.prompt_usuario, resp
+                )
+
+            logger.info(resp)
         except json.JSONDecodeError as error:
             logger.error(error)
 
@@ -285,6 +535,53 @@ class AgentCore(LLMBase):
         if resp["pergunta"] is None or resp["pergunta"] == "":
             resp["pergunta"] = self.chatinput.prompt_usuario
 
+        return resp
+
+    async def _buscar_docs_relevantes_especulativamente(self):
+        top_documentos = self.chatinput.top_documentos
+
+        resp, especulativo = await BuscaEspeculativa.executar(
+            self._extrair_filtro_documentos(),
+            self._buscar_docs_relevantes(
+                self.chatinput,
+                {
+                    "pergunta": self.chatinput.prompt_usuario,
+                    "pagina_inicial": None,
+                    "pagina_final": None,
+                },
+                top_documentos=BuscaEspeculativa.top_especulativo(top_documentos),
+            ),
+        )
+
+        filtro = None
+
+        if resp.get("pagina_inicial") or resp.get("pagina_final"):
+            inicial = int(resp.get("pagina_inicial") or 0)
+            final = int(resp.get("pagina_final") or 0) or float("inf")
+
+            # equivalente local do filtro montado em _construir_filtro
+            def filtro(trecho):
+                pagina = trecho.pagina_arquivo
+
+                return pagina is not None and inicial <= int(pagina) <= final
+
+        trechos = BuscaEspeculativa.aproveitar(
+            especulativo["trechos"] if especulativo else None,
+            top_documentos,
+            filtro=filtro,
+        )
+
+        if trechos is None:
+            return await self._buscar_docs_relevantes(self.chatinput, resp)
+
+        return {
+            "content": "\n\n".join(
+                f"{trecho.id_registro}: {trecho.conteudo}" for trecho in trechos
+            ),
+            "trechos": trechos,
+        }
+
+    async def _prepara_prompt_documentos(self):
         log = (
             "Quantidade de arquivos selecionados: "
             + f"{len(self.chatinput.arquivos_selecionados)} ({self.chatinput.arquivos_selecionados})\n"
@@ -295,7 +592,11 @@ class AgentCore(LLMBase):
 
         logger.info(log)
 
-        sources = await self._buscar_docs_relevantes(self.chatinput, resp)
+        if BuscaEspeculativa.ativa(self.chatinput.top_documentos):
+            sources = await self._buscar_docs_relevantes_especulativamente()
+        else:
+            resp = await self._extrair_filtro_documentos()
+            sources = await self._buscar_docs_relevantes(self.chatinput, resp)
 
         logger.info(sources)
 
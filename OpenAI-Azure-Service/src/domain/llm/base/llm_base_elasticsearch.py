@@ -1,6 +1,7 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import List
+from typing import List, Set, Tuple
 
 from src.conf.env import configs
 from src.domain.chat import Chat, Credencial
@@ -8,9 +9,14 @@ from src.domain.mensagem import Mensagem
 from src.domain.papel_enum import PapelEnum
 from src.domain.schemas import ChatGptInput
 from src.infrastructure.elasticsearch.elasticsearch import ElasticSearch
-from src.infrastructure.env import INDICE_ELASTIC, QTD_MAX_CARACTERES_TITULO
+from src.infrastructure.env import (
+    HISTORICO_IMAGENS_ULTIMOS_TURNOS,
+    HISTORICO_MAX_IMAGENS,
+    INDICE_ELASTIC,
+    QTD_MAX_CARACTERES_TITULO,
+)
 from src.infrastructure.security_tokens import DecodedToken
-from src.service.image_service import binario_to_base64, get_imagem_do_blob
+from src.service.imagem_historico_cache import ImagemHistoricoCache
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +57,35 @@ class LLMBaseElasticSearch:
 
         return chat.id, titulo
 
+    @staticmethod
+    def _selecionar_imagens_historico(mensagens) -> Set[Tuple[int, str]]:
+        """Seleciona as imagens do histórico enviadas ao modelo, identificadas
+        por (índice da mensagem, imagem): as dos últimos
+        HISTORICO_IMAGENS_ULTIMOS_TURNOS turnos e, dessas, as últimas
+        HISTORICO_MAX_IMAGENS."""
+        selecionadas = []
+        turnos = 0
+
+        for indice in range(len(mensagens) - 1, -1, -1):
+            msg = mensagens[indice]
+
+            if msg.papel == PapelEnum.SYSTEM.name:
+                continue
+
+            for img in reversed(msg.imagens or []):
+                selecionadas.append((indice, img))
+
+            if msg.papel == PapelEnum.USER.name:
+                turnos += 1
+
+                if turnos == HISTORICO_IMAGENS_ULTIMOS_TURNOS:
+                    break
+
+        if HISTORICO_MAX_IMAGENS > 0:
+            selecionadas = selecionadas[:HISTORICO_MAX_IMAGENS]
+
+        return set(selecionadas)
+
     @staticmethod
     async def _carregar_historico_para_prompt(chat_id: str, login: str):
         elastic = ElasticSearch(
@@ -65,34 +100,59 @@ class LLMBaseElasticSearch:
         historico = []
 
         if chat and len(chat.mensagens) > 0:
-            for msg in chat.mensagens:
+            selecionadas = LLMBaseElasticSearch._selecionar_imagens_historico(
+                chat.mensagens
+            )
+
+            # as imagens são obtidas em paralelo, em geral do cache
+            ids_imagens = list({img for _, img in selecionadas})
+            resultados = await asyncio.gather(
+                *(ImagemHistoricoCache.obter(img) for img in ids_imagens),
+                return_exceptions=True,
+            )
+            imagens = dict(zip(ids_imagens, resultados))
+
+            for indice, msg in enumerate(chat.mensagens):
 
                 if msg.papel != PapelEnum.SYSTEM.name:
                     content = (
                         [{"type": "text", "text": msg.conteudo}] if msg.conteudo else []
                     )
-
-                    if msg.imagens:
-                        for img in msg.imagens:
-
-                            try:
-                                image_binario = await get_imagem_do_blob(img)
-
-                                image_base64 = binario_to_base64(image_binario)
-
-                                image_message = {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{image_base64}",
-                                        "detail": "high",
-                                    },
-                                }
-
-                                content.append(image_message)
-
-                            except Exception as e:
-                                logger.error(f"Erro ao processar imagem {img}: {e}")
-                                continue
+                    omitidas = 0
+
+                    for img in msg.imagens or []:
+                        if (indice, img) not in selecionadas:
+                            omitidas += 1
+                            continue
+
+                        image_base64 = imagens.get(img)
+
+                        if image_base64 is None or isinstance(
+                            image_base64, BaseException
+                        ):
+                            logger.error(
+                                f"Erro ao processar imagem {img}: {image_base64}"
+                            )
+                            continue
+
+                        image_message = {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{image_base64}",
+                                "detail": "high",
+                            },
+                        }
+
+                        content.append(image_message)
+
+                    if omitidas:
+                        content.append(
+                            {
+                                "type": "text",
+                                "text": f"[{omitidas} imagem(ns) enviada(s) "
+                                + "anteriormente, omitida(s) do histórico]",
+                            }
+                        )
 
                     historico.append(
                         {"role": f"{msg.papel}".lower(), "content": content}
@@ -115,8 +175,13 @@ class LLMBaseElasticSearch:
         for msg in mensagens:
             logger.info(f"Tipo: {msg.papel.value} - Modelo: {msg.parametro_modelo_llm}")
 
-            await LLMBaseElasticSearch._adicionar_mensagem(
-                cod_chat=cod_chat, mensagem=msg
-            )
+        elastic = ElasticSearch(
+            configs.ELASTIC_LOGIN,
+            configs.ELASTIC_PASSWORD,
+            configs.ELASTIC_URL,
+            INDICE_ELASTIC,
+        )
+
+        await elastic.adicionar_mensagens(cod_chat=cod_chat, mensagens=mensagens)
 
         logger.info(">> MENSAGENS ADICIONADAS COM SUCESSO")
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.infrastructure.env import STREAM_AGRUPAMENTO_BYTES, STREAM_AGRUPAMENTO_MS
+
+
+class AgrupadorTokens:
+    """Agrupa os tokens emitidos pelo callback do LLM antes da escrita no
+    StreamingResponse, reduzindo a quantidade de frames (e de escritas no
+    socket) por resposta.
+
+    O primeiro token é repassado imediatamente, preservando o tempo até o
+    primeiro byte. Os seguintes são acumulados e enviados após
+    STREAM_AGRUPAMENTO_MS milissegundos ou STREAM_AGRUPAMENTO_BYTES bytes, o
+    que ocorrer primeiro."""
+
+    _metricas: Dict[str, float] = {
+        "respostas": 0,
+        "frames": 0,
+        "tokens": 0,
+        "descargas": 0,
+        "descargas_por_tempo": 0,
+        "descargas_por_tamanho": 0,
+        "latencia_descarga_total_ms": 0.0,
+        "latencia_descarga_max_ms": 0.0,
+    }
+
+    def __init__(
+        self,
+        intervalo_ms: int = STREAM_AGRUPAMENTO_MS,
+        limite_bytes: int = STREAM_AGRUPAMENTO_BYTES,
+    ):
+        self.intervalo = intervalo_ms / 1000
+        self.limite_bytes = limite_bytes
+        self.frames = 0
+
+        self._buffer: List[str] = []
+        self._bytes = 0
+        self._inicio_buffer = 0.0
+
+    def _acumular(self, token: str):
+        if not self._buffer:
+            self._inicio_buffer = time.monotonic()
+
+        self._buffer.append(token)
+        self._bytes += len(token.encode("utf-8"))
+
+    def _descarregar(self) -> str:
+        latencia_ms = (time.monotonic() - self._inicio_buffer) * 1000
+        frame = "".join(self._buffer)
+
+        self._buffer = []
+        self._bytes = 0
+        self._registrar_frame()
+
+        cls = type(self)
+        cls._metricas["descargas"] += 1
+        cls._metricas["latencia_descarga_total_ms"] += latencia_ms
+        cls._metricas["latencia_descarga_max_ms"] = max(
+            cls._metricas["latencia_descarga_max_ms"], latencia_ms
+        )
+
+        return frame
+
+    def _registrar_frame(self):
+        self.frames += 1
+        type(self)._metricas["frames"] += 1
+
+    async def agrupar(self, tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+        type(self)._metricas["respostas"] += 1
+
+        if self.intervalo <= 0 and self.limite_bytes <= 0:
+            async for token in tokens:
+                type(self)._metricas["tokens"] += 1
+                self._registrar_frame()
+
+                yield token
+
+            return
+
+        iterador = tokens.__aiter__()
+        proximo: Optional[asyncio.Future] = None
+        primeiro = True
+
+        try:
+            while True:
+                if proximo is None:
+                    proximo = asyncio.ensure_future(iterador.__anext__())
+
+                prazo = None
+
+                if self._buffer and self.intervalo > 0:
+                    prazo = max(
+                        0.0, self._inicio_buffer + self.intervalo - time.monotonic()
+                    )
+
+                # a leitura pendente não é cancelada ao fim do prazo: o
+                # próximo token continua sendo aguardado após a descarga
+                concluidas, _ = await asyncio.wait({proximo}, timeout=prazo)
+
+                if not concluidas:
+                    type(self)._metricas["descargas_por_tempo"] += 1
+
+                    yield self._descarregar()
+                    continue
+
+                leitura, proximo = proximo, None
+
+                try:
+                    token = leitura.result()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    # o texto já recebido é entregue antes do erro
+                    if self._buffer:
+                        yield self._descarregar()
+
+                    raise
+
+                type(self)._metricas["tokens"] += 1
+
+                if primeiro:
+                    primeiro = False
+                    self._registrar_frame()
+
+                    yield token
+                    continue
+
+                self._acumular(token)
+
+                if self.limite_bytes > 0 and self._bytes >= self.limite_bytes:
+                    type(self)._metricas["descargas_por_tamanho"] += 1
+
+                    yield self._descarregar()
+
+            if self._buffer:
+                yield self._descarregar()
+        finally:
+            if proximo is not None and not proximo.done():
+                proximo.cancel()
+
+    @classmethod
+    def limpar(cls):
+        for chave in cls._metricas:
+            cls._metricas[chave] = 0
+
+    @classmethod
+    def metricas(cls) -> dict:
+        respostas = cls._metricas["respostas"]
+        descargas = cls._metricas["descargas"]
+
+        return {
+            **cls._metricas,
+            "frames_por_resposta": (
+                round(cls._metricas["frames"] / respostas, 2) if respostas else 0
+            ),
+            "tokens_por_frame": (
+                round(cls._metricas["tokens"] / cls._metricas["frames"], 2)
+                if cls._metricas["frames"]
+                else 0
+            ),
+            "latencia_descarga_media_ms": (
+                round(cls._metricas["latencia_descarga_total_ms"] / descargas, 2)
+                if descargas
+                else 0
+            ),
+        }
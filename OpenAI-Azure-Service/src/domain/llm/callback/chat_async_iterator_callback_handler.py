@@ -5,8 +5,9 @@ from typing import Any, List
 from langchain.callbacks import AsyncIteratorCallbackHandler
 from langchain.schema import LLMResult
 
-from src.domain.llm.util.util import filtrar_trechos_utilizados
+from src.domain.llm.util.util import LocalizadorCitacoes, filtrar_trechos_utilizados
 from src.domain.mensagem import Mensagem
+from src.infrastructure.write_behind.write_behind_queue import WriteBehindQueue
 from src.service.quota_service import update_quota
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class ChatAsyncIteratorCallbackHandler(AsyncIteratorCallbackHandler):
         self.is_with_tools = None
         self.model = model
         self.prompt = None
+        self.localizador_citacoes = None
 
     def set_is_with_tools(self, is_with_tools):
         self.is_with_tools = is_with_tools
@@ -58,9 +60,7 @@ class ChatAsyncIteratorCallbackHandler(AsyncIteratorCallbackHandler):
             "Arquivos",
             "Normativos do TCU",
         ):
-            trechos_utilizados = filtrar_trechos_utilizados(
-                self.msg_sistema.trechos, self.acumulado
-            )
+            trechos_utilizados = self._localizar_citacoes(token)
         elif self.msg_sistema.trechos:
             trechos_utilizados = self.msg_sistema.trechos
 
@@ -69,6 +69,22 @@ class ChatAsyncIteratorCallbackHandler(AsyncIteratorCallbackHandler):
 
         await super().on_llm_new_token(token, **kwargs)
 
+    def _localizar_citacoes(self, token: str) -> List:
+        trechos = self.msg_sistema.trechos
+
+        # os trechos podem ser definidos após o início do stream (ex.: pela
+        # execução de uma tool); nesse caso o texto acumulado é reprocessado
+        if (
+            self.localizador_citacoes is None
+            or self.localizador_citacoes.trechos is not trechos
+            or self.localizador_citacoes.quantidade_trechos != len(trechos)
+        ):
+            self.localizador_citacoes = LocalizadorCitacoes(trechos)
+
+            return self.localizador_citacoes.adicionar(self.acumulado)
+
+        return self.localizador_citacoes.adicionar(token)
+
     async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
         resposta = response.generations[0][0].text
 
@@ -95,7 +111,8 @@ class ChatAsyncIteratorCallbackHandler(AsyncIteratorCallbackHandler):
         self.msg_resposta.trechos = trechos_utilizados
         self.msg_resposta.arquivos_busca = arquivos_busca
 
-        await self.acao(self.chat_id, self.msg)
+        # a gravação não atrasa o término do stream
+        await WriteBehindQueue.enfileirar(self.acao, self.chat_id, self.msg)
 
         self.is_tool_call = None
 
@@ -103,13 +120,14 @@ class ChatAsyncIteratorCallbackHandler(AsyncIteratorCallbackHandler):
         # logger.info(f"Model: {self.model}")
         if self.model and "claude" in self.model["deployment_name"]:
             try:
-                await update_quota(
+                await WriteBehindQueue.enfileirar(
+                    update_quota,
                     "claude-aws-quota",
                     self.prompt,
                     resposta,
                     self.model["deployment_name"],
                 )
-                logger.info("Enviada request de quota update")
+                logger.info("Agendada request de quota update")
             except Exception as erro:
                 logger.error(
                     f"Não foi possível enviar request de update para a API de Quotas: {erro}"
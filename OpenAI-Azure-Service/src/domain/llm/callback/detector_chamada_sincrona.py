@@ -0,0 +1,31 @@
+import asyncio
+from typing import Any, Dict, List
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.infrastructure.event_loop.monitor_event_loop import MonitorEventLoop
+
+
+class DetectorChamadaSincronaLLM(BaseCallbackHandler):
+    """Registra as invocações síncronas do LLM (ex.: llm([...]), invoke)
+    feitas a partir da thread do event loop, que o bloqueiam durante toda a
+    geração. Nas invocações assíncronas, o langchain executa os callbacks
+    síncronos em uma thread do executor, onde não há loop em execução."""
+
+    def _verificar(self, serialized: Dict[str, Any]):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        MonitorEventLoop.registrar_chamada_sincrona(
+            (serialized or {}).get("name", "desconhecido")
+        )
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs):
+        self._verificar(serialized)
+
+    def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: List[List[Any]], **kwargs
+    ):
+        self._verificar(serialized)
@@ -11,8 +11,11 @@ from openai import AsyncAzureOpenAI
 from opentelemetry import trace
 
 from src.conf.env import configs
+from src.domain.llm.callback.detector_chamada_sincrona import (
+    DetectorChamadaSincronaLLM,
+)
 from src.exceptions import ServiceException
-from src.infrastructure.env import GEMINI_API_KEY
+from src.infrastructure.env import GEMINI_API_KEY, MONITOR_EVENT_LOOP_ATIVO
 from src.infrastructure.roles import DESENVOLVEDOR
 from src.infrastructure.security_tokens import DecodedToken
 
@@ -153,7 +156,8 @@ class ModelFactory(ABC):
 
             try:
                 for callback in callbacks:
-                    callback.set_is_with_tools(is_with_tools)
+                    if hasattr(callback, "set_is_with_tools"):
+                        callback.set_is_with_tools(is_with_tools)
             except Exception as err:
                 logger.error(err)
 
@@ -209,6 +213,12 @@ class ModelFactory(ABC):
         if newkwargs["is_with_tools"] is None:
             newkwargs["is_with_tools"] = False
 
+        if MONITOR_EVENT_LOOP_ATIVO:
+            newkwargs["callbacks"] = [
+                *(newkwargs["callbacks"] or []),
+                DetectorChamadaSincronaLLM(),
+            ]
+
         return newkwargs
 
     @tracer.start_as_current_span("get_model")
@@ -3,6 +3,7 @@ from typing import Optional
 
 from src.domain.agent_core import AgentCore
 from src.domain.schemas import ChatGptInput
+from src.infrastructure.env import PROTOCOLO_STREAM_PADRAO
 from src.infrastructure.env_agent_config import get_agent_config
 from src.infrastructure.roles import DESENVOLVEDOR
 from src.infrastructure.security_tokens import DecodedToken
@@ -20,6 +21,7 @@ class EngineFactory:
         token: DecodedToken,
         app_origem: str,
         client_app_header: str,
+        protocolo_stream: int = PROTOCOLO_STREAM_PADRAO,
     ):
         agent = None
         if (
@@ -50,6 +52,7 @@ class EngineFactory:
             app_origem=app_origem,
             token=token,
             client_app_header=client_app_header,
+            protocolo_stream=protocolo_stream,
         )
 
     @staticmethod
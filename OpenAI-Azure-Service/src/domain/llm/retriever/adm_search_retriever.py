@@ -14,11 +14,13 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.domain.llm.retriever.base_chattcu_retriever import BaseChatTCURetriever
+from src.domain.llm.retriever.busca_especulativa import BuscaEspeculativa
 from src.domain.mensagem import Mensagem
 from src.domain.nome_indice_enum import NomeIndiceEnum
 from src.domain.tipo_busca_enum import TipoBuscaEnum
 from src.domain.trecho import Trecho
 from src.infrastructure.cognitive_search.cognitive_search import CognitiveSearch
+from src.infrastructure.cognitive_search.filtro_busca_cache import FiltroBuscaCache
 from src.infrastructure.env import INDEX_NAME_SISTEMA_CASA
 
 logger = logging.getLogger(__name__)
@@ -59,31 +61,24 @@ class AdmSearchRetriever(BaseRetriever, BaseChatTCURetriever):
                           deixe apenas palavras-chave relevantes para uma busca textual precisa.  
             Segue o texto para reformulação:\n{query}"""
 
+        em_cache = await FiltroBuscaCache.obter("administrativa", query)
+
+        if em_cache is not None:
+            return em_cache["pergunta"]
+
         chain = ChatPromptTemplate.from_template(prompt) | self.llm | StrOutputParser()
 
         resp = await chain.ainvoke({"query": query})
 
         logger.info(f">>> Pergunta parafraseada: {resp}")
-        return resp
-
-    async def get_trechos_relevantes(self):
-        inicio = time.time()
-
-        self.system_message.arquivos_busca = "Sistema CASA"
 
-        cogs = CognitiveSearch(
-            index_name=INDEX_NAME_SISTEMA_CASA,
-            chunk_size=1,
-            usr_roles=self.usr_roles,
-            login=self.login,
-        )
+        await FiltroBuscaCache.armazenar("administrativa", query, {"pergunta": resp})
 
-        pergunta_parafraseada = await self._get_pergunta_parafraseada(
-            self.prompt_usuario
-        )
+        return resp
 
+    async def _pesquisar(self, cogs: CognitiveSearch, pergunta: str, top) -> List[dict]:
         similarity_docs = await cogs.buscar_trechos_relevantes(
-            search_text=pergunta_parafraseada,
+            search_text=pergunta,
             filtro=None,
             selecao=[
                 "nome_servico",
@@ -97,14 +92,59 @@ class AdmSearchRetriever(BaseRetriever, BaseChatTCURetriever):
                 "codigo_servico",
             ],
             search_fields=None,
-            top=self.top_k,
+            top=top,
             using_vectors=True,
         )
 
+        return await BuscaEspeculativa.listar(similarity_docs)
+
+    async def _buscar(self, cogs: CognitiveSearch) -> List[dict]:
+        if not BuscaEspeculativa.ativa(self.top_k):
+            pergunta_parafraseada = await self._get_pergunta_parafraseada(
+                self.prompt_usuario
+            )
+
+            return await self._pesquisar(cogs, pergunta_parafraseada, self.top_k)
+
+        pergunta_parafraseada, especulativos = await BuscaEspeculativa.executar(
+            self._get_pergunta_parafraseada(self.prompt_usuario),
+            self._pesquisar(
+                cogs,
+                self.prompt_usuario,
+                BuscaEspeculativa.top_especulativo(self.top_k),
+            ),
+        )
+
+        docs = BuscaEspeculativa.aproveitar(
+            especulativos,
+            self.top_k,
+            pergunta=pergunta_parafraseada,
+            campos=["nome_servico", "palavras_chave", "descricao_servico"],
+        )
+
+        if docs is None:
+            docs = await self._pesquisar(cogs, pergunta_parafraseada, self.top_k)
+
+        return docs
+
+    async def get_trechos_relevantes(self):
+        inicio = time.time()
+
+        self.system_message.arquivos_busca = "Sistema CASA"
+
+        cogs = CognitiveSearch(
+            index_name=INDEX_NAME_SISTEMA_CASA,
+            chunk_size=1,
+            usr_roles=self.usr_roles,
+            login=self.login,
+        )
+
+        similarity_docs = await self._buscar(cogs)
+
         docs = []
         trechos = []
 
-        async for doc in similarity_docs:
+        for doc in similarity_docs:
             conteudo = (
                 doc["nome_servico"]
                 + ": "
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import re
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.infrastructure.env import BUSCA_ESPECULATIVA_ATIVA, BUSCA_ESPECULATIVA_FATOR_TOP
+
+logger = logging.getLogger(__name__)
+
+
+class BuscaEspeculativa:
+    """Executa a busca de trechos com o prompt original do usuário em paralelo
+    à chamada ao LLM que extrai os filtros e a pergunta para a engine de
+    busca, retirando essa chamada do caminho crítico até o primeiro token.
+
+    Quando os filtros extraídos podem ser aplicados sobre os resultados
+    especulativos (e ainda restam top_k trechos), esses resultados são
+    reordenados pelos termos da pergunta extraída e reaproveitados; caso
+    contrário, a busca é refeita com os filtros, como antes."""
+
+    _metricas: Dict[str, int] = {
+        "reaproveitadas": 0,
+        "filtradas": 0,
+        "descartadas": 0,
+        "falhas": 0,
+    }
+
+    @staticmethod
+    def ativa(top_k: Optional[int]) -> bool:
+        # sem top_k a busca já retorna todos os resultados
+        return BUSCA_ESPECULATIVA_ATIVA and bool(top_k)
+
+    @staticmethod
+    def top_especulativo(top_k: int) -> int:
+        return top_k * max(1, BUSCA_ESPECULATIVA_FATOR_TOP)
+
+    @staticmethod
+    async def listar(resultados) -> List[dict]:
+        """Materializa o iterador assíncrono retornado pelo AI Search."""
+        return [doc async for doc in resultados]
+
+    @classmethod
+    async def executar(
+        cls, extracao: Awaitable[Any], busca: Awaitable[Any]
+    ) -> Tuple[Any, Any]:
+        """Aguarda a extração dos filtros e a busca especulativa, executadas
+        concorrentemente. Uma falha na busca especulativa não interrompe o
+        fluxo: o resultado retornado é None e a busca é refeita."""
+        tarefa_busca = asyncio.ensure_future(busca)
+
+        try:
+            extraido = await extracao
+        except BaseException:
+            tarefa_busca.cancel()
+            raise
+
+        try:
+            especulativo = await tarefa_busca
+        except Exception as erro:
+            cls._metricas["falhas"] += 1
+            logger.warning(f"Erro na busca especulativa: {erro}")
+
+            especulativo = None
+
+        return extraido, especulativo
+
+    @classmethod
+    def aproveitar(
+        cls,
+        docs: Optional[List[dict]],
+        top_k: int,
+        pergunta: Optional[str] = None,
+        campos: Iterable[str] = (),
+        filtro: Optional[Callable[[dict], bool]] = None,
+    ) -> Optional[List[dict]]:
+        """Retorna os top_k resultados especulativos que atendem ao filtro,
+        reordenados pela pergunta extraída, ou None quando a busca precisa ser
+        refeita (docs None ou menos de top_k resultados após o filtro)."""
+        if docs is None:
+            cls._metricas["descartadas"] += 1
+            return None
+
+        if filtro is not None:
+            docs = [doc for doc in docs if filtro(doc)]
+
+            if len(docs) < top_k:
+                cls._metricas["descartadas"] += 1
+                return None
+
+            cls._metricas["filtradas"] += 1
+        else:
+            cls._metricas["reaproveitadas"] += 1
+
+        if pergunta:
+            docs = reordenar_por_termos(docs, pergunta, campos)
+
+        return docs[:top_k]
+
+    @classmethod
+    def descartar(cls):
+        cls._metricas["descartadas"] += 1
+
+    @classmethod
+    def limpar(cls):
+        for chave in cls._metricas:
+            cls._metricas[chave] = 0
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return dict(cls._metricas)
+
+
+def _termos(texto: str) -> set:
+    texto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+
+    # palavras curtas (artigos, preposições) não discriminam os resultados
+    return {termo for termo in re.findall(r"\w+", texto) if len(termo) > 2}
+
+
+def reordenar_por_termos(
+    docs: List[dict], pergunta: str, campos: Iterable[str]
+) -> List[dict]:
+    """Ordena (de forma estável) os resultados pela quantidade de termos da
+    pergunta presentes nos campos informados; empates mantêm a ordem de
+    relevância original da busca."""
+    termos = _termos(pergunta)
+    campos = list(campos)
+
+    if not termos or not campos:
+        return list(docs)
+
+    def cobertura(doc: dict) -> int:
+        return len(termos & _termos(" ".join(str(doc.get(c) or "") for c in campos)))
+
+    return sorted(docs, key=cobertura, reverse=True)
@@ -16,12 +16,14 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.domain.llm.retriever.base_chattcu_retriever import BaseChatTCURetriever
+from src.domain.llm.retriever.busca_especulativa import BuscaEspeculativa
 from src.domain.llm.util.util import get_ministros_as_string
 from src.domain.mensagem import Mensagem
 from src.domain.nome_indice_enum import NomeIndiceEnum
 from src.domain.tipo_busca_enum import TipoBuscaEnum
 from src.domain.trecho import Trecho
 from src.infrastructure.cognitive_search.cognitive_search import CognitiveSearch
+from src.infrastructure.cognitive_search.filtro_busca_cache import FiltroBuscaCache
 from src.infrastructure.env import FUSO_HORARIO, INDEX_NAME_JURISPRUDENCIA
 
 logger = logging.getLogger(__name__)
@@ -75,21 +77,37 @@ class JurisprudenciaSearchRetriever(BaseRetriever, BaseChatTCURetriever):
                 + "citada no texto a seguir: \n{prompt}"
             )
 
-            chain = (
-                ChatPromptTemplate.from_template(prompt) | self.llm | StrOutputParser()
-            )
+            # anos relativos ("últimos dois anos") dependem da data atual
+            dia_atual = datetime.now(FUSO_HORARIO).strftime("%d.%m.%Y")
 
-            resp = await chain.ainvoke(
-                {
-                    "prompt": self.prompt_usuario,
-                    "data_atual": datetime.now(FUSO_HORARIO).strftime("%d.%m.%Y %H:%M"),
-                }
+            resp = await FiltroBuscaCache.obter(
+                "jurisprudencia", self.prompt_usuario, contexto=dia_atual
             )
 
-            logger.info(resp)
+            if resp is None:
+                chain = (
+                    ChatPromptTemplate.from_template(prompt)
+                    | self.llm
+                    | StrOutputParser()
+                )
 
-            # converte a resposta
-            resp = json.loads(resp)
+                resp = await chain.ainvoke(
+                    {
+                        "prompt": self.prompt_usuario,
+                        "data_atual": datetime.now(FUSO_HORARIO).strftime(
+                            "%d.%m.%Y %H:%M"
+                        ),
+                    }
+                )
+
+                logger.info(resp)
+
+                # converte a resposta
+                resp = json.loads(resp)
+
+                await FiltroBuscaCache.armazenar(
+                    "jurisprudencia", self.prompt_usuario, resp, contexto=dia_atual
+                )
 
             logger.info(resp)
         except json.JSONDecodeError as error:
@@ -129,23 +147,11 @@ class JurisprudenciaSearchRetriever(BaseRetriever, BaseChatTCURetriever):
     ) -> List[schema.Document]:
         return await self.get_trechos_relevantes()
 
-    async def get_trechos_relevantes(self):
-        logger.info("Jurisprudência Retriever")
-        logger.info(f"PromptUSR: {self.prompt_usuario}")
-
-        inicio = time.time()
-
-        # define a fonte de informação antecipadamente para registro de que entrou na tool
-        self.system_message.arquivos_busca = "Jurisprudência Selecionada"
-
-        cogs = CognitiveSearch(
-            index_name=INDEX_NAME_JURISPRUDENCIA, chunk_size=1, usr_roles=self.usr_roles
-        )
-
-        filtro, resp = await self.__get_filtro()
-
+    async def _pesquisar(
+        self, cogs: CognitiveSearch, pergunta: str, filtro: Optional[str], top
+    ) -> List[dict]:
         similarity_docs = await cogs.buscar_trechos_relevantes(
-            search_text=resp["pergunta"],
+            search_text=pergunta,
             filtro=filtro,
             selecao=[
                 "id",
@@ -160,15 +166,78 @@ class JurisprudenciaSearchRetriever(BaseRetriever, BaseChatTCURetriever):
                 "autortese",
             ],
             search_fields=["trecho"],
-            top=self.top_k,
+            top=top,
             using_vectors=False,
         )
 
+        return await BuscaEspeculativa.listar(similarity_docs)
+
+    @staticmethod
+    def _filtro_local(resp: dict):
+        """Equivalente local do filtro OData montado em __get_filtro."""
+
+        def atende(doc: dict) -> bool:
+            ano = str(doc.get("anoacordao") or "")
+
+            if resp["ano_inicial"] and ano < str(resp["ano_inicial"]):
+                return False
+
+            if resp["ano_final"] and ano > str(resp["ano_final"]):
+                return False
+
+            return not resp["autor"] or doc.get("autortese") == resp["autor"]
+
+        return atende
+
+    async def _buscar(self, cogs: CognitiveSearch) -> List[dict]:
+        if not BuscaEspeculativa.ativa(self.top_k):
+            filtro, resp = await self.__get_filtro()
+
+            return await self._pesquisar(cogs, resp["pergunta"], filtro, self.top_k)
+
+        (filtro, resp), especulativos = await BuscaEspeculativa.executar(
+            self.__get_filtro(),
+            self._pesquisar(
+                cogs,
+                self.prompt_usuario,
+                None,
+                BuscaEspeculativa.top_especulativo(self.top_k),
+            ),
+        )
+
+        docs = BuscaEspeculativa.aproveitar(
+            especulativos,
+            self.top_k,
+            pergunta=resp["pergunta"],
+            campos=["trecho", "enunciado"],
+            filtro=self._filtro_local(resp) if filtro else None,
+        )
+
+        if docs is None:
+            docs = await self._pesquisar(cogs, resp["pergunta"], filtro, self.top_k)
+
+        return docs
+
+    async def get_trechos_relevantes(self):
+        logger.info("Jurisprudência Retriever")
+        logger.info(f"PromptUSR: {self.prompt_usuario}")
+
+        inicio = time.time()
+
+        # define a fonte de informação antecipadamente para registro de que entrou na tool
+        self.system_message.arquivos_busca = "Jurisprudência Selecionada"
+
+        cogs = CognitiveSearch(
+            index_name=INDEX_NAME_JURISPRUDENCIA, chunk_size=1, usr_roles=self.usr_roles
+        )
+
+        similarity_docs = await self._buscar(cogs)
+
         i = 0
         docs = []
         trechos = []
 
-        async for doc in similarity_docs:
+        for doc in similarity_docs:
             id_trecho = (
                 "Acórdão "
                 + doc["numacordao"]
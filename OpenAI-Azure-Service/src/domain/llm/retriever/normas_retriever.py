@@ -11,11 +11,13 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.domain.llm.retriever.base_chattcu_retriever import BaseChatTCURetriever
+from src.domain.llm.retriever.busca_especulativa import BuscaEspeculativa
 from src.domain.mensagem import Mensagem
 from src.domain.nome_indice_enum import NomeIndiceEnum
 from src.domain.tipo_busca_enum import TipoBuscaEnum
 from src.domain.trecho import Trecho
 from src.infrastructure.cognitive_search.cognitive_search import CognitiveSearch
+from src.infrastructure.cognitive_search.filtro_busca_cache import FiltroBuscaCache
 from src.infrastructure.env import INDEX_NAME_NORMAS
 
 logger = logging.getLogger(__name__)
@@ -51,16 +53,23 @@ class NormasRetriever(BaseRetriever, BaseChatTCURetriever):
                 + "para uso em uma engine de busca) citada no texto a seguir: \n{prompt}"
             )
 
-            chain = (
-                ChatPromptTemplate.from_template(prompt) | self.llm | StrOutputParser()
-            )
+            resp = await FiltroBuscaCache.obter("normas", self.prompt_usuario)
 
-            resp = await chain.ainvoke({"prompt": self.prompt_usuario})
+            if resp is None:
+                chain = (
+                    ChatPromptTemplate.from_template(prompt)
+                    | self.llm
+                    | StrOutputParser()
+                )
 
-            logger.info(resp)
+                resp = await chain.ainvoke({"prompt": self.prompt_usuario})
+
+                logger.info(resp)
+
+                # converte a resposta
+                resp = json.loads(resp)
 
-            # converte a resposta
-            resp = json.loads(resp)
+                await FiltroBuscaCache.armazenar("normas", self.prompt_usuario, resp)
 
             logger.info(resp)
         except json.JSONDecodeError as error:
@@ -88,14 +97,56 @@ class NormasRetriever(BaseRetriever, BaseChatTCURetriever):
 
         return filtro, resp
 
+    async def _pesquisar(
+        self, cogs: CognitiveSearch, pergunta: str, filtro: Optional[str], top
+    ) -> List[dict]:
+        similarity_docs = await cogs.buscar_trechos_relevantes(
+            search_text=pergunta,
+            query_type="semantic",
+            query_language="pt-br",
+            semantic_configuration_name="semantic-normas",
+            query_caption="extractive",
+            filtro=filtro if filtro else None,
+            selecao=["id", "titulo", "trecho", "linkPesquisaIntegrada"],
+            search_fields=["titulo", "trecho"],
+            top=top,
+        )
+
+        return await BuscaEspeculativa.listar(similarity_docs)
+
+    async def _buscar(self, cogs: CognitiveSearch) -> List[dict]:
+        if not BuscaEspeculativa.ativa(self.top_k):
+            filtro, resp = await self._get_filtro()
+
+            return await self._pesquisar(cogs, resp["pergunta"], filtro, self.top_k)
+
+        (filtro, resp), especulativos = await BuscaEspeculativa.executar(
+            self._get_filtro(),
+            self._pesquisar(
+                cogs,
+                self.prompt_usuario,
+                None,
+                BuscaEspeculativa.top_especulativo(self.top_k),
+            ),
+        )
+
+        # o ano da norma não é retornado pelo índice: com filtro de ano a
+        # busca é refeita. Sem filtro, a ordem do ranker semântico é mantida
+        docs = BuscaEspeculativa.aproveitar(
+            None if filtro else especulativos, self.top_k
+        )
+
+        if docs is None:
+            docs = await self._pesquisar(cogs, resp["pergunta"], filtro, self.top_k)
+
+        return docs
+
     async def processar(self) -> List[Document]:
         logger.info("Normas Retriever")
         logger.info(f"PromptUSR: {self.prompt_usuario}")
 
         inicio = time.time()
 
-        filtro, resp = await self._get_filtro()
-
         # define a fonte de informação antecipadamente para registro de que entrou na tool
         self.system_message.arquivos_busca = "Normativos do TCU"
 
@@ -105,23 +156,13 @@ class NormasRetriever(BaseRetriever, BaseChatTCURetriever):
 
         logger.info(f">> {self.top_k} - Top k")
 
-        similarity_docs = await cogs.buscar_trechos_relevantes(
-            search_text=resp["pergunta"],
-            query_type="semantic",
-            query_language="pt-br",
-            semantic_configuration_name="semantic-normas",
-            query_caption="extractive",
-            filtro=filtro if filtro else None,
-            selecao=["id", "titulo", "trecho", "linkPesquisaIntegrada"],
-            search_fields=["titulo", "trecho"],
-            top=self.top_k,
-        )
+        similarity_docs = await self._buscar(cogs)
 
         i = 0
         docs = []
         trechos = []
 
-        async for doc in similarity_docs:
+        for doc in similarity_docs:
             id_trecho = source = (
                 doc["titulo"].replace("\n", "").replace("\r", "") + "_" + str(i + 1)
             )
@@ -1,4 +1,3 @@
-import asyncio
 import gc
 import logging
 
@@ -9,8 +8,16 @@ from langchain.tools import StructuredTool
 
 from src.conf.env import configs
 from src.domain.mensagem import Mensagem
+from src.domain.llm.util.sumarizador_map_reduce import SumarizadorMapReduce
 from src.domain.trecho import Trecho
-from src.infrastructure.env import MODELO_PADRAO, MODELOS, VERBOSE
+from src.infrastructure.env import (
+    MODELO_PADRAO,
+    MODELO_PADRAO_FILTROS,
+    MODELOS,
+    SUMARIZACAO_ESTRATEGIAS,
+    VERBOSE,
+)
+from src.infrastructure.parser_pool.parser_pool import ParserPool
 from src.infrastructure.security_tokens import DecodedToken
 from src.service import documento_service
 
@@ -18,6 +25,9 @@ logger = logging.getLogger(__name__)
 
 
 class SumarizacaoPecaProcesso:
+    # chave da estratégia de sumarização em SUMARIZACAO_ESTRATEGIAS
+    tool_sumarizacao = "SUMARIZACAO"
+
     def __init__(self, stream: bool, msg: Mensagem, llm, token: DecodedToken):
         self.stream = stream
         self.msg = msg
@@ -57,6 +67,11 @@ class SumarizacaoPecaProcesso:
 
         prompt = PromptTemplate.from_template(prompt_template)
 
+        if SUMARIZACAO_ESTRATEGIAS.get(self.tool_sumarizacao) == "map_reduce":
+            return await SumarizadorMapReduce(
+                self.llm, MODELO_PADRAO_FILTROS, prompt, requisicao=input_prompt
+            ).executar(docs, return_intermediate_steps=return_intermediate_steps)
+
         refine_template = (
             "A sua tarefa é produzir um resumo final"
             + (
@@ -120,10 +135,8 @@ class SumarizacaoPecaProcesso:
 
             loader = documento_service.StreamPyMUPDFLoader(stream)
 
-            loop = asyncio.get_event_loop()
-
-            # joga para executar em thread separada
-            docs = await loop.run_in_executor(None, loader.load)
+            # executa o parsing no pool de processos, fora do event loop
+            docs = await ParserPool.executar(loader.load)
 
             # libera memória ao invocar o garbage collector
             gc.collect()
@@ -144,10 +157,10 @@ class SumarizacaoPecaProcesso:
                     + f'"{docs[0].page_content}", {input[0].lower()}{input[1:]}'
                 )
 
-                result = self.llm([HumanMessage(content=content)])
+                result = await self.llm.ainvoke([HumanMessage(content=content)])
                 resumo = result.content
             else:
-                logger.info("Texto longo -> sumarizar usando refine.")
+                logger.info("Texto longo -> sumarizar por segmentos.")
 
                 preffix = (
                     f"Considerando que o conteúdo da peça {numero_peca}"
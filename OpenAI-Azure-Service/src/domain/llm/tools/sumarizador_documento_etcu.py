@@ -1,4 +1,3 @@
-import asyncio
 import gc
 import logging
 import re
@@ -11,6 +10,7 @@ from src.domain.llm.tools.sumarizacao_peca_processo import SumarizacaoPecaProces
 from src.domain.mensagem import Mensagem
 from src.domain.trecho import Trecho
 from src.infrastructure.env import VERBOSE
+from src.infrastructure.parser_pool.parser_pool import ParserPool
 from src.infrastructure.security_tokens import DecodedToken
 from src.service import documento_service
 from src.service.documento_service import StreamPyMUPDFLoader
@@ -52,10 +52,8 @@ class SumarizadorDocumentoETCU(SumarizacaoPecaProcesso):
 
             loader = StreamPyMUPDFLoader(stream)
 
-            loop = asyncio.get_event_loop()
-
-            # joga para executar em thread separada
-            docs = await loop.run_in_executor(None, loader.load)
+            # executa o parsing no pool de processos, fora do event loop
+            docs = await ParserPool.executar(loader.load)
 
             # libera memória ao invocar o garbage collector
             gc.collect()
@@ -75,10 +73,10 @@ class SumarizadorDocumentoETCU(SumarizacaoPecaProcesso):
                 content = f"""Considerando que o conteúdo do documento {numero_documento}
                  é: "{docs[0].page_content}", {input[0].lower()}{input[1:]}"""
 
-                result = self.llm([HumanMessage(content=content)])
+                result = await self.llm.ainvoke([HumanMessage(content=content)])
                 resumo = result.content
             else:
-                logger.info("Texto longo -> sumarizar usando refine.")
+                logger.info("Texto longo -> sumarizar por segmentos.")
 
                 preffix = (
                     f"Considerando que o conteúdo do documento {numero_documento} é"
@@ -1,4 +1,3 @@
-import asyncio
 import gc
 import logging
 import time
@@ -10,6 +9,7 @@ from src.domain.llm.tools.sumarizacao_peca_processo import SumarizacaoPecaProces
 from src.domain.mensagem import Mensagem
 from src.domain.trecho import Trecho
 from src.exceptions import ServiceException
+from src.infrastructure.parser_pool.parser_pool import ParserPool
 from src.infrastructure.security_tokens import DecodedToken
 from src.service import documento_service
 
@@ -17,6 +17,8 @@ logger = logging.getLogger(__name__)
 
 
 class SumarizadorDocumentoUpload(SumarizacaoPecaProcesso):
+    tool_sumarizacao = "UPLOAD"
+
     def __init__(self, stream, msg: Mensagem, llm, token: DecodedToken):
         super().__init__(stream=stream, msg=msg, token=token, llm=llm)
 
@@ -27,10 +29,8 @@ class SumarizadorDocumentoUpload(SumarizacaoPecaProcesso):
         try:
             loader = documento_service.StreamPyMUPDFLoader(stream)
 
-            loop = asyncio.get_event_loop()
-
-            # joga para executar em thread separada
-            docs = await loop.run_in_executor(None, loader.load)
+            # executa o parsing no pool de processos, fora do event loop
+            docs = await ParserPool.executar(loader.load)
 
             # libera memória ao invocar o garbage collector
             gc.collect()
@@ -1,6 +1,8 @@
 import asyncio
 import logging
+from typing import List
 
+from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage
 
 from src.domain.llm.base.document_process_utils import DocumentProcessUtils
@@ -8,9 +10,16 @@ from src.domain.llm.retriever.base_chattcu_retriever import BaseChatTCURetriever
 from src.domain.llm.util.resumo_focado_utils import ResumoFocadoUtils
 from src.domain.mensagem import Mensagem
 from src.domain.trecho import Trecho
+from src.exceptions import ServiceException
 from src.infrastructure.azure_blob.azure_blob import AzureBlob
-from src.infrastructure.env import CONTAINER_NAME, VERBOSE
-from src.service.StreamFileLoader import StreamFileLoader
+from src.infrastructure.env import (
+    CONTAINER_NAME,
+    FULL_CONTEXT_DOWNLOAD_CONCORRENCIA,
+    FULL_CONTEXT_TIMEOUT_DOCUMENTO,
+    VERBOSE,
+)
+from src.infrastructure.parser_pool.parser_pool import ParserPool
+from src.service.StreamFileLoader import extrair_conteudo, montar_documentos
 
 logger = logging.getLogger(__name__)
 
@@ -26,31 +35,71 @@ class UploadDocumentoFullContext(
         self.llm = llm
         self.token = token
 
+    async def _extrair_documento(
+        self, azb: AzureBlob, documento, semaforo: asyncio.Semaphore
+    ) -> str:
+        loop = asyncio.get_running_loop()
+        inicio = loop.time()
+
+        async with semaforo:
+            data = await asyncio.wait_for(
+                azb.download_blob(
+                    container_name=CONTAINER_NAME, filename=documento.nome_blob
+                ),
+                timeout=FULL_CONTEXT_TIMEOUT_DOCUMENTO,
+            )
+
+        if data is None:
+            raise ServiceException(f"Falha ao baixar o documento {documento.nome}")
+
+        # o parsing dispõe do restante do prazo do documento
+        restante = FULL_CONTEXT_TIMEOUT_DOCUMENTO - (loop.time() - inicio)
+
+        return await ParserPool.executar(
+            extrair_conteudo, data, documento.nome, timeout=max(restante, 1)
+        )
+
+    async def _carregar_documentos(self, docs_sel) -> List[Document]:
+        """Baixa os documentos em paralelo e extrai o texto de cada um no
+        ParserPool assim que o seu download termina, mantendo a ordem da
+        seleção. Um documento que falhe ou exceda o prazo é desconsiderado,
+        sem interromper os demais."""
+        azb = AzureBlob()
+        semaforo = asyncio.Semaphore(FULL_CONTEXT_DOWNLOAD_CONCORRENCIA)
+
+        resultados = await asyncio.gather(
+            *(self._extrair_documento(azb, doc, semaforo) for doc in docs_sel),
+            return_exceptions=True,
+        )
+
+        conteudos = []
+
+        for documento, resultado in zip(docs_sel, resultados):
+            if isinstance(resultado, BaseException):
+                motivo = (
+                    "tempo limite excedido"
+                    if isinstance(resultado, asyncio.TimeoutError)
+                    else resultado
+                )
+                logger.warning(f"Documento {documento.nome} desconsiderado: {motivo}")
+                continue
+
+            conteudos.append(resultado)
+
+        if docs_sel and not conteudos:
+            raise ServiceException("Não foi possível carregar os documentos selecionados")
+
+        return await asyncio.to_thread(montar_documentos, conteudos)
+
     async def sumarizar_upload_documento_focado(self):
         logger.info("Executanto sumarizar documento focado upload")
 
         try:
-            azb = AzureBlob()
             docs_sel = await self._find_documentos_utilizados(
                 chatinput=self.chat, token=self.token
             )
-            all_data = []
-            file_names = []
-
-            for document in docs_sel:
-                data = await azb.download_blob_as_stream(
-                    container_name=CONTAINER_NAME, filename=document.nome_blob
-                )
-                all_data.append(data)
-                file_names.append(document.nome)
-
-            loader = StreamFileLoader(data_list=all_data, file_names=file_names)
-
-            logger.info(f">> Loader obtido com sucesso ({loader})")
-
-            loop = asyncio.get_event_loop()
 
-            docs = await loop.run_in_executor(None, loader.load_list)
+            docs = await self._carregar_documentos(docs_sel)
             logger.info(f">> Docs obtido com sucesso ({docs})")
 
             logger.info(">> Load do documento efetuado e transformado em docs")
@@ -66,10 +115,10 @@ class UploadDocumentoFullContext(
                 content = f"""Considerando o conteúdo do(s) documento(s):
                 "{docs[0].page_content}"responda: {self.prompt_usuario[0].lower()}{self.prompt_usuario[1:]}"""
 
-                result = self.llm([HumanMessage(content=content)])
+                result = await self.llm.ainvoke([HumanMessage(content=content)])
                 resumo = result.content
             else:
-                logger.info("Texto longo -> sumarizar usando refine.")
+                logger.info("Texto longo -> sumarizar por segmentos.")
 
                 preffix = f"Considerando o conteúdo do(s) documento(s):"
 
@@ -3,10 +3,15 @@ import logging
 from langchain.chains.summarize import load_summarize_chain
 from langchain_core.prompts import PromptTemplate
 
+from src.domain.llm.util.sumarizador_map_reduce import SumarizadorMapReduce
+from src.infrastructure.env import MODELO_PADRAO_FILTROS, SUMARIZACAO_ESTRATEGIAS
+
 logger = logging.getLogger(__name__)
 
 
 class ResumoFocadoUtils:
+    # chave da estratégia de sumarização em SUMARIZACAO_ESTRATEGIAS
+    tool_sumarizacao = "RESUMOFOCADODOCUMENTOS"
 
     async def _gerar_resumo_final_focado(
         self,
@@ -28,6 +33,11 @@ class ResumoFocadoUtils:
         prompt = PromptTemplate.from_template(prompt_template)
         logger.info(prompt)
 
+        if SUMARIZACAO_ESTRATEGIAS.get(self.tool_sumarizacao) == "map_reduce":
+            return await SumarizadorMapReduce(
+                self.llm, MODELO_PADRAO_FILTROS, prompt, requisicao=input_prompt
+            ).executar(docs, return_intermediate_steps=return_intermediate_steps)
+
         refine_template = (
             "A sua tarefa é produzir um resumo final\n"
             "Fornecemos um resumo existente até um certo ponto: {existing_answer}\n"
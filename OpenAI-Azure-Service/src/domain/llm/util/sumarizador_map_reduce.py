@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import PromptTemplate
+from opentelemetry import trace
+
+from src.infrastructure.env import (
+    SUMARIZACAO_MAP_REDUCE_CONCORRENCIA,
+    SUMARIZACAO_REDUCE_MAX_TOKENS,
+    SUMARIZACAO_TPM_MODELOS,
+    SUMARIZACAO_TPM_PADRAO,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+# estimativa conservadora para textos em português (cl100k_base), evitando a
+# tokenização completa de documentos com centenas de páginas
+CARACTERES_POR_TOKEN = 3
+# tokens reservados para a resposta de cada chamada
+TOKENS_RESPOSTA_ESTIMADOS = 1024
+
+REDUCE_TEMPLATE = (
+    "A sua tarefa é produzir um resumo final"
+    "{requisicao}"
+    "Abaixo estão os resumos parciais de trechos consecutivos do documento, "
+    "na ordem em que aparecem.\n"
+    "------------\n"
+    "{text}\n"
+    "------------\n"
+    "Combine os resumos parciais em um único resumo em Português do Brasil, "
+    "sem repetir informações."
+)
+
+
+def estimar_tokens(texto: str) -> int:
+    return len(texto) // CARACTERES_POR_TOKEN + 1
+
+
+class LimitadorTPM:
+    """Janela deslizante de 60 segundos com os tokens consumidos por um
+    deployment. As chamadas aguardam até que caibam no limite."""
+
+    _limitadores: Dict[str, "LimitadorTPM"] = {}
+
+    def __init__(self, tpm: int):
+        self.tpm = tpm
+        self._consumo: Deque[Tuple[float, int]] = deque()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def get(cls, modelo: str) -> "LimitadorTPM":
+        if modelo not in cls._limitadores:
+            cls._limitadores[modelo] = cls(
+                SUMARIZACAO_TPM_MODELOS.get(modelo, SUMARIZACAO_TPM_PADRAO)
+            )
+
+        return cls._limitadores[modelo]
+
+    def _em_uso(self, agora: float) -> int:
+        while self._consumo and self._consumo[0][0] <= agora - 60:
+            self._consumo.popleft()
+
+        return sum(tokens for _, tokens in self._consumo)
+
+    async def adquirir(self, tokens: int) -> float:
+        """Registra o consumo e retorna os segundos aguardados."""
+        espera = 0.0
+
+        async with self._lock:
+            agora = time.monotonic()
+
+            # uma chamada maior que o limite é liberada com a janela vazia
+            while self._consumo and self._em_uso(agora) + tokens > self.tpm:
+                intervalo = self._consumo[0][0] + 60 - agora
+                await asyncio.sleep(intervalo)
+
+                espera += intervalo
+                agora = time.monotonic()
+
+            self._consumo.append((agora, tokens))
+
+        return espera
+
+    @classmethod
+    def limpar(cls):
+        cls._limitadores.clear()
+
+
+class SumarizadorMapReduce:
+    """Sumarização de documentos longos em duas etapas: os segmentos são
+    resumidos em paralelo (map) e os resumos parciais são combinados em
+    grupos que cabem em uma chamada, de forma hierárquica, até restar um
+    único resumo (reduce). Substitui a cadeia "refine", em que cada segmento
+    aguardava o resumo do anterior."""
+
+    _metricas: Dict[str, float] = {
+        "sumarizacoes": 0,
+        "segmentos": 0,
+        "chamadas_reduce": 0,
+        "niveis_reduce": 0,
+        "espera_tpm_segundos": 0.0,
+    }
+
+    def __init__(self, llm, modelo: str, prompt: PromptTemplate, requisicao=None):
+        self.llm = llm
+        self.prompt = prompt
+        self.limitador = LimitadorTPM.get(modelo)
+        self.semaforo = asyncio.Semaphore(SUMARIZACAO_MAP_REDUCE_CONCORRENCIA)
+        self.reduce_prompt = PromptTemplate.from_template(REDUCE_TEMPLATE).partial(
+            requisicao=(
+                f' que responda a requisição: \n"{requisicao}"\n'
+                if requisicao
+                else "\n"
+            )
+        )
+
+    async def _invocar(self, conteudo: str) -> str:
+        async with self.semaforo:
+            espera = await self.limitador.adquirir(
+                estimar_tokens(conteudo) + TOKENS_RESPOSTA_ESTIMADOS
+            )
+            self._metricas["espera_tpm_segundos"] += espera
+
+            resultado = await self.llm.ainvoke([HumanMessage(content=conteudo)])
+
+        return getattr(resultado, "content", resultado)
+
+    @staticmethod
+    def _agrupar(resumos: List[str]) -> List[List[str]]:
+        grupos, grupo, tokens = [], [], 0
+
+        for resumo in resumos:
+            tokens_resumo = estimar_tokens(resumo)
+
+            # cada grupo combina ao menos dois resumos, garantindo que a
+            # quantidade diminua a cada nível
+            excede = tokens + tokens_resumo > SUMARIZACAO_REDUCE_MAX_TOKENS
+
+            if len(grupo) >= 2 and excede:
+                grupos.append(grupo)
+                grupo, tokens = [], 0
+
+            grupo.append(resumo)
+            tokens += tokens_resumo
+
+        if len(grupo) == 1 and grupos:
+            grupos[-1].append(grupo[0])
+        elif grupo:
+            grupos.append(grupo)
+
+        return grupos
+
+    async def _reduzir(self, resumos: List[str]) -> str:
+        texto = "\n\n".join(resumos)
+        self._metricas["chamadas_reduce"] += 1
+
+        return await self._invocar(self.reduce_prompt.format(text=texto))
+
+    @tracer.start_as_current_span("sumarizar_map_reduce")
+    async def executar(self, docs, return_intermediate_steps=False) -> dict:
+        logger.info(f">> Sumarizando {len(docs)} segmentos com map-reduce")
+
+        resumos_parciais = await asyncio.gather(
+            *(self._invocar(self.prompt.format(text=doc.page_content)) for doc in docs)
+        )
+
+        self._metricas["sumarizacoes"] += 1
+        self._metricas["segmentos"] += len(docs)
+
+        resumos = list(resumos_parciais)
+
+        # com um único segmento, o resumo do map já é o resultado final
+        while len(resumos) > 1:
+            grupos = self._agrupar(resumos)
+            self._metricas["niveis_reduce"] += 1
+
+            resumos = list(await asyncio.gather(*(self._reduzir(g) for g in grupos)))
+
+        resultado = {"output_text": resumos[0]}
+
+        if return_intermediate_steps:
+            resultado["intermediate_steps"] = list(resumos_parciais)
+
+        return resultado
+
+    @classmethod
+    def limpar(cls):
+        for chave in cls._metricas:
+            cls._metricas[chave] = 0
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return dict(cls._metricas)
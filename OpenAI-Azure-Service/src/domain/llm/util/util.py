@@ -1,6 +1,5 @@
 import logging
-import re
-from typing import List
+from typing import Dict, List, Optional, Set
 
 import tiktoken
 from opentelemetry import trace
@@ -52,29 +51,82 @@ def get_ministros_as_string() -> str:
     return ", ".join(get_ministros())
 
 
+class LocalizadorCitacoes:
+    """Localiza, de forma incremental, as citações entre colchetes ([...])
+    do texto gerado pelo LLM e os trechos correspondentes.
+
+    Equivale a aplicar re.findall(r"\[([^]]+)\]") ao texto acumulado, mas
+    cada fragmento recebido é processado uma única vez, mantendo entre as
+    chamadas o estado da citação em aberto."""
+
+    def __init__(self, trechos: List[Trecho]):
+        self.trechos = trechos
+        self.quantidade_trechos = len(trechos)
+        self._indices_por_referencia: Dict[str, Set[int]] = {}
+        self._utilizados: Set[int] = set()
+        self._trechos_utilizados: List[Trecho] = []
+        self._citacao: Optional[List[str]] = None
+
+        for i, trecho in enumerate(trechos):
+            # cobre situações onde a ref é [^1^], [^1] ou [1]
+            referencias = {f"^{i+1}^", f"^{i+1}", f"{i+1}"}
+
+            if trecho.id_registro:
+                referencias.add(trecho.id_registro)
+                # cobre situações onde a ref é [Arquivo .....]
+                referencias.add(trecho.id_registro.replace("Arquivo ", ""))
+
+            for referencia in referencias:
+                self._indices_por_referencia.setdefault(referencia, set()).add(i)
+
+    def adicionar(self, texto: str) -> List[Trecho]:
+        """Processa o novo fragmento do texto e retorna os trechos citados
+        até o momento, na ordem original."""
+        inicio = 0
+
+        while True:
+            if self._citacao is None:
+                abertura = texto.find("[", inicio)
+
+                if abertura < 0:
+                    break
+
+                self._citacao = []
+                inicio = abertura + 1
+
+            fechamento = texto.find("]", inicio)
+
+            if fechamento < 0:
+                self._citacao.append(texto[inicio:])
+                break
+
+            self._citacao.append(texto[inicio:fechamento])
+            referencia = "".join(self._citacao)
+
+            # "[]" não é uma citação
+            if referencia:
+                self._registrar(referencia)
+
+            self._citacao = None
+            inicio = fechamento + 1
+
+        return self._trechos_utilizados
+
+    def _registrar(self, referencia: str):
+        novos = self._indices_por_referencia.get(referencia, set()) - self._utilizados
+
+        if novos:
+            self._utilizados |= novos
+            self._trechos_utilizados = [
+                trecho
+                for i, trecho in enumerate(self.trechos)
+                if i in self._utilizados
+            ]
+
+
 @tracer.start_as_current_span("filtrar_trechos_utilizados")
 def filtrar_trechos_utilizados(trechos: List[Trecho], texto: str) -> List[Trecho]:
-    trechos_encontrados = re.findall(r"\[([^]]+)\]", texto)
-    trechos_utilizados = []
-
-    for i, trecho in enumerate(trechos):
-
-        if trecho.id_registro in trechos_encontrados:
-            trechos_utilizados.append(trecho)
-        # cobre situações onde a ref é [Arquivo .....]
-        elif f"{trecho.id_registro.replace('Arquivo ', '')}" in trechos_encontrados:
-            trechos_utilizados.append(trecho)
-        # cobre situações onde a ref é [^1^]
-        elif f"^{i+1}^" in trechos_encontrados:
-            trechos_utilizados.append(trecho)
-        # cobre situações onde a ref é [^1]
-        elif f"^{i+1}" in trechos_encontrados:
-            trechos_utilizados.append(trecho)
-        # cobre situações onde a ref é [1]
-        elif f"{i+1}" in trechos_encontrados:
-            trechos_utilizados.append(trecho)
-
-    return trechos_utilizados
+    return LocalizadorCitacoes(trechos).adicionar(texto)
 
 
 @tracer.start_as_current_span("num_tokens_from_string")
@@ -1,12 +1,20 @@
 import logging
 from io import BytesIO
-from typing import BinaryIO, Optional
-
-from azure.core.exceptions import ResourceExistsError
-from azure.storage.blob.aio import BlobClient, BlobServiceClient, ContainerClient
+from typing import AsyncIterator, BinaryIO, Optional, Tuple
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import StorageErrorCode
+from azure.storage.blob.aio import (
+    BlobClient,
+    BlobServiceClient,
+    ContainerClient,
+    StorageStreamDownloader,
+)
 from opentelemetry import trace
 
 from src.conf.env import configs
+from src.infrastructure.azure_blob.blob_client_pool import BlobClientPool
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -19,29 +27,34 @@ CONNECT_STR = (
 
 
 class AzureBlob:
+    """Operações no Azure Blob Storage. O BlobServiceClient é compartilhado
+    pelo processo (BlobClientPool) e não deve ser fechado aqui; apenas os
+    clientes de container/blob derivados dele são fechados."""
+
     @tracer.start_as_current_span("__get_blob_service_client")
-    def __get_blob_service_client(self):
-        return BlobServiceClient.from_connection_string(CONNECT_STR)
+    def __get_blob_service_client(self) -> BlobServiceClient:
+        return BlobClientPool.get_client(CONNECT_STR)
 
     @tracer.start_as_current_span("verifica_existencia_container")
     async def verifica_existencia_container(self, container_name: str):
         container_client: ContainerClient = None
-        blob_service_client: BlobServiceClient = None
 
         try:
             container_name = container_name.lower()
 
-            logger.info(f"Verificando a existencia do container: {container_name}")
+            if BlobClientPool.container_existe(container_name):
+                return True
 
-            blob_service_client = self.__get_blob_service_client()
+            logger.info(f"Verificando a existencia do container: {container_name}")
 
-            container_client = blob_service_client.get_container_client(
+            container_client = self.__get_blob_service_client().get_container_client(
                 container=container_name
             )
             existe = await container_client.exists()
 
             if existe:
                 logger.info(f"O container ({container_name}) já existe!")
+                BlobClientPool.registrar_container(container_name)
             else:
                 logger.info(f"O container ({container_name}) NÃO existe!")
 
@@ -53,42 +66,28 @@ class AzureBlob:
             if container_client:
                 await container_client.close()
 
-            if blob_service_client:
-                await blob_service_client.close()
-
     @tracer.start_as_current_span("verifica_existencia_arquivo_container")
     async def verifica_existencia_arquivo_container(
         self, file_name: str, container_name: str
     ):
-        container_client: ContainerClient = None
-        blob_service_client: BlobServiceClient = None
         blob_client: BlobClient = None
 
         existe = False
 
         try:
-            if await self.verifica_existencia_container(container_name):
-                blob_service_client = self.__get_blob_service_client()
-
-                container_client = blob_service_client.get_container_client(
-                    container=container_name
-                )
-
-                blob_client = container_client.get_blob_client(file_name)
+            # um blob de um container inexistente também não existe: não é
+            # necessário consultar o container antes
+            blob_client = self.__get_blob_service_client().get_blob_client(
+                container=container_name.lower(), blob=file_name
+            )
 
-                existe = await blob_client.exists()
+            existe = await blob_client.exists()
         except Exception as exp:
             logger.error(exp)
         finally:
             if blob_client:
                 await blob_client.close()
 
-            if container_client:
-                await container_client.close()
-
-            if blob_service_client:
-                await blob_service_client.close()
-
         return existe
 
     @tracer.start_as_current_span("cria_container")
@@ -96,28 +95,27 @@ class AzureBlob:
         container_name = container_name.lower()
 
         container_client: ContainerClient = None
-        blob_service_client: BlobServiceClient = None
         status = None
 
         try:
             logger.info(f"Criando o container: {container_name}")
 
-            blob_service_client = self.__get_blob_service_client()
-
-            container_client = blob_service_client.get_container_client(
+            container_client = self.__get_blob_service_client().get_container_client(
                 container=container_name
             )
 
             status = await container_client.create_container()
+
+            BlobClientPool.registrar_container(container_name)
+        except ResourceExistsError:
+            # criado por outra requisição/instância
+            BlobClientPool.registrar_container(container_name)
         except Exception as exp:
             logger.error(exp)
         finally:
             if container_client:
                 await container_client.close()
 
-            if blob_service_client:
-                await blob_service_client.close()
-
         return status
 
     # https://learn.microsoft.com/en-us/azure/storage/blobs/storage-blob-upload-python
@@ -127,8 +125,6 @@ class AzureBlob:
     ):
         container_name = container_name.lower()
 
-        blob_service_client: BlobServiceClient = None
-        container_client: ContainerClient = None
         blob_client: BlobClient = None
 
         try:
@@ -136,26 +132,24 @@ class AzureBlob:
                 f"Tentando enviar arquivo ({filename}) para o container ({container_name})"
             )
 
-            if not await self.verifica_existencia_container(container_name):
-                await self.cria_container(container_name)
+            blob_client = self.__get_blob_service_client().get_blob_client(
+                container=container_name, blob=filename
+            )
 
-            blob_service_client = self.__get_blob_service_client()
+            try:
+                await self.__upload_se_inexistente(blob_client, data)
+            except ResourceNotFoundError as exp:
+                if exp.error_code != StorageErrorCode.CONTAINER_NOT_FOUND:
+                    raise exp
 
-            container_client = blob_service_client.get_container_client(
-                container=container_name
-            )
+                # o container é criado apenas no primeiro upload do usuário
+                BlobClientPool.invalidar_container(container_name)
+                await self.cria_container(container_name)
 
-            if not await self.verifica_existencia_arquivo_container(
-                file_name=filename, container_name=container_name
-            ):
-                logger.info(
-                    f"O arquivo ({filename}) não existe no container ({container_name})"
-                )
-                logger.info("Enviando diretamente os dados recebidos")
-
-                blob_client = await container_client.upload_blob(
-                    name=filename, data=data, overwrite=False
-                )
+                if hasattr(data, "seek"):
+                    data.seek(0)
+
+                await self.__upload_se_inexistente(blob_client, data)
         except ResourceExistsError:
             logger.warning(
                 f"O arquivo '{filename}' já existe no container '{container_name}'."
@@ -167,17 +161,18 @@ class AzureBlob:
             if blob_client:
                 await blob_client.close()
 
-            if container_client:
-                await container_client.close()
-
-            if blob_service_client:
-                await blob_service_client.close()
+    @staticmethod
+    async def __upload_se_inexistente(blob_client: BlobClient, data):
+        # If-None-Match: * -> o serviço recusa (409) o upload de um blob já
+        # existente, sem a consulta prévia de existência
+        await blob_client.upload_blob(
+            data, overwrite=False, etag="*", match_condition=MatchConditions.IfMissing
+        )
 
     @tracer.start_as_current_span("recupera_blobs")
     async def recupera_blobs(self, container_name: str):
         container_name = container_name.lower()
 
-        blob_service_client: BlobServiceClient = None
         container_client: ContainerClient = None
         blobs = []
 
@@ -189,9 +184,7 @@ class AzureBlob:
             if not await self.verifica_existencia_container(container_name):
                 raise Exception("O usuário não possui arquivos processados")
 
-            blob_service_client = self.__get_blob_service_client()
-
-            container_client = blob_service_client.get_container_client(
+            container_client = self.__get_blob_service_client().get_container_client(
                 container=container_name
             )
 
@@ -204,9 +197,6 @@ class AzureBlob:
             if container_client:
                 await container_client.close()
 
-            if blob_service_client:
-                await blob_service_client.close()
-
         return blobs
 
     @tracer.start_as_current_span("download_blob")
@@ -215,32 +205,59 @@ class AzureBlob:
 
         logger.info(filename)
 
-        if not await self.verifica_existencia_arquivo_container(
-            file_name=filename, container_name=container_name
-        ):
-            raise Exception("O arquivo desejado não encontra-se no repositório")
-
-        blob_service_client: BlobServiceClient = None
         blob_client: BlobClient = None
 
         try:
-            blob_service_client = self.__get_blob_service_client()
-
-            blob_client = blob_service_client.get_blob_client(
+            blob_client = self.__get_blob_service_client().get_blob_client(
                 container=container_name, blob=filename
             )
 
             download_stream = await blob_client.download_blob()
 
             return await download_stream.readall()
+        except ResourceNotFoundError:
+            # a inexistência do blob (ou do container) é informada pelo próprio
+            # download, sem as consultas prévias de existência
+            raise Exception("O arquivo desejado não encontra-se no repositório")
         except Exception as exp:
             logger.error(exp)
         finally:
             if blob_client:
                 await blob_client.close()
 
-            if blob_service_client:
-                await blob_service_client.close()
+    @tracer.start_as_current_span("download_blob_em_partes")
+    async def download_blob_em_partes(
+        self,
+        container_name: str,
+        filename: str,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+    ) -> Tuple[StorageStreamDownloader, AsyncIterator[bytes]]:
+        """Inicia o download do blob (ou do intervalo de bytes informado) e
+        retorna o downloader, com as propriedades e o tamanho do blob, e um
+        iterador das partes, lidas sob demanda com até
+        BLOB_DOWNLOAD_TAMANHO_PARTE bytes cada."""
+        blob_client = self.__get_blob_service_client().get_blob_client(
+            container=container_name.lower(), blob=filename
+        )
+
+        try:
+            downloader = await blob_client.download_blob(offset=offset, length=length)
+        except ResourceNotFoundError:
+            await blob_client.close()
+            raise Exception("O arquivo desejado não encontra-se no repositório")
+        except Exception as exp:
+            await blob_client.close()
+            raise exp
+
+        async def partes():
+            try:
+                async for parte in downloader.chunks():
+                    yield parte
+            finally:
+                await blob_client.close()
+
+        return downloader, partes()
 
     @tracer.start_as_current_span("download_blob_as_stream")
     async def download_blob_as_stream(self, container_name: str, filename: str):
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+from azure.storage.blob.aio import BlobServiceClient
+from opentelemetry import trace
+
+from src.infrastructure.env import BLOB_DOWNLOAD_TAMANHO_PARTE
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class BlobClientPool:
+    """Registro do BlobServiceClient (e respectivo pool de conexões HTTP)
+    reutilizado durante o ciclo de vida da aplicação, um por connection
+    string, e cache dos containers cuja existência já foi confirmada.
+
+    O cache é apenas positivo: um container que deixe de existir é removido
+    dele quando uma operação retornar ContainerNotFound. Os clientes não
+    devem ser fechados por quem os utiliza; o encerramento ocorre no
+    shutdown da aplicação."""
+
+    _clientes: Dict[str, BlobServiceClient] = {}
+    _containers: Set[str] = set()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _metricas: Dict[str, int] = {
+        "criados": 0,
+        "reutilizados": 0,
+        "containers_em_cache": 0,
+        "containers_consultados": 0,
+    }
+
+    @classmethod
+    def get_client(cls, connection_string: str) -> BlobServiceClient:
+        """Retorna o cliente da conta, criando-o sob demanda. Os clientes
+        criados em outro event loop (ex.: scripts e testes) são descartados,
+        pois a sessão HTTP fica vinculada ao loop em que foi aberta."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not cls._loop:
+            cls._clientes = {}
+            cls._loop = loop
+
+        client = cls._clientes.get(connection_string)
+
+        if client is None:
+            client = BlobServiceClient.from_connection_string(
+                connection_string,
+                # o padrão do SDK lê até 32 MB na primeira requisição
+                max_single_get_size=BLOB_DOWNLOAD_TAMANHO_PARTE,
+                max_chunk_get_size=BLOB_DOWNLOAD_TAMANHO_PARTE,
+            )
+            cls._clientes[connection_string] = client
+            cls._metricas["criados"] += 1
+
+            logger.info("BlobServiceClient criado")
+        else:
+            cls._metricas["reutilizados"] += 1
+
+        return client
+
+    @classmethod
+    def container_existe(cls, container_name: str) -> bool:
+        if container_name in cls._containers:
+            cls._metricas["containers_em_cache"] += 1
+            return True
+
+        cls._metricas["containers_consultados"] += 1
+        return False
+
+    @classmethod
+    def registrar_container(cls, container_name: str):
+        cls._containers.add(container_name)
+
+    @classmethod
+    def invalidar_container(cls, container_name: str):
+        cls._containers.discard(container_name)
+
+    @classmethod
+    @tracer.start_as_current_span("fechar_conexoes")
+    async def fechar_conexoes(cls):
+        clientes = list(cls._clientes.values())
+
+        cls._clientes = {}
+        cls._loop = None
+
+        for client in clientes:
+            try:
+                await client.close()
+            except Exception as erro:
+                logger.error(f"Erro ao fechar o BlobServiceClient: {erro}")
+
+        if clientes:
+            logger.info(f"{len(clientes)} BlobServiceClients encerrados")
+
+    @classmethod
+    def limpar(cls):
+        cls._containers.clear()
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "clientes": len(cls._clientes),
+            "containers": len(cls._containers),
+            **cls._metricas,
+        }
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 import traceback
@@ -8,11 +9,21 @@ from azure.core.credentials import AzureKeyCredential
 from azure.search.documents.aio import SearchClient
 from azure.search.documents.models import VectorizedQuery
 from langchain_openai.embeddings.azure import AzureOpenAIEmbeddings
-from openai import AsyncAzureOpenAI
+from openai import AsyncAzureOpenAI, RateLimitError
 from opentelemetry import trace
 
 from src.conf.env import configs
-from src.infrastructure.env import MODELO_EMBEDDING_002
+from src.infrastructure.cognitive_search.embedding_cache import EmbeddingCache
+from src.infrastructure.cognitive_search.query_vector_memo import QueryVectorMemo
+from src.infrastructure.cognitive_search.search_client_pool import SearchClientPool
+from src.infrastructure.env import (
+    EMBEDDING_BACKOFF_INICIAL,
+    EMBEDDING_MAX_LOTES_CONCORRENTES,
+    EMBEDDING_MAX_TENTATIVAS,
+    EMBEDDING_TAMANHO_LOTE,
+    INDEXACAO_TAMANHO_LOTE,
+    MODELO_EMBEDDING_002,
+)
 from src.infrastructure.roles import DESENVOLVEDOR, PREVIEW
 
 logger = logging.getLogger(__name__)
@@ -95,18 +106,92 @@ class CognitiveSearch:
 
         return embeddings_openai.embeddings
 
-    @tracer.start_as_current_span("_get_search_client")
-    def _get_search_client(self):
-        endpoint_url = self.azure_search_url
+    @tracer.start_as_current_span("_criar_embeddings_com_retentativa")
+    async def _criar_embeddings_com_retentativa(self, embeddings, textos: List[str]):
+        for tentativa in range(1, EMBEDDING_MAX_TENTATIVAS + 1):
+            try:
+                emb = await embeddings.create(input=textos, model=self.modelo_embeddding)
+
+                return [
+                    dado.embedding for dado in sorted(emb.data, key=lambda d: d.index)
+                ]
+            except RateLimitError as error:
+                if tentativa == EMBEDDING_MAX_TENTATIVAS:
+                    raise error
+
+                espera = EMBEDDING_BACKOFF_INICIAL * (2 ** (tentativa - 1))
+                retry_after = error.response.headers.get("retry-after")
+
+                if retry_after and retry_after.isdigit():
+                    espera = max(espera, int(retry_after))
+
+                logger.warning(
+                    f"Limite de requisições de embedding atingido (tentativa {tentativa}). "
+                    + f"Aguardando {espera}s para tentar novamente."
+                )
+
+                await asyncio.sleep(espera)
+
+    @tracer.start_as_current_span("_gerar_embeddings_em_lote")
+    async def _gerar_embeddings_em_lote(self, textos: List[str], execution_id):
+        """Gera os embeddings de todos os textos enviando lotes de
+        EMBEDDING_TAMANHO_LOTE inputs por requisição, com no máximo
+        EMBEDDING_MAX_LOTES_CONCORRENTES requisições simultâneas.
+        Textos já presentes no EmbeddingCache (ou repetidos na própria lista)
+        não são enviados à API. Os vetores são retornados na mesma ordem dos
+        textos."""
+        _, deployment = self.__get_api_and_deployment()
+
+        vetores = await EmbeddingCache.obter(deployment, textos)
+
+        pendentes = list(
+            dict.fromkeys(
+                texto for texto, vetor in zip(textos, vetores) if vetor is None
+            )
+        )
+
+        logger.info(
+            f"Embeddings em cache: {len(textos) - len(pendentes)} de {len(textos)}"
+        )
+
+        if not pendentes:
+            return vetores
+
+        embeddings = self._get_embeddings(execution_id)
+        semaforo = asyncio.Semaphore(EMBEDDING_MAX_LOTES_CONCORRENTES)
+
+        lotes = [
+            pendentes[i : i + EMBEDDING_TAMANHO_LOTE]
+            for i in range(0, len(pendentes), EMBEDDING_TAMANHO_LOTE)
+        ]
+
+        async def _processar_lote(lote):
+            async with semaforo:
+                return await self._criar_embeddings_com_retentativa(embeddings, lote)
+
+        resultados = await asyncio.gather(*[_processar_lote(lote) for lote in lotes])
+
+        novos = [vetor for resultado in resultados for vetor in resultado]
+
+        await EmbeddingCache.armazenar(deployment, pendentes, novos)
 
-        search_client = SearchClient(
-            endpoint=endpoint_url,
+        por_texto = dict(zip(pendentes, novos))
+
+        return [
+            vetor if vetor is not None else por_texto[texto]
+            for texto, vetor in zip(textos, vetores)
+        ]
+
+    @tracer.start_as_current_span("_get_search_client")
+    def _get_search_client(self) -> SearchClient:
+        """Retorna o SearchClient compartilhado do índice (não deve ser
+        fechado pelo chamador)."""
+        return SearchClientPool.get_client(
+            endpoint=self.azure_search_url,
             index_name=self.index_name,
             credential=self.azure_credential,
         )
 
-        return search_client
-
     @tracer.start_as_current_span("_popular_indice")
     async def _popular_indice(self, sections):
         inicio = time.time()
@@ -124,7 +209,7 @@ class CognitiveSearch:
 
                 i += 1
 
-                if i % 100 == 0:
+                if i % INDEXACAO_TAMANHO_LOTE == 0:
                     results = await search_client.upload_documents(documents=batch)
                     succeeded = sum([1 for r in results if r.succeeded])
 
@@ -149,20 +234,39 @@ class CognitiveSearch:
             traceback.print_exc()
 
             raise error
-        finally:
-            await search_client.close()
+
+    @tracer.start_as_current_span("obter_vetor")
+    async def obter_vetor(self, question: str) -> List[float]:
+        """Vetor da pergunta no modelo de embedding do índice, compartilhado
+        com as buscas vetoriais pelos caches de embeddings."""
+        _, deployment = self.__get_api_and_deployment()
+
+        async def _gerar_vetor():
+            (vetor,) = await EmbeddingCache.obter(deployment, [question])
+
+            if vetor is None:
+                emb = await self._get_embeddings(execution_id=uuid.uuid4()).create(
+                    input=question, model=self.modelo_embeddding
+                )
+                vetor = emb.data[0].embedding
+
+                await EmbeddingCache.armazenar(deployment, [question], [vetor])
+
+            return vetor
+
+        return await QueryVectorMemo.obter(
+            EmbeddingCache.gerar_chave(deployment, question), _gerar_vetor
+        )
 
     @tracer.start_as_current_span("_get_vetores")
     async def _get_vetores(self, question, top, fields: str = "conteudoVector"):
         logger.info(question)
 
-        emb = await self._get_embeddings(execution_id=uuid.uuid4()).create(
-            input=question, model=self.modelo_embeddding
-        )
+        vetor = await self.obter_vetor(question)
 
         vectors = [
             VectorizedQuery(
-                vector=emb.data[0].embedding,
+                vector=vetor,
                 k_nearest_neighbors=top,
                 fields=fields,
             )
@@ -226,8 +330,6 @@ class CognitiveSearch:
             traceback.print_exc()
 
             raise error
-        finally:
-            await search_client.close()
 
         fim = time.time()
 
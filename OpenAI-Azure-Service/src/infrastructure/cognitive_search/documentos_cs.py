@@ -8,11 +8,11 @@ from tempfile import SpooledTemporaryFile
 from azure.search.documents.indexes.models import *
 from langchain.text_splitter import CharacterTextSplitter
 from opentelemetry import trace
-from tqdm import tqdm
 
 from src.domain.schemas import GabiResponse
 from src.infrastructure.cognitive_search.cognitive_search import CognitiveSearch
 from src.infrastructure.cognitive_search.local_file_processor import LocalFileProcessor
+from src.infrastructure.env import INDEXACAO_TAMANHO_LOTE
 from src.infrastructure.security_tokens import DecodedToken
 
 logger = logging.getLogger(__name__)
@@ -48,7 +48,7 @@ class DocumentoCS(CognitiveSearch):
         return trechos
 
     @tracer.start_as_current_span("__gera_secao")
-    async def __gera_secao(
+    def __gera_secao(
         self,
         id_secao,
         trecho,
@@ -56,12 +56,8 @@ class DocumentoCS(CognitiveSearch):
         numero_pagina,
         hash_arquivo,
         tamanho_trecho,
-        execution_id,
+        vetor,
     ):
-        emb = await self._get_embeddings(execution_id).create(
-            input=trecho, model=self.modelo_embeddding
-        )
-
         return {
             "id": id_secao,
             "trecho": trecho,
@@ -69,24 +65,36 @@ class DocumentoCS(CognitiveSearch):
             "numero_pagina": numero_pagina,
             "hash": hash_arquivo,
             "tamanho_trecho": tamanho_trecho,
-            "trechoVector": emb.data[0].embedding,
+            "trechoVector": vetor,
         }
 
     @tracer.start_as_current_span("__criar_secoes")
-    async def __criar_secoes(self, real_filename: str, user_filename: str, trechos):
+    async def __criar_secoes(
+        self,
+        real_filename: str,
+        user_filename: str,
+        trechos,
+        indice_inicial: int = 0,
+    ):
         inicio = time.time()
 
         logger.info(f"Criando as {len(trechos)} seções")
 
+        if not trechos:
+            return []
+
         execution_id = uuid.uuid4()
 
+        vetores = await self._gerar_embeddings_em_lote(
+            textos=[doc.page_content for doc in trechos],
+            execution_id=execution_id,
+        )
+
         sections = []
 
-        for i, doc in enumerate(
-            tqdm(trechos, desc="Criando Seções...", total=len(trechos))
-        ):
+        for i, (doc, vetor) in enumerate(zip(trechos, vetores), start=indice_inicial):
             sections.append(
-                await self.__gera_secao(
+                self.__gera_secao(
                     id_secao=re.sub(
                         "[^0-9a-zA-Z_-]",
                         "_",
@@ -107,7 +115,7 @@ class DocumentoCS(CognitiveSearch):
                         if doc.metadata["page"] != "RESUMO"
                         else len(doc.page_content)
                     ),
-                    execution_id=execution_id,
+                    vetor=vetor,
                 )
             )
 
@@ -203,6 +211,28 @@ class DocumentoCS(CognitiveSearch):
     #                 else:
     #                     continue
 
+    @tracer.start_as_current_span("__remover_secoes")
+    async def __remover_secoes(self, real_filename: str):
+        search_client = self._get_search_client()
+
+        try:
+            res = await search_client.search(
+                search_text="*", filter=f"hash eq '{real_filename}'", select=["id"]
+            )
+
+            ids = [{"id": doc["id"]} async for doc in res]
+
+            for i in range(0, len(ids), INDEXACAO_TAMANHO_LOTE):
+                await search_client.delete_documents(
+                    documents=ids[i : i + INDEXACAO_TAMANHO_LOTE]
+                )
+
+            logger.info(f"Removidas {len(ids)} seções do documento '{real_filename}'")
+        except Exception as error:
+            logger.error(
+                f"Erro ao remover as seções do documento '{real_filename}': {error}"
+            )
+
     @tracer.start_as_current_span("persiste_documentos")
     async def persiste_documentos(
         self,
@@ -257,16 +287,24 @@ class DocumentoCS(CognitiveSearch):
                 #             )
                 #         )
                 # else:
-                await LocalFileProcessor.process(
-                    content_bytes=content_bytes,
-                    extensao=extensao,
-                    real_filename=real_filename,
-                    user_filename=user_filename,
-                    token=token,
-                    fn_create_section=self.__criar_secoes,
-                    fn_text_spliter=self.__text_spliter,
-                    fn_populate_intex=self._popular_indice,
-                )
+                try:
+                    await LocalFileProcessor.process(
+                        content_bytes=content_bytes,
+                        extensao=extensao,
+                        real_filename=real_filename,
+                        user_filename=user_filename,
+                        token=token,
+                        fn_create_section=self.__criar_secoes,
+                        fn_text_spliter=self.__text_spliter,
+                        fn_populate_intex=self._popular_indice,
+                    )
+                except Exception as error:
+                    # as seções são enviadas à medida que ficam prontas, então
+                    # uma falha no meio do pipeline deixaria o documento
+                    # parcialmente indexado
+                    await self.__remover_secoes(real_filename)
+
+                    raise error
 
                 logger.info(
                     f"Tempo total gasto pra indexar o documento no AI Search: {(time.time() - inicio)}"
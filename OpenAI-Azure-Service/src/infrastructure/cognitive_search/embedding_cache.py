@@ -0,0 +1,170 @@
+import asyncio
+import base64
+import hashlib
+import logging
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from opentelemetry import trace
+from redis.exceptions import RedisError
+
+from src.infrastructure.env import (
+    EMBEDDING_CACHE_MAX_MB,
+    EMBEDDING_CACHE_REDIS_ATIVO,
+    EMBEDDING_CACHE_REDIS_TTL,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+PREFIXO_CHAVE = "embedding"
+
+
+class EmbeddingCache:
+    """Cache de embeddings endereçado pelo conteúdo: a chave é o deployment
+    do modelo + o SHA-256 do texto normalizado. Possui um nível em memória
+    (LRU limitado por EMBEDDING_CACHE_MAX_MB) e, opcionalmente, um nível no
+    Redis compartilhado entre as instâncias da aplicação.
+
+    Os vetores são armazenados em float32, mesma precisão retornada pela API.
+    """
+
+    _itens: "OrderedDict[str, array]" = OrderedDict()
+    _bytes: int = 0
+    _metricas: Dict[str, int] = {
+        "hits_memoria": 0,
+        "hits_redis": 0,
+        "misses": 0,
+        "remocoes": 0,
+        "erros_redis": 0,
+    }
+
+    @staticmethod
+    def gerar_chave(deployment: str, texto: str) -> str:
+        normalizado = " ".join(texto.split())
+        digest = hashlib.sha256(normalizado.encode("utf-8")).hexdigest()
+
+        return f"{PREFIXO_CHAVE}:{deployment}:{digest}"
+
+    @classmethod
+    def _get_memoria(cls, chave: str) -> Optional[array]:
+        vetor = cls._itens.get(chave)
+
+        if vetor is not None:
+            cls._itens.move_to_end(chave)
+
+        return vetor
+
+    @classmethod
+    def _set_memoria(cls, chave: str, vetor: array):
+        anterior = cls._itens.pop(chave, None)
+
+        if anterior is not None:
+            cls._bytes -= anterior.itemsize * len(anterior)
+
+        cls._itens[chave] = vetor
+        cls._bytes += vetor.itemsize * len(vetor)
+
+        limite = EMBEDDING_CACHE_MAX_MB * 1024 * 1024
+
+        while cls._bytes > limite and cls._itens:
+            _, removido = cls._itens.popitem(last=False)
+            cls._bytes -= removido.itemsize * len(removido)
+            cls._metricas["remocoes"] += 1
+
+    @staticmethod
+    def _get_redis():
+        # import tardio: o cliente só é criado quando o nível Redis está ativo
+        from src.infrastructure.redis.redis_chattcu import RedisClient
+
+        return RedisClient().connection
+
+    @classmethod
+    async def _get_redis_em_lote(cls, chaves: List[str]) -> List[Optional[array]]:
+        try:
+            valores = await asyncio.to_thread(cls._get_redis().mget, chaves)
+        except RedisError as erro:
+            cls._metricas["erros_redis"] += 1
+            logger.warning(f"Erro ao consultar o cache de embeddings no REDIS: {erro}")
+
+            return [None] * len(chaves)
+
+        return [
+            array("f", base64.b64decode(valor)) if valor else None for valor in valores
+        ]
+
+    @classmethod
+    async def _set_redis_em_lote(cls, itens: Dict[str, array]):
+        def _gravar():
+            with cls._get_redis().pipeline(transaction=False) as pipe:
+                for chave, vetor in itens.items():
+                    pipe.set(
+                        chave,
+                        base64.b64encode(vetor.tobytes()).decode("ascii"),
+                        ex=EMBEDDING_CACHE_REDIS_TTL,
+                    )
+                pipe.execute()
+
+        try:
+            await asyncio.to_thread(_gravar)
+        except RedisError as erro:
+            cls._metricas["erros_redis"] += 1
+            logger.warning(f"Erro ao gravar o cache de embeddings no REDIS: {erro}")
+
+    @classmethod
+    @tracer.start_as_current_span("obter_embeddings")
+    async def obter(
+        cls, deployment: str, textos: List[str]
+    ) -> List[Optional[List[float]]]:
+        """Retorna, na ordem dos textos, o vetor em cache ou None."""
+        chaves = [cls.gerar_chave(deployment, texto) for texto in textos]
+        vetores = [cls._get_memoria(chave) for chave in chaves]
+
+        cls._metricas["hits_memoria"] += sum(v is not None for v in vetores)
+
+        faltantes = [i for i, vetor in enumerate(vetores) if vetor is None]
+
+        if faltantes and EMBEDDING_CACHE_REDIS_ATIVO:
+            do_redis = await cls._get_redis_em_lote([chaves[i] for i in faltantes])
+
+            for i, vetor in zip(faltantes, do_redis):
+                if vetor is not None:
+                    vetores[i] = vetor
+                    cls._set_memoria(chaves[i], vetor)
+                    cls._metricas["hits_redis"] += 1
+
+        cls._metricas["misses"] += sum(v is None for v in vetores)
+
+        return [vetor.tolist() if vetor is not None else None for vetor in vetores]
+
+    @classmethod
+    @tracer.start_as_current_span("armazenar_embeddings")
+    async def armazenar(
+        cls, deployment: str, textos: List[str], vetores: List[List[float]]
+    ):
+        itens = {
+            cls.gerar_chave(deployment, texto): array("f", vetor)
+            for texto, vetor in zip(textos, vetores)
+        }
+
+        for chave, vetor in itens.items():
+            cls._set_memoria(chave, vetor)
+
+        if itens and EMBEDDING_CACHE_REDIS_ATIVO:
+            await cls._set_redis_em_lote(itens)
+
+    @classmethod
+    def limpar(cls):
+        cls._itens.clear()
+        cls._bytes = 0
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "itens": len(cls._itens),
+            "bytes": cls._bytes,
+            "max_bytes": EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+            "redis_ativo": EMBEDDING_CACHE_REDIS_ATIVO,
+            **cls._metricas,
+        }
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from opentelemetry import trace
+from redis.exceptions import RedisError
+
+from src.infrastructure.env import (
+    FILTRO_BUSCA_CACHE_MAX_ITENS,
+    FILTRO_BUSCA_CACHE_REDIS_ATIVO,
+    FILTRO_BUSCA_CACHE_REDIS_TTL,
+    FILTRO_BUSCA_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+PREFIXO_CHAVE = "filtro_busca"
+
+
+class FiltroBuscaCache:
+    """Cache das saídas estruturadas das chamadas ao LLM que antecedem as
+    buscas (ano_inicial, ano_final, autor, pagina_inicial, pagina_final,
+    pergunta), indexado pelo tipo de busca + SHA-256 do prompt normalizado.
+
+    Possui um nível em memória (LRU com TTL) e, opcionalmente, um nível no
+    Redis compartilhado entre as instâncias da aplicação. As métricas são
+    separadas por tipo de busca."""
+
+    _itens: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+    _metricas: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def normalizar(prompt: str) -> str:
+        # perguntas reenviadas costumam diferir apenas em caixa, espaços e
+        # pontuação final
+        return " ".join(prompt.lower().split()).rstrip(" ?!.;")
+
+    @classmethod
+    def gerar_chave(cls, tipo: str, prompt: str, contexto: str = "") -> str:
+        normalizado = f"{contexto}\n{cls.normalizar(prompt)}"
+        digest = hashlib.sha256(normalizado.encode("utf-8")).hexdigest()
+
+        return f"{PREFIXO_CHAVE}:{tipo}:{digest}"
+
+    @classmethod
+    def _contar(cls, tipo: str, evento: str):
+        metricas = cls._metricas.setdefault(
+            tipo, {"hits_memoria": 0, "hits_redis": 0, "misses": 0, "erros_redis": 0}
+        )
+        metricas[evento] += 1
+
+    @classmethod
+    def _get_memoria(cls, chave: str) -> Optional[dict]:
+        item = cls._itens.get(chave)
+
+        if item is None:
+            return None
+
+        expira_em, valor = item
+
+        if expira_em <= time.monotonic():
+            del cls._itens[chave]
+
+            return None
+
+        cls._itens.move_to_end(chave)
+
+        return valor
+
+    @classmethod
+    def _set_memoria(cls, chave: str, valor: dict):
+        cls._itens[chave] = (time.monotonic() + FILTRO_BUSCA_CACHE_TTL, valor)
+        cls._itens.move_to_end(chave)
+
+        while len(cls._itens) > FILTRO_BUSCA_CACHE_MAX_ITENS:
+            cls._itens.popitem(last=False)
+
+    @staticmethod
+    def _get_redis():
+        # import tardio: o cliente só é criado quando o nível Redis está ativo
+        from src.infrastructure.redis.redis_chattcu import RedisClient
+
+        return RedisClient().connection
+
+    @classmethod
+    @tracer.start_as_current_span("obter_filtro_busca")
+    async def obter(cls, tipo: str, prompt: str, contexto: str = "") -> Optional[dict]:
+        """Retorna uma cópia do filtro em cache ou None."""
+        chave = cls.gerar_chave(tipo, prompt, contexto)
+        valor = cls._get_memoria(chave)
+
+        if valor is not None:
+            cls._contar(tipo, "hits_memoria")
+
+            return dict(valor)
+
+        if FILTRO_BUSCA_CACHE_REDIS_ATIVO:
+            try:
+                dado = await asyncio.to_thread(cls._get_redis().get, chave)
+            except RedisError as erro:
+                cls._contar(tipo, "erros_redis")
+                logger.warning(f"Erro ao consultar o cache de filtros no REDIS: {erro}")
+
+                dado = None
+
+            if dado:
+                valor = json.loads(dado)
+                cls._set_memoria(chave, valor)
+                cls._contar(tipo, "hits_redis")
+
+                return dict(valor)
+
+        cls._contar(tipo, "misses")
+
+        return None
+
+    @classmethod
+    @tracer.start_as_current_span("armazenar_filtro_busca")
+    async def armazenar(cls, tipo: str, prompt: str, valor: dict, contexto: str = ""):
+        chave = cls.gerar_chave(tipo, prompt, contexto)
+
+        cls._set_memoria(chave, dict(valor))
+
+        if FILTRO_BUSCA_CACHE_REDIS_ATIVO:
+            try:
+                await asyncio.to_thread(
+                    cls._get_redis().set,
+                    chave,
+                    json.dumps(valor),
+                    ex=FILTRO_BUSCA_CACHE_REDIS_TTL,
+                )
+            except RedisError as erro:
+                cls._contar(tipo, "erros_redis")
+                logger.warning(f"Erro ao gravar o cache de filtros no REDIS: {erro}")
+
+    @classmethod
+    def limpar(cls):
+        cls._itens.clear()
+        cls._metricas.clear()
+
+    @classmethod
+    def metricas(cls) -> dict:
+        por_tipo = {}
+
+        for tipo, metricas in cls._metricas.items():
+            hits = metricas["hits_memoria"] + metricas["hits_redis"]
+            total = hits + metricas["misses"]
+
+            por_tipo[tipo] = {
+                **metricas,
+                "taxa_acerto": round(hits / total, 4) if total else 0,
+            }
+
+        return {
+            "itens": len(cls._itens),
+            "redis_ativo": FILTRO_BUSCA_CACHE_REDIS_ATIVO,
+            "tipos": por_tipo,
+        }
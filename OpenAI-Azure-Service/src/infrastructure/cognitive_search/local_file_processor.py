@@ -4,19 +4,31 @@ import os
 import time
 from abc import ABC
 from tempfile import NamedTemporaryFile, _TemporaryFileWrapper
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 
-import fitz  # PyMuPDF
-import pandas as pd
 from langchain.docstore.document import Document
 from langchain_community.callbacks.openai_info import OpenAICallbackHandler
-from langchain_community.document_loaders import CSVLoader
 from opentelemetry import trace
 
 from src.conf.env import configs
 from src.domain.llm.model_factory import ModelFactory
 from src.domain.llm.tools.sumarizador_documento_upload import SumarizadorDocumentoUpload
 from src.domain.schemas import GabiResponse
-from src.infrastructure.env import MODELO_PADRAO, MODELOS, VERBOSE
+from src.infrastructure.env import (
+    INDEXACAO_MAX_LOTES_PENDENTES,
+    INDEXACAO_TAMANHO_LOTE,
+    MODELO_PADRAO,
+    MODELOS,
+    PARSER_POOL_PAGINAS_POR_TAREFA,
+    VERBOSE,
+)
+from src.infrastructure.parser_pool.parser_pool import ParserPool
+from src.infrastructure.parser_pool.parsers import (
+    contar_paginas_pdf,
+    extrair_csv,
+    extrair_paginas_pdf,
+    extrair_planilhas_xlsx,
+)
 from src.util.docx_to_pdf_converter import DocxToPdfConverter
 from src.util.upload_util import write_data_in_temporary_file
 
@@ -25,6 +37,44 @@ tracer = trace.get_tracer(__name__)
 
 
 class LocalFileProcessor(ABC):
+    @staticmethod
+    async def __stream_document_from_pdf(
+        temp_file: _TemporaryFileWrapper, filename: str
+    ) -> AsyncIterator[Document]:
+        """Emite as páginas do PDF à medida que os intervalos de
+        PARSER_POOL_PAGINAS_POR_TAREFA páginas são extraídos no pool de
+        processos. O intervalo seguinte é extraído enquanto o atual é
+        consumido."""
+        temp_file.seek(0)
+
+        total = await ParserPool.executar(contar_paginas_pdf, temp_file.name)
+
+        def extrair(inicio: int) -> asyncio.Task:
+            return asyncio.create_task(
+                ParserPool.executar(
+                    extrair_paginas_pdf,
+                    temp_file.name,
+                    filename,
+                    inicio,
+                    inicio + PARSER_POOL_PAGINAS_POR_TAREFA,
+                )
+            )
+
+        proxima = extrair(0) if total else None
+
+        try:
+            for inicio in range(0, total, PARSER_POOL_PAGINAS_POR_TAREFA):
+                seguinte = inicio + PARSER_POOL_PAGINAS_POR_TAREFA
+                atual, proxima = proxima, (
+                    extrair(seguinte) if seguinte < total else None
+                )
+
+                for page in await atual:
+                    yield page
+        finally:
+            if proxima and not proxima.done():
+                proxima.cancel()
+
     @tracer.start_as_current_span("__load_document_from_pdf_bytes")
     @staticmethod
     async def __load_document_from_pdf_bytes(
@@ -33,20 +83,12 @@ class LocalFileProcessor(ABC):
         inicio = time.time()
         logger.info("Realiza o load do arquivo PDF através dos bytes")
 
-        temp_file.seek(0)
-
-        pages = []
-        with fitz.open(filename=temp_file.name, filetype="pdf") as pdf:
-            for i in range(len(pdf)):
-                page = pdf.load_page(i)
-                text = page.get_text()
-
-                pages.append(
-                    Document(
-                        page_content=text,
-                        metadata={"source": filename, "page": i + 1},
-                    )
-                )
+        pages = [
+            page
+            async for page in LocalFileProcessor.__stream_document_from_pdf(
+                temp_file, filename
+            )
+        ]
 
         fim = time.time()
 
@@ -68,13 +110,8 @@ class LocalFileProcessor(ABC):
         )
         temp_file.seek(0)
 
-        loader = CSVLoader(temp_file.name, encoding="utf-8")
-
-        data = loader.load()
-
-        page = Document(
-            page_content=" ".join([doc.page_content for doc in data]),
-            metadata={"page": page_number, "source": filename},
+        pages = await ParserPool.executar(
+            extrair_csv, temp_file.name, filename, page_number
         )
 
         fim = time.time()
@@ -82,7 +119,7 @@ class LocalFileProcessor(ABC):
             f"Tempo total gasto carregando documento para indexação: {(fim - inicio)}"
         )
 
-        return [page]
+        return pages
 
     @tracer.start_as_current_span("__load_document_from_xlsx_as_csv")
     @staticmethod
@@ -90,26 +127,10 @@ class LocalFileProcessor(ABC):
         temp_file: _TemporaryFileWrapper, filename: str
     ):
         temp_file.seek(0)
-        xls = pd.ExcelFile(temp_file.name, engine="openpyxl")
-
-        pages = []
-
-        for i, plan_name in enumerate(xls.sheet_names):
-            logger.info(f"Processando planilha {i+1}:{plan_name}")
-
-            df = pd.read_excel(xls, sheet_name=i)
-            df.fillna("", inplace=False)
-
-            plan_doc = Document(
-                page_content=df.to_html(),
-                metadata={"page": i + 1, "source": filename},
-            )
 
-            pages.append(plan_doc)
-
-        xls.close()
-
-        return pages
+        return await ParserPool.executar(
+            extrair_planilhas_xlsx, temp_file.name, filename
+        )
 
     @tracer.start_as_current_span("__load_document")
     @staticmethod
@@ -131,13 +152,31 @@ class LocalFileProcessor(ABC):
                 temp_file, filename
             )
 
-    @tracer.start_as_current_span("__process_docx")
     @staticmethod
-    async def __process_docx(
-        temp_file: _TemporaryFileWrapper,
-        real_filename: str,
-        sumarizador: SumarizadorDocumentoUpload,
-    ):
+    async def __stream_document(
+        temp_file: _TemporaryFileWrapper, filename: str, extensao: str
+    ) -> AsyncIterator[Document]:
+        if extensao == "pdf":
+            async for page in LocalFileProcessor.__stream_document_from_pdf(
+                temp_file, filename
+            ):
+                yield page
+            return
+
+        # planilhas e csv são carregados por inteiro, pois cada planilha
+        # (ou o csv inteiro) corresponde a uma única página
+        pages = await LocalFileProcessor.__load_document(
+            temp_file=temp_file, filename=filename, extensao=extensao
+        )
+
+        for page in pages or []:
+            yield page
+
+    @tracer.start_as_current_span("__converter_docx")
+    @staticmethod
+    async def __converter_docx(temp_file: _TemporaryFileWrapper) -> str:
+        """Converte o docx para PDF e retorna o caminho de um arquivo
+        temporário com o PDF gerado."""
         conversor = DocxToPdfConverter()
 
         loop = asyncio.get_event_loop()
@@ -145,29 +184,17 @@ class LocalFileProcessor(ABC):
             None, conversor.converter, temp_file
         )
 
-        resumo = None
-        pages = []
-
         with open(path_file_converted, "rb") as f:
             with NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
                 write_data_in_temporary_file(f, temp_pdf)
 
-                resumo = await sumarizador.sumarizar(temp_pdf)
-
-                pages = await LocalFileProcessor.__load_document(
-                    filename=real_filename,
-                    temp_file=temp_pdf,
-                    extensao="pdf",
-                )
-
         os.unlink(path_file_converted)
 
-        return pages, resumo
+        return temp_pdf.name
 
-    @tracer.start_as_current_span("__process_file")
     @staticmethod
-    async def __process_file(token, real_filename, extensao, content_bytes):
-        sumarizador = SumarizadorDocumentoUpload(
+    def __criar_sumarizador(token) -> SumarizadorDocumentoUpload:
+        return SumarizadorDocumentoUpload(
             stream=True,
             msg=None,
             llm=ModelFactory.get_model(
@@ -185,36 +212,99 @@ class LocalFileProcessor(ABC):
             ),
             token=token,
         )
-        resumo = None
 
-        pages = []
-        with NamedTemporaryFile(
-            suffix=f".{extensao.lower()}", delete=False
-        ) as temp_file:
-            write_data_in_temporary_file(content_bytes, temp_file)
+    @tracer.start_as_current_span("__indexar_em_pipeline")
+    @staticmethod
+    async def __indexar_em_pipeline(
+        pages: AsyncIterator[Document],
+        fn_resumo: Optional[Callable[[], Awaitable[Optional[str]]]],
+        real_filename: str,
+        user_filename: str,
+        fn_text_spliter,
+        fn_create_section,
+        fn_populate_intex,
+    ):
+        """Executa leitura -> quebra em trechos -> embeddings -> upload em
+        estágios concorrentes ligados por filas limitadas. Cada lote de
+        INDEXACAO_TAMANHO_LOTE seções é enviado ao índice assim que fica
+        pronto, de forma que a memória utilizada independe do tamanho do
+        documento."""
+        inicio = time.time()
 
-            if "docx" == extensao.lower():
-                pages, resumo = await LocalFileProcessor.__process_docx(
-                    temp_file, real_filename, sumarizador
-                )
-            elif "pdf" == extensao.lower():
-                resumo = await sumarizador.sumarizar(temp_file)
+        fila_trechos: asyncio.Queue = asyncio.Queue(maxsize=INDEXACAO_TAMANHO_LOTE)
+        fila_secoes: asyncio.Queue = asyncio.Queue(
+            maxsize=INDEXACAO_MAX_LOTES_PENDENTES
+        )
 
-                pages = await LocalFileProcessor.__load_document(
-                    filename=real_filename, temp_file=temp_file, extensao=extensao
-                )
-            else:
-                pages = await LocalFileProcessor.__load_document(
-                    filename=real_filename, temp_file=temp_file, extensao=extensao
-                )
+        async def produzir_trechos(tarefa_resumo: Optional[asyncio.Task]):
+            async for page in pages:
+                for trecho in await fn_text_spliter([page]):
+                    await fila_trechos.put(trecho)
+
+            resumo = await tarefa_resumo if tarefa_resumo else None
 
             if resumo:
-                logger.info("Resumo do arquivo gerado com sucesso!")
+                logger.info("Adicionando resumo as pages do documento!")
+
+                await fila_trechos.put(
+                    Document(
+                        page_content=f"RESUMO RESUMO RESUMO {resumo}",
+                        metadata={"source": real_filename, "page": "RESUMO"},
+                    )
+                )
+
+            await fila_trechos.put(None)
+
+        async def gerar_secoes():
+            lote: List[Document] = []
+            indice_inicial = 0
+
+            while True:
+                trecho = await fila_trechos.get()
+
+                if trecho is not None:
+                    lote.append(trecho)
+
+                if lote and (trecho is None or len(lote) == INDEXACAO_TAMANHO_LOTE):
+                    secoes = await fn_create_section(
+                        user_filename=user_filename,
+                        real_filename=real_filename,
+                        trechos=lote,
+                        indice_inicial=indice_inicial,
+                    )
+
+                    await fila_secoes.put(secoes)
+
+                    indice_inicial += len(lote)
+                    lote = []
 
-        if temp_file:
-            os.unlink(temp_file.name)
+                if trecho is None:
+                    await fila_secoes.put(None)
+                    return
 
-        return pages, resumo
+        async def enviar_secoes():
+            quantidade = 0
+
+            while (secoes := await fila_secoes.get()) is not None:
+                await fn_populate_intex(sections=secoes)
+
+                quantidade += len(secoes)
+
+            logger.info(f"Quantidade de seçoes: {quantidade}")
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tarefa_resumo = tg.create_task(fn_resumo()) if fn_resumo else None
+
+                tg.create_task(produzir_trechos(tarefa_resumo))
+                tg.create_task(gerar_secoes())
+                tg.create_task(enviar_secoes())
+        except ExceptionGroup as grupo:
+            raise grupo.exceptions[0] from grupo
+
+        logger.info(
+            f"Tempo total gasto no pipeline de indexação do arquivo ({real_filename}): {(time.time() - inicio)}"
+        )
 
     @tracer.start_as_current_span("process")
     @staticmethod
@@ -224,45 +314,71 @@ class LocalFileProcessor(ABC):
         real_filename = kwargs.get("real_filename")
         user_filename = kwargs.get("user_filename")
         extensao = kwargs.get("extensao")
-        fn_text_spliter = kwargs.get("fn_text_spliter")
-        fn_create_section = kwargs.get("fn_create_section")
-        fn_populate_intex = kwargs.get("fn_populate_intex")
+        etapas = {
+            "real_filename": real_filename,
+            "user_filename": user_filename,
+            "fn_text_spliter": kwargs.get("fn_text_spliter"),
+            "fn_create_section": kwargs.get("fn_create_section"),
+            "fn_populate_intex": kwargs.get("fn_populate_intex"),
+        }
 
-        if not isinstance(content_bytes, GabiResponse):
-            pages, resumo = await LocalFileProcessor.__process_file(
-                token=token,
-                real_filename=real_filename,
-                extensao=extensao,
-                content_bytes=content_bytes,
-            )
-        else:
-            resumo = content_bytes.summary
-            pages = [
-                Document(
+        logger.info(f"Persiste no CognitiveSearch o arquivo ({real_filename})")
+
+        if isinstance(content_bytes, GabiResponse):
+
+            async def transcricao():
+                yield Document(
                     page_content=content_bytes.transcript,
                     metadata={"source": real_filename, "page": 1},
                 )
-            ]
 
-        trechos = await fn_text_spliter(pages)
+            async def resumo_gabi():
+                return content_bytes.summary
 
-        if resumo:
-            logger.info("Adicionando resumo as pages do documento!")
-            trechos.append(
-                Document(
-                    page_content=f"RESUMO RESUMO RESUMO {resumo}",
-                    metadata={"source": real_filename, "page": "RESUMO"},
-                )
+            await LocalFileProcessor.__indexar_em_pipeline(
+                pages=transcricao(), fn_resumo=resumo_gabi, **etapas
             )
-
-        logger.info(f"Persiste no CognitiveSearch o arquivo ({real_filename})")
-
-        secoes = await fn_create_section(
-            user_filename=user_filename,
-            real_filename=real_filename,
-            trechos=trechos,
-        )
-
-        logger.info(f"Quantidade de seçoes: {len(secoes)}")
-
-        await fn_populate_intex(sections=secoes)
+            return
+
+        extensao = extensao.lower()
+        temporarios = []
+
+        try:
+            with NamedTemporaryFile(suffix=f".{extensao}", delete=False) as temp_file:
+                temporarios.append(temp_file.name)
+                write_data_in_temporary_file(content_bytes, temp_file)
+
+                fn_resumo = None
+
+                if extensao == "docx":
+                    path_pdf = await LocalFileProcessor.__converter_docx(temp_file)
+                    temporarios.append(path_pdf)
+
+                    arquivo_origem = open(path_pdf, "rb")
+                    extensao = "pdf"
+                else:
+                    arquivo_origem = temp_file
+
+                with arquivo_origem:
+                    if extensao == "pdf":
+                        sumarizador = LocalFileProcessor.__criar_sumarizador(token)
+
+                        # o resumo é gerado em paralelo à indexação dos trechos
+                        # e entra como última seção do documento
+                        async def fn_resumo():
+                            with open(arquivo_origem.name, "rb") as arquivo:
+                                return await sumarizador.sumarizar(arquivo)
+
+                    await LocalFileProcessor.__indexar_em_pipeline(
+                        pages=LocalFileProcessor.__stream_document(
+                            temp_file=arquivo_origem,
+                            filename=real_filename,
+                            extensao=extensao,
+                        ),
+                        fn_resumo=fn_resumo,
+                        **etapas,
+                    )
+        finally:
+            for temporario in temporarios:
+                if os.path.exists(temporario):
+                    os.unlink(temporario)
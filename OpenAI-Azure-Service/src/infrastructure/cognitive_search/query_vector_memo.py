@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from opentelemetry import trace
+
+from src.infrastructure.env import (
+    CONSULTA_VETOR_MEMO_MAX_ITENS,
+    CONSULTA_VETOR_MEMO_TTL,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class QueryVectorMemo:
+    """Memo dos vetores das perguntas utilizadas nas buscas vetoriais.
+
+    Os itens expiram após CONSULTA_VETOR_MEMO_TTL segundos e, ao atingir
+    CONSULTA_VETOR_MEMO_MAX_ITENS, os menos utilizados são descartados.
+    Buscas concorrentes pela mesma pergunta (ex.: a mesma pergunta em vários
+    índices) compartilham uma única chamada de embedding (single-flight)."""
+
+    _itens: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+    _em_andamento: Dict[str, asyncio.Task] = {}
+    _metricas: Dict[str, int] = {
+        "hits": 0,
+        "misses": 0,
+        "compartilhados": 0,
+        "expirados": 0,
+    }
+
+    @classmethod
+    def _get(cls, chave: str):
+        item = cls._itens.get(chave)
+
+        if item is None:
+            return None
+
+        expira_em, vetor = item
+
+        if expira_em <= time.monotonic():
+            del cls._itens[chave]
+            cls._metricas["expirados"] += 1
+
+            return None
+
+        cls._itens.move_to_end(chave)
+
+        return vetor
+
+    @classmethod
+    def _set(cls, chave: str, vetor: List[float]):
+        cls._itens[chave] = (time.monotonic() + CONSULTA_VETOR_MEMO_TTL, vetor)
+        cls._itens.move_to_end(chave)
+
+        while len(cls._itens) > CONSULTA_VETOR_MEMO_MAX_ITENS:
+            cls._itens.popitem(last=False)
+
+    @classmethod
+    @tracer.start_as_current_span("obter_vetor_consulta")
+    async def obter(
+        cls, chave: str, fn_gerar: Callable[[], Awaitable[List[float]]]
+    ) -> List[float]:
+        vetor = cls._get(chave)
+
+        if vetor is not None:
+            cls._metricas["hits"] += 1
+
+            return vetor
+
+        tarefa = cls._em_andamento.get(chave)
+
+        if tarefa is not None:
+            cls._metricas["compartilhados"] += 1
+        else:
+            cls._metricas["misses"] += 1
+
+            tarefa = asyncio.ensure_future(fn_gerar())
+            cls._em_andamento[chave] = tarefa
+
+            def _finalizar(tarefa: asyncio.Task):
+                cls._em_andamento.pop(chave, None)
+
+                if not tarefa.cancelled() and tarefa.exception() is None:
+                    cls._set(chave, tarefa.result())
+
+            tarefa.add_done_callback(_finalizar)
+
+        # o cancelamento de um dos requests não interrompe a geração do
+        # vetor aguardada pelos demais
+        return await asyncio.shield(tarefa)
+
+    @classmethod
+    def limpar(cls):
+        cls._itens.clear()
+        cls._em_andamento.clear()
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "itens": len(cls._itens),
+            "em_andamento": len(cls._em_andamento),
+            "ttl": CONSULTA_VETOR_MEMO_TTL,
+            **cls._metricas,
+        }
@@ -0,0 +1,172 @@
+import hashlib
+import logging
+import math
+import operator
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from opentelemetry import trace
+
+from src.infrastructure.env import (
+    RESPOSTA_CACHE_LIMIAR_SIMILARIDADE,
+    RESPOSTA_CACHE_MAX_ITENS,
+    RESPOSTA_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class RespostaSemanticaCache:
+    """Cache semântico de respostas, particionado por (agente, modelo,
+    instruções do agente). Uma pergunta idêntica após a normalização é
+    resolvida pela chave; as demais são comparadas pela similaridade de
+    cosseno do embedding com as perguntas já respondidas na partição.
+
+    Cada resposta registra o índice de busca que a originou, para que seja
+    invalidada quando o índice for atualizado (ex.: Sistema CASA)."""
+
+    _particoes: Dict[str, "OrderedDict[str, dict]"] = {}
+    _metricas: Dict[str, int] = {
+        "hits_exatos": 0,
+        "hits_semanticos": 0,
+        "misses": 0,
+        "armazenadas": 0,
+        "invalidadas": 0,
+    }
+
+    @staticmethod
+    def gerar_particao(agente: str, modelo: str, instrucoes: str) -> str:
+        digest = hashlib.sha256(instrucoes.encode("utf-8")).hexdigest()
+
+        return f"{agente}:{modelo}:{digest}"
+
+    @staticmethod
+    def normalizar(prompt: str) -> str:
+        return " ".join(prompt.lower().split()).rstrip(" ?!.;")
+
+    @staticmethod
+    def _normalizar_vetor(vetor: List[float]) -> array:
+        norma = math.sqrt(sum(x * x for x in vetor)) or 1.0
+
+        return array("f", (x / norma for x in vetor))
+
+    @staticmethod
+    def _similaridade(a: array, b: array) -> float:
+        # vetores unitários: o produto escalar é a similaridade de cosseno
+        return sum(map(operator.mul, a, b))
+
+    @classmethod
+    def _resultado(cls, item: dict, similaridade: float) -> dict:
+        return {
+            "resposta": item["resposta"],
+            "trechos": [dict(trecho) for trecho in item["trechos"]],
+            "arquivos_busca": item["arquivos_busca"],
+            "similaridade": similaridade,
+        }
+
+    @classmethod
+    @tracer.start_as_current_span("buscar_resposta_em_cache")
+    def buscar(cls, particao: str, prompt: str, vetor: List[float]) -> Optional[dict]:
+        itens = cls._particoes.get(particao)
+
+        if not itens:
+            cls._metricas["misses"] += 1
+            return None
+
+        agora = time.monotonic()
+
+        for chave in [c for c, item in itens.items() if item["expira_em"] <= agora]:
+            del itens[chave]
+
+        chave = cls.normalizar(prompt)
+        item = itens.get(chave)
+
+        if item is not None:
+            itens.move_to_end(chave)
+            cls._metricas["hits_exatos"] += 1
+
+            return cls._resultado(item, 1.0)
+
+        vetor = cls._normalizar_vetor(vetor)
+        melhor_chave, melhor_similaridade = None, -1.0
+
+        for chave, item in itens.items():
+            similaridade = cls._similaridade(vetor, item["vetor"])
+
+            if similaridade > melhor_similaridade:
+                melhor_chave, melhor_similaridade = chave, similaridade
+
+        if melhor_similaridade < RESPOSTA_CACHE_LIMIAR_SIMILARIDADE:
+            cls._metricas["misses"] += 1
+            return None
+
+        itens.move_to_end(melhor_chave)
+        cls._metricas["hits_semanticos"] += 1
+
+        logger.info(
+            f"Resposta em cache reaproveitada (similaridade {melhor_similaridade:.4f})"
+        )
+
+        return cls._resultado(itens[melhor_chave], melhor_similaridade)
+
+    @classmethod
+    def armazenar(
+        cls,
+        particao: str,
+        prompt: str,
+        vetor: List[float],
+        resposta: str,
+        trechos: List[dict],
+        arquivos_busca: Optional[str],
+        indice: Optional[str] = None,
+    ):
+        itens = cls._particoes.setdefault(particao, OrderedDict())
+        chave = cls.normalizar(prompt)
+
+        itens[chave] = {
+            "vetor": cls._normalizar_vetor(vetor),
+            "resposta": resposta,
+            "trechos": [dict(trecho) for trecho in trechos],
+            "arquivos_busca": arquivos_busca,
+            "indice": indice,
+            "expira_em": time.monotonic() + RESPOSTA_CACHE_TTL,
+        }
+        itens.move_to_end(chave)
+        cls._metricas["armazenadas"] += 1
+
+        while len(itens) > RESPOSTA_CACHE_MAX_ITENS:
+            itens.popitem(last=False)
+
+    @classmethod
+    def invalidar(cls, indice: str) -> int:
+        """Remove as respostas geradas a partir dos trechos do índice."""
+        removidas = 0
+
+        for itens in cls._particoes.values():
+            chaves = [c for c, item in itens.items() if item["indice"] == indice]
+
+            for chave in chaves:
+                del itens[chave]
+
+            removidas += len(chaves)
+
+        cls._metricas["invalidadas"] += removidas
+
+        logger.info(f"{removidas} respostas em cache do índice {indice} invalidadas")
+
+        return removidas
+
+    @classmethod
+    def limpar(cls):
+        cls._particoes.clear()
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "particoes": len(cls._particoes),
+            "itens": sum(len(itens) for itens in cls._particoes.values()),
+            **cls._metricas,
+        }
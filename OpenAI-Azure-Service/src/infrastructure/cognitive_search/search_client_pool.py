@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+
+from azure.core.credentials import AzureKeyCredential
+from azure.search.documents.aio import SearchClient
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class SearchClientPool:
+    """Registro dos SearchClients (e respectivos pipelines HTTP/pools de
+    conexão) reutilizados durante o ciclo de vida da aplicação, um por
+    (endpoint, índice, credencial). Os clientes não devem ser fechados por
+    quem os utiliza; o encerramento ocorre no shutdown da aplicação."""
+
+    _clientes: Dict[Tuple[str, str, str], SearchClient] = {}
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _metricas: Dict[str, int] = {"criados": 0, "reutilizados": 0}
+
+    @staticmethod
+    def _gerar_chave(
+        endpoint: str, index_name: str, credential: AzureKeyCredential
+    ) -> Tuple[str, str, str]:
+        # a chave da credencial não é mantida em claro no registro
+        digest = hashlib.sha256(credential.key.encode("utf-8")).hexdigest()
+
+        return endpoint, index_name, digest
+
+    @classmethod
+    def get_client(
+        cls, endpoint: str, index_name: str, credential: AzureKeyCredential
+    ) -> SearchClient:
+        """Retorna o cliente do índice, criando-o sob demanda. Os clientes
+        criados em outro event loop (ex.: scripts e testes) são descartados,
+        pois a sessão HTTP fica vinculada ao loop em que foi aberta."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not cls._loop:
+            cls._clientes = {}
+            cls._loop = loop
+
+        chave = cls._gerar_chave(endpoint, index_name, credential)
+        client = cls._clientes.get(chave)
+
+        if client is None:
+            client = SearchClient(
+                endpoint=endpoint, index_name=index_name, credential=credential
+            )
+            cls._clientes[chave] = client
+            cls._metricas["criados"] += 1
+
+            logger.info(f"SearchClient criado para o índice {index_name}")
+        else:
+            cls._metricas["reutilizados"] += 1
+
+        return client
+
+    @classmethod
+    @tracer.start_as_current_span("fechar_conexoes")
+    async def fechar_conexoes(cls):
+        clientes = list(cls._clientes.values())
+
+        cls._clientes = {}
+        cls._loop = None
+
+        for client in clientes:
+            try:
+                await client.close()
+            except Exception as erro:
+                logger.error(f"Erro ao fechar o SearchClient: {erro}")
+
+        if clientes:
+            logger.info(f"{len(clientes)} SearchClients encerrados")
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "clientes": len(cls._clientes),
+            "indices": sorted({indice for _, indice, _ in cls._clientes}),
+            **cls._metricas,
+        }
@@ -336,10 +336,8 @@ class SegedamCS(CognitiveSearch):
 
     @tracer.start_as_current_span("buscar_servico_pelo_codigo")
     async def buscar_servico_pelo_codigo(self, codigo):
-        search_client: SearchClient = None
-
         try:
-            # Cria uma instância do cliente de pesquisa
+            # Obtém o cliente de pesquisa compartilhado do índice
             search_client: SearchClient = self._get_search_client()
 
             filtro = f"codigo_servico eq {codigo}"
@@ -354,16 +352,11 @@ class SegedamCS(CognitiveSearch):
             traceback.print_exc()
 
             raise error
-        finally:
-            if search_client:
-                await search_client.close()
 
     @tracer.start_as_current_span("obtem_ultimo_id")
     async def obtem_ultimo_id(self):
-        search_client: SearchClient = None
-
         try:
-            # Cria uma instância do cliente de pesquisa
+            # Obtém o cliente de pesquisa compartilhado do índice
             search_client: SearchClient = self._get_search_client()
 
             res = await search_client.search("", order_by="id_num desc", top=1)
@@ -376,6 +369,3 @@ class SegedamCS(CognitiveSearch):
             traceback.print_exc()
 
             raise error
-        finally:
-            if search_client:
-                await search_client.close()
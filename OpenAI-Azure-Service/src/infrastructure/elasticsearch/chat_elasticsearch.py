@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
@@ -9,6 +10,10 @@ from opentelemetry import trace
 from src.domain.chat import Chat, elastic_para_chat_dict
 from src.domain.schemas import FiltrosChat, PaginatedChatsResponse
 from src.exceptions import ElasticException
+from src.infrastructure.env import (
+    ELASTIC_MENSAGENS_EM_INDICE_PROPRIO,
+    INDICE_ELASTIC_MENSAGENS,
+)
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -17,7 +22,7 @@ tracer = trace.get_tracer(__name__)
 class ChatElasticSearch(ABC):
     @abstractmethod
     @tracer.start_as_current_span("elasticsearch_query")
-    async def elasticsearch_query(self, tipo_query, query, req_tipo="get"):
+    async def elasticsearch_query(self, tipo_query, query, req_tipo="get", indice=None):
         pass
 
     @abstractmethod
@@ -71,10 +76,27 @@ class ChatElasticSearch(ABC):
             }
         }
 
-        resultado = await self.elasticsearch_query("_search", json.dumps(query))
-        chat = elastic_para_chat_dict(resultado["hits"]["hits"][0], com_mensagem=True)
+        if not ELASTIC_MENSAGENS_EM_INDICE_PROPRIO:
+            resultado = await self.elasticsearch_query("_search", json.dumps(query))
+            chat = elastic_para_chat_dict(
+                resultado["hits"]["hits"][0], com_mensagem=True
+            )
 
-        return chat
+            return chat
+
+        # leitura combinada: mensagens antigas no documento do chat e novas no
+        # índice de mensagens (consultados em paralelo)
+        resultado, mensagens_do_indice = await asyncio.gather(
+            self.elasticsearch_query("_search", json.dumps(query)),
+            self.buscar_mensagens_do_indice(chat_id),
+        )
+
+        dado = resultado["hits"]["hits"][0]
+        dado["_source"]["mensagens"] = combinar_mensagens(
+            dado["_source"].get("mensagens", []), mensagens_do_indice
+        )
+
+        return elastic_para_chat_dict(dado, com_mensagem=True)
 
     @tracer.start_as_current_span("renomear")
     async def renomear(self, chat_id: str, novo_titulo: str):
@@ -309,6 +331,14 @@ class ChatElasticSearch(ABC):
     async def buscar_imagem(
         self, chat_id: str, msg_id: str, id_imagem: str, login: str
     ):
+        if ELASTIC_MENSAGENS_EM_INDICE_PROPRIO:
+            imagens_encontradas = await self.__buscar_imagem_no_indice(
+                chat_id, msg_id, id_imagem
+            )
+
+            if imagens_encontradas:
+                return imagens_encontradas
+
         query = {
             "_source": ["mensagens.codigo", "mensagens.imagens.id_imagem"],
             "query": {
@@ -379,3 +409,49 @@ class ChatElasticSearch(ABC):
         except Exception as e:
             logger.error(f"Erro ao processar a resposta do Elasticsearch: {e}")
         return None
+
+    async def __buscar_imagem_no_indice(
+        self, chat_id: str, msg_id: str, id_imagem: str
+    ):
+        query = {
+            "_source": ["codigo"],
+            "query": {
+                "bool": {
+                    "must": [
+                        {"term": {"chat_id": chat_id}},
+                        {"term": {"codigo": msg_id}},
+                        {"term": {"imagens.id_imagem": id_imagem}},
+                    ]
+                }
+            },
+        }
+
+        resultado = await self.elasticsearch_query(
+            "_search", json.dumps(query), indice=INDICE_ELASTIC_MENSAGENS
+        )
+
+        return [
+            {
+                "chat_id": chat_id,
+                "mensagem_id": hit["_source"]["codigo"],
+                "id_imagem": id_imagem,
+            }
+            for hit in resultado.get("hits", {}).get("hits", [])
+        ]
+
+
+def combinar_mensagens(mensagens_do_chat: List[dict], mensagens_do_indice: List[dict]):
+    """Concatena as mensagens do documento do chat (formato antigo) com as do
+    índice de mensagens, descartando as já migradas que ainda constem no
+    documento do chat."""
+    vistas = set()
+    mensagens = []
+
+    for mensagem in mensagens_do_chat + mensagens_do_indice:
+        chave = (mensagem["codigo"], mensagem["papel"], mensagem["data_envio"])
+
+        if chave not in vistas:
+            vistas.add(chave)
+            mensagens.append(mensagem)
+
+    return mensagens
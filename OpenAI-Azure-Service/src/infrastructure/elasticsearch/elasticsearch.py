@@ -5,6 +5,7 @@ import aiohttp
 from opentelemetry import trace
 
 from src.infrastructure.elasticsearch.chat_elasticsearch import ChatElasticSearch
+from src.infrastructure.elasticsearch.elasticsearch_pool import ElasticSearchPool
 from src.infrastructure.elasticsearch.mensagem_elasticsearch import (
     MensagemElasticSearch,
 )
@@ -26,41 +27,40 @@ class ElasticSearch(ChatElasticSearch, MensagemElasticSearch):
         self.elasticsearch_password = elasticsearch_password
         self.elasticsearch_url = elasticsearch_url
         self.elasticsearch_indice = elasticsearch_indice
+        self.auth = aiohttp.BasicAuth(
+            self.elasticsearch_login, self.elasticsearch_password
+        )
 
     @tracer.start_as_current_span("set_indice")
     def set_indice(self, elasticsearch_indice):
         self.elasticsearch_indice = elasticsearch_indice
 
     @tracer.start_as_current_span("elasticsearch_query")
-    async def elasticsearch_query(self, tipo_query, query, req_tipo="get"):
-        url_template = (
-            f"{self.elasticsearch_url}/{self.elasticsearch_indice}/{tipo_query}"
-        )
+    async def elasticsearch_query(self, tipo_query, query, req_tipo="get", indice=None):
+        indice = indice or self.elasticsearch_indice
+
+        url_template = f"{self.elasticsearch_url}/{indice}/{tipo_query}"
 
         logger.info(f"URL: {url_template}")
 
         if req_tipo == "get":
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url=url_template,
-                    headers={"Content-Type": "application/json"},
-                    data=query,
-                    auth=aiohttp.BasicAuth(
-                        self.elasticsearch_login, self.elasticsearch_password
-                    ),
-                ) as response:
-                    results = await response.text()
+            session = await ElasticSearchPool.get_session()
+            async with session.get(
+                url=url_template,
+                headers={"Content-Type": "application/json"},
+                data=query,
+                auth=self.auth,
+            ) as response:
+                results = await response.text()
         elif req_tipo == "post":
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=url_template,
-                    headers={"Content-Type": "application/json"},
-                    data=query,
-                    auth=aiohttp.BasicAuth(
-                        self.elasticsearch_login, self.elasticsearch_password
-                    ),
-                ) as response:
-                    results = await response.text()
+            session = await ElasticSearchPool.get_session()
+            async with session.post(
+                url=url_template,
+                headers={"Content-Type": "application/json"},
+                data=query,
+                auth=self.auth,
+            ) as response:
+                results = await response.text()
         else:
             raise Exception(
                 f"elasticsearch_query com erro de req_tipo: {tipo_query} - {query} - {req_tipo}"
@@ -84,25 +84,23 @@ class ElasticSearch(ChatElasticSearch, MensagemElasticSearch):
 
         logger.info("URL: %s", url_template)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url=url_template,
-                headers={"Content-Type": "application/json"},
-                auth=aiohttp.BasicAuth(
-                    self.elasticsearch_login, self.elasticsearch_password
-                ),
-            ) as response:
-                logger.info("RESPONSE STATUS CODE: %d", response.status)
-
-                if response.status == 401:
-                    raise Exception(
-                        "FAILED - UNAUTHORIZED! - Request lacks valid"
-                        + " authentication credentials for the target resource."
-                    )
+        session = await ElasticSearchPool.get_session()
+        async with session.get(
+            url=url_template,
+            headers={"Content-Type": "application/json"},
+            auth=self.auth,
+        ) as response:
+            logger.info("RESPONSE STATUS CODE: %d", response.status)
+
+            if response.status == 401:
+                raise Exception(
+                    "FAILED - UNAUTHORIZED! - Request lacks valid"
+                    + " authentication credentials for the target resource."
+                )
 
-                response_text = await response.text()
-                results = json.loads(response_text)
-                return results
+            response_text = await response.text()
+            results = json.loads(response_text)
+            return results
 
     @tracer.start_as_current_span("scroll")
     async def scroll(self, scroll_id, req_tipo="get"):
@@ -111,28 +109,24 @@ class ElasticSearch(ChatElasticSearch, MensagemElasticSearch):
         logger.info("URL: %s", url_template)
 
         if req_tipo == "get":
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url=url_template,
-                    headers={"Content-Type": "application/json"},
-                    data='{"scroll":"1m","scroll_id":"' + scroll_id + '"}',
-                    auth=aiohttp.BasicAuth(
-                        self.elasticsearch_login, self.elasticsearch_password
-                    ),
-                ) as response:
-                    results = await response.text()
+            session = await ElasticSearchPool.get_session()
+            async with session.get(
+                url=url_template,
+                headers={"Content-Type": "application/json"},
+                data='{"scroll":"1m","scroll_id":"' + scroll_id + '"}',
+                auth=self.auth,
+            ) as response:
+                results = await response.text()
 
         elif req_tipo == "post":
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=url_template,
-                    headers={"Content-Type": "application/json"},
-                    data='{"scroll":"1m","scroll_id":"' + scroll_id + '"}',
-                    auth=aiohttp.BasicAuth(
-                        self.elasticsearch_login, self.elasticsearch_password
-                    ),
-                ) as response:
-                    results = await response.text()
+            session = await ElasticSearchPool.get_session()
+            async with session.post(
+                url=url_template,
+                headers={"Content-Type": "application/json"},
+                data='{"scroll":"1m","scroll_id":"' + scroll_id + '"}',
+                auth=self.auth,
+            ) as response:
+                results = await response.text()
         else:
             raise Exception("elasticsearch_query com erro de req_tipo scroll")
 
@@ -178,35 +172,33 @@ class ElasticSearch(ChatElasticSearch, MensagemElasticSearch):
 
         logger.info("URL: %s", url_template)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.put(
-                url_template,
-                data=mapping,
-                headers={"Content-Type": "application/json"},
-                auth=aiohttp.BasicAuth(
-                    self.elasticsearch_login, self.elasticsearch_password
-                ),
-            ) as response:
-                logger.info("RESPONSE STATUS CODE: %d", response.status)
-
-                if response.status != 200:
-                    if response.status == 403:
-                        msg_erro = "FAILED - UNAUTHORIZED! RESPONSE STATUS CODE:" + str(
-                            response.status
-                        )
-                    else:
-                        msg_erro = (
-                            "Erro ao criar o indice! RESPONSE STATUS CODE:"
-                            + str(response.status)
-                            + " - "
-                            + str(response.content)
-                        )
+        session = await ElasticSearchPool.get_session()
+        async with session.put(
+            url_template,
+            data=mapping,
+            headers={"Content-Type": "application/json"},
+            auth=self.auth,
+        ) as response:
+            logger.info("RESPONSE STATUS CODE: %d", response.status)
+
+            if response.status != 200:
+                if response.status == 403:
+                    msg_erro = "FAILED - UNAUTHORIZED! RESPONSE STATUS CODE:" + str(
+                        response.status
+                    )
+                else:
+                    msg_erro = (
+                        "Erro ao criar o indice! RESPONSE STATUS CODE:"
+                        + str(response.status)
+                        + " - "
+                        + str(response.content)
+                    )
 
-                    logger.error(msg_erro)
+                logger.error(msg_erro)
 
-                    raise Exception(msg_erro)
+                raise Exception(msg_erro)
 
-                return True
+            return True
 
     @tracer.start_as_current_span("populate_indice")
     async def populate_indice(self, index_name, registros):
@@ -241,28 +233,26 @@ class ElasticSearch(ChatElasticSearch, MensagemElasticSearch):
 
         logger.info("URL: %s", url_template)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(
-                url_template,
-                auth=aiohttp.BasicAuth(
-                    self.elasticsearch_login, self.elasticsearch_password
-                ),
-            ) as response:
-                logger.info("RESPONSE STATUS CODE: %d", response.status)
-                if response.status != 200:
-                    if response.status == 403:
-                        msg_erro = "FAILED - UNAUTHORIZED! RESPONSE STATUS CODE:" + str(
-                            response.status
-                        )
-                    else:
-                        msg_erro = (
-                            "Erro ao deletar o indice! RESPONSE STATUS CODE:"
-                            + str(response.status)
-                        )
-
-                    logger.error(msg_erro)
-
-                    raise Exception(msg_erro)
+        session = await ElasticSearchPool.get_session()
+        async with session.delete(
+            url_template,
+            auth=self.auth,
+        ) as response:
+            logger.info("RESPONSE STATUS CODE: %d", response.status)
+            if response.status != 200:
+                if response.status == 403:
+                    msg_erro = "FAILED - UNAUTHORIZED! RESPONSE STATUS CODE:" + str(
+                        response.status
+                    )
+                else:
+                    msg_erro = (
+                        "Erro ao deletar o indice! RESPONSE STATUS CODE:"
+                        + str(response.status)
+                    )
+
+                logger.error(msg_erro)
+
+                raise Exception(msg_erro)
 
     @tracer.start_as_current_span("insert_ou_update_campo")
     async def insert_ou_update_campo(self, id, objeto_dict):
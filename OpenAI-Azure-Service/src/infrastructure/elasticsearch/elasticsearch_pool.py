@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+import aiohttp
+from opentelemetry import trace
+
+from src.infrastructure.env import (
+    ELASTIC_POOL_KEEPALIVE_TIMEOUT,
+    ELASTIC_POOL_MAX_CONEXOES,
+    ELASTIC_POOL_MAX_CONEXOES_POR_HOST,
+    ELASTIC_POOL_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class ElasticSearchPool:
+    """Sessão HTTP compartilhada (keep-alive) utilizada por todas as instâncias
+    de ElasticSearch durante o ciclo de vida da aplicação."""
+
+    session: Optional[aiohttp.ClientSession] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _metricas: Dict[str, Dict[str, int]] = defaultdict(
+        lambda: {
+            "requisicoes": 0,
+            "conexoes_criadas": 0,
+            "conexoes_reutilizadas": 0,
+            "esperas_na_fila": 0,
+        }
+    )
+
+    @classmethod
+    def _criar_trace_config(cls) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            cls._metricas[params.url.host]["requisicoes"] += 1
+            ctx.host = params.url.host
+
+        async def on_connection_create_end(session, ctx, params):
+            cls._metricas[getattr(ctx, "host", "desconhecido")]["conexoes_criadas"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            cls._metricas[getattr(ctx, "host", "desconhecido")][
+                "conexoes_reutilizadas"
+            ] += 1
+
+        async def on_connection_queued_start(session, ctx, params):
+            cls._metricas[getattr(ctx, "host", "desconhecido")]["esperas_na_fila"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+
+        return trace_config
+
+    @classmethod
+    def _criar_sessao(cls) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=ELASTIC_POOL_MAX_CONEXOES,
+            limit_per_host=ELASTIC_POOL_MAX_CONEXOES_POR_HOST,
+            keepalive_timeout=ELASTIC_POOL_KEEPALIVE_TIMEOUT,
+        )
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=ELASTIC_POOL_TIMEOUT),
+            trace_configs=[cls._criar_trace_config()],
+        )
+
+    @classmethod
+    @tracer.start_as_current_span("conectar")
+    async def conectar(cls):
+        inicio = time.time()
+
+        await cls.fechar_conexao()
+
+        cls.session = cls._criar_sessao()
+        cls._loop = asyncio.get_running_loop()
+
+        fim = time.time()
+
+        logger.info(
+            f"Tempo gasto com abertura do pool de conexões Elastic: {(fim - inicio)}"
+        )
+
+    @classmethod
+    @tracer.start_as_current_span("fechar_conexao")
+    async def fechar_conexao(cls):
+        if cls.session and not cls.session.closed:
+            await cls.session.close()
+
+            logger.info("Pool de conexões Elastic encerrado")
+
+        cls.session = None
+        cls._loop = None
+
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        """Retorna a sessão compartilhada, criando-a sob demanda caso o
+        startup da aplicação não tenha sido executado (ex.: scripts e testes)
+        ou caso o event loop tenha sido substituído."""
+        loop = asyncio.get_running_loop()
+
+        if cls.session is None or cls.session.closed or cls._loop is not loop:
+            cls.session = cls._criar_sessao()
+            cls._loop = loop
+
+        return cls.session
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "max_conexoes": ELASTIC_POOL_MAX_CONEXOES,
+            "max_conexoes_por_host": ELASTIC_POOL_MAX_CONEXOES_POR_HOST,
+            "ativo": cls.session is not None and not cls.session.closed,
+            "hosts": {host: dict(valores) for host, valores in cls._metricas.items()},
+        }
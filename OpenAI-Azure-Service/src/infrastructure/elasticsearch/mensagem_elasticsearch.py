@@ -1,6 +1,8 @@
 import json
 import logging
+import time
 from abc import ABC, abstractmethod
+from typing import List
 
 from opentelemetry import trace
 
@@ -8,6 +10,11 @@ from src.domain.mensagem import Mensagem
 from src.domain.schemas import ReagirInput
 from src.domain.trecho import trecho_para_dict
 from src.exceptions import ElasticException
+from src.infrastructure.env import (
+    ELASTIC_MAX_MENSAGENS_POR_CHAT,
+    ELASTIC_MENSAGENS_EM_INDICE_PROPRIO,
+    INDICE_ELASTIC_MENSAGENS,
+)
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -16,7 +23,7 @@ tracer = trace.get_tracer(__name__)
 class MensagemElasticSearch(ABC):
     @abstractmethod
     @tracer.start_as_current_span("elasticsearch_query")
-    async def elasticsearch_query(self, tipo_query, query, req_tipo="get"):
+    async def elasticsearch_query(self, tipo_query, query, req_tipo="get", indice=None):
         pass
 
     @abstractmethod
@@ -24,9 +31,9 @@ class MensagemElasticSearch(ABC):
     async def insert_ou_update_campo(self, id, objeto_dict):
         pass
 
-    @tracer.start_as_current_span("adicionar_mensagem")
-    async def adicionar_mensagem(self, cod_chat: str, mensagem: Mensagem):
-        nova_mensagem = {
+    @staticmethod
+    def _mensagem_para_elastic(mensagem: Mensagem) -> dict:
+        return {
             "codigo": mensagem.codigo,
             "papel": mensagem.papel.name,
             "conteudo": mensagem.conteudo,
@@ -77,6 +84,11 @@ class MensagemElasticSearch(ABC):
             "especialista_utilizado": mensagem.especialista_utilizado,
             "imagens": [{"id_imagem": img} for img in mensagem.imagens],
         }
+
+    @tracer.start_as_current_span("_inserir_mensagem_no_documento_do_chat")
+    async def _inserir_mensagem_no_documento_do_chat(
+        self, cod_chat: str, nova_mensagem: dict
+    ) -> bool:
         query = {
             "script": {
                 "source": """if (ctx._source.containsKey('mensagens')) {
@@ -93,7 +105,47 @@ class MensagemElasticSearch(ABC):
             f"_doc/{cod_chat}/_update", json.dumps(query), req_tipo="post"
         )
 
-        if "result" in response and response["result"] == "updated":
+        return self.__verificar_resposta(response, "updated")
+
+    @tracer.start_as_current_span("_inserir_mensagem_no_indice")
+    async def _inserir_mensagem_no_indice(
+        self, cod_chat: str, nova_mensagem: dict
+    ) -> bool:
+        """Grava a mensagem como um novo documento do índice de mensagens,
+        sem reindexar o documento do chat."""
+        documento = {**nova_mensagem, "chat_id": cod_chat, "ordem": time.time_ns()}
+
+        response = await self.elasticsearch_query(
+            "_doc",
+            json.dumps(documento),
+            req_tipo="post",
+            indice=INDICE_ELASTIC_MENSAGENS,
+        )
+
+        return self.__verificar_resposta(response, "created")
+
+    @staticmethod
+    def __verificar_resposta(response: dict, resultado_esperado: str) -> bool:
+        if "result" in response and response["result"] == resultado_esperado:
+            return True
+
+        if "error" in response:
+            logger.error(f"Mensagem de erro: {response['error']['reason']}")
+
+        return False
+
+    @tracer.start_as_current_span("adicionar_mensagem")
+    async def adicionar_mensagem(self, cod_chat: str, mensagem: Mensagem):
+        nova_mensagem = self._mensagem_para_elastic(mensagem)
+
+        if ELASTIC_MENSAGENS_EM_INDICE_PROPRIO:
+            inserida = await self._inserir_mensagem_no_indice(cod_chat, nova_mensagem)
+        else:
+            inserida = await self._inserir_mensagem_no_documento_do_chat(
+                cod_chat, nova_mensagem
+            )
+
+        if inserida:
             logger.info(f"Mensagem inserida com sucesso no chat: {cod_chat}")
 
             await self.insert_ou_update_campo(
@@ -111,13 +163,193 @@ class MensagemElasticSearch(ABC):
         else:
             logger.error(f"Falha ao inserir mensagem no chat: {cod_chat}")
 
-            if "error" in response:
-                error_message = response["error"]["reason"]
+            raise ElasticException("Falha ao inserir mensagem no chat")
+
+    @tracer.start_as_current_span("adicionar_mensagens")
+    async def adicionar_mensagens(self, cod_chat: str, mensagens: List[Mensagem]):
+        """Grava as mensagens de uma iteração e a data de última iteração do
+        chat em uma única requisição ao Elastic."""
+        if not mensagens:
+            return
 
-                logger.error(f"Mensagem de erro: {error_message}")
+        novas_mensagens = [self._mensagem_para_elastic(msg) for msg in mensagens]
+        data_ultima_iteracao = mensagens[-1].data_envio.strftime("%Y-%m-%d %H:%M:%S")
+
+        if ELASTIC_MENSAGENS_EM_INDICE_PROPRIO:
+            await self._inserir_mensagens_no_indice(
+                cod_chat, novas_mensagens, data_ultima_iteracao
+            )
+        else:
+            await self._inserir_mensagens_no_documento_do_chat(
+                cod_chat, novas_mensagens, data_ultima_iteracao
+            )
+
+        logger.info(f"{len(mensagens)} mensagens inseridas no chat: {cod_chat}")
+
+    @tracer.start_as_current_span("_inserir_mensagens_no_documento_do_chat")
+    async def _inserir_mensagens_no_documento_do_chat(
+        self, cod_chat: str, novas_mensagens: List[dict], data_ultima_iteracao: str
+    ):
+        # o mesmo script acrescenta as mensagens e atualiza a data, de modo
+        # que a iteração é gravada por completo ou não é gravada
+        query = {
+            "script": {
+                "source": """if (ctx._source.containsKey('mensagens')) {
+                    ctx._source.mensagens.addAll(params.mensagens)
+                } else {
+                    ctx._source.mensagens = params.mensagens
+                }
+                if (!ctx._source.containsKey('chat')) {
+                    ctx._source.chat = [:]
+                }
+                ctx._source.chat.data_ultima_iteracao = params.data_ultima_iteracao""",
+                "lang": "painless",
+                "params": {
+                    "mensagens": novas_mensagens,
+                    "data_ultima_iteracao": data_ultima_iteracao,
+                },
+            }
+        }
+
+        response = await self.elasticsearch_query(
+            f"_doc/{cod_chat}/_update", json.dumps(query), req_tipo="post"
+        )
+
+        if not self.__verificar_resposta(response, "updated"):
+            logger.error(f"Falha ao inserir as mensagens no chat: {cod_chat}")
 
             raise ElasticException("Falha ao inserir mensagem no chat")
 
+    @tracer.start_as_current_span("_inserir_mensagens_no_indice")
+    async def _inserir_mensagens_no_indice(
+        self, cod_chat: str, novas_mensagens: List[dict], data_ultima_iteracao: str
+    ):
+        """Envia as mensagens ao índice de mensagens e a atualização do
+        documento do chat no mesmo _bulk. As mensagens que falharem são
+        reenviadas individualmente uma única vez."""
+        ordem_inicial = time.time_ns()
+        documentos = [
+            {**mensagem, "chat_id": cod_chat, "ordem": ordem_inicial + posicao}
+            for posicao, mensagem in enumerate(novas_mensagens)
+        ]
+
+        query = ""
+
+        for documento in documentos:
+            query += json.dumps({"index": {"_index": INDICE_ELASTIC_MENSAGENS}})
+            query += "\n" + json.dumps(documento, ensure_ascii=False) + "\n"
+
+        # sem "_index", a atualização é aplicada ao índice dos chats
+        query += json.dumps({"update": {"_id": cod_chat}}) + "\n"
+        query += json.dumps(
+            {"doc": {"chat": {"data_ultima_iteracao": data_ultima_iteracao}}}
+        )
+        query += "\n"
+
+        resultado = await self.elasticsearch_query(
+            "_bulk", query.encode("UTF-8"), req_tipo="post"
+        )
+
+        if "items" not in resultado:
+            logger.error(f"Falha no _bulk das mensagens do chat {cod_chat}")
+
+            raise ElasticException("Falha ao inserir mensagem no chat")
+
+        *itens_mensagens, item_chat = resultado["items"]
+        falhas = []
+
+        for documento, item in zip(documentos, itens_mensagens):
+            if "error" in item["index"]:
+                logger.warning(
+                    f"Falha ao inserir a mensagem {documento['codigo']} "
+                    f"no chat {cod_chat}: {item['index']['error']}"
+                )
+
+                falhas.append(documento)
+
+        for documento in falhas:
+            response = await self.elasticsearch_query(
+                "_doc",
+                json.dumps(documento),
+                req_tipo="post",
+                indice=INDICE_ELASTIC_MENSAGENS,
+            )
+
+            if not self.__verificar_resposta(response, "created"):
+                logger.error(f"Falha ao inserir mensagem no chat: {cod_chat}")
+
+                raise ElasticException("Falha ao inserir mensagem no chat")
+
+        if "error" in item_chat["update"]:
+            # as mensagens já foram gravadas; a data é corrigida na próxima
+            # iteração do chat
+            logger.error(
+                f"Falha ao atualizar a data de última iteração do chat {cod_chat}: "
+                f"{item_chat['update']['error']}"
+            )
+
+    @tracer.start_as_current_span("buscar_mensagens_do_indice")
+    async def buscar_mensagens_do_indice(self, chat_id: str) -> List[dict]:
+        """Retorna as mensagens do chat gravadas no índice de mensagens, na
+        ordem em que foram enviadas."""
+        query = {
+            "query": {"term": {"chat_id": chat_id}},
+            "sort": [{"data_envio": "asc"}, {"ordem": "asc"}],
+            "size": ELASTIC_MAX_MENSAGENS_POR_CHAT,
+        }
+
+        resultado = await self.elasticsearch_query(
+            "_search", json.dumps(query), indice=INDICE_ELASTIC_MENSAGENS
+        )
+
+        if "error" in resultado:
+            # índice ainda não criado: nenhum chat no novo formato
+            logger.warning(
+                f"Erro ao buscar as mensagens do chat {chat_id}: {resultado['error']}"
+            )
+
+            return []
+
+        return [hit["_source"] for hit in resultado["hits"]["hits"]]
+
+    @tracer.start_as_current_span("migrar_mensagens_para_indice")
+    async def migrar_mensagens_para_indice(self, chat_id: str) -> int:
+        """Move as mensagens do array "mensagens" do documento do chat para o
+        índice de mensagens. Enquanto a migração não termina, a leitura
+        combinada (ChatElasticSearch.buscar_chat) descarta as duplicidades."""
+        resultado = await self.elasticsearch_query(f"_doc/{chat_id}", None)
+
+        mensagens = resultado.get("_source", {}).get("mensagens", [])
+
+        if not mensagens:
+            return 0
+
+        query = ""
+
+        # a ordem original é preservada e fica antes das mensagens gravadas
+        # no índice após a ativação do novo formato (ordem = time_ns)
+        for ordem, mensagem in enumerate(mensagens):
+            documento = {**mensagem, "chat_id": chat_id, "ordem": ordem}
+
+            query += '{"index": {}}\n'
+            query += json.dumps(documento, ensure_ascii=False) + "\n"
+
+        resultado = await self.elasticsearch_query(
+            "_bulk?refresh=wait_for",
+            query.encode("UTF-8"),
+            req_tipo="post",
+            indice=INDICE_ELASTIC_MENSAGENS,
+        )
+
+        if resultado.get("errors"):
+            raise ElasticException(f"Falha ao migrar as mensagens do chat {chat_id}")
+
+        await self.insert_ou_update_campo(chat_id, {"mensagens": []})
+
+        logger.info(f"{len(mensagens)} mensagens do chat {chat_id} migradas")
+
+        return len(mensagens)
+
     # @TODO filtrar pelo app_origem e usuario
     @tracer.start_as_current_span("adicionar_feedback")
     async def adicionar_feedback(
@@ -136,6 +368,15 @@ class MensagemElasticSearch(ABC):
             "nao_ajudou": str(entrada.nao_ajudou).lower(),
         }
 
+        if (
+            ELASTIC_MENSAGENS_EM_INDICE_PROPRIO
+            and await self.__atualizar_feedback_no_indice(
+                chat_id, cod_mensagem, novo_feedback
+            )
+        ):
+            logger.info("Feedback inserido com sucesso.")
+            return
+
         script = {
             "source": """
                 for (int i = 0; i < ctx._source.mensagens.length; i++) {
@@ -165,8 +406,38 @@ class MensagemElasticSearch(ABC):
             )
 
 
+    async def __atualizar_feedback_no_indice(
+        self, chat_id: str, cod_mensagem: str, feedback: dict
+    ) -> bool:
+        query = {
+            "script": {
+                "source": "ctx._source.feedback = params.feedback",
+                "lang": "painless",
+                "params": {"feedback": feedback},
+            },
+            "query": {
+                "bool": {
+                    "must": [
+                        {"term": {"chat_id": chat_id}},
+                        {"term": {"codigo": cod_mensagem}},
+                    ]
+                }
+            },
+        }
+
+        resultado = await self.elasticsearch_query(
+            "_update_by_query",
+            json.dumps(query),
+            req_tipo="post",
+            indice=INDICE_ELASTIC_MENSAGENS,
+        )
+
+        # mensagens de chats no formato antigo não estão no índice
+        return resultado.get("updated", 0) > 0
+
+
 class MensagemElasticSearchImpl(MensagemElasticSearch):
-    async def elasticsearch_query(self, tipo_query, query, req_tipo="get"):
+    async def elasticsearch_query(self, tipo_query, query, req_tipo="get", indice=None):
         pass
 
     async def insert_ou_update_campo(self, id, objeto_dict):
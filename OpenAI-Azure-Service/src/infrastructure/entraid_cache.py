@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+import jwt
+from opentelemetry import trace
+
+from src.infrastructure.env import (
+    ENTRAID_JWKS_URL,
+    JWKS_CACHE_TTL,
+    JWKS_INTERVALO_MINIMO_BUSCA,
+    TOKEN_VALIDADO_CACHE_MAX_ITENS,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class JwksCache:
+    """Chaves de assinatura do EntraID (JWKS) compartilhadas pelo processo,
+    indexadas pelo kid.
+
+    Após JWKS_CACHE_TTL segundos as chaves continuam sendo utilizadas
+    enquanto uma nova versão é buscada em segundo plano. Um kid desconhecido
+    (rotação das chaves) provoca uma nova busca imediata, limitada a uma a
+    cada JWKS_INTERVALO_MINIMO_BUSCA segundos."""
+
+    _chaves: Dict[str, jwt.PyJWK] = {}
+    _atualizado_em: float = 0.0
+    _ultima_busca: float = 0.0
+    _atualizacao: Optional[asyncio.Task] = None
+    _metricas: Dict[str, int] = {
+        "hits": 0,
+        "atualizacoes": 0,
+        "falhas": 0,
+        "kids_desconhecidos": 0,
+    }
+
+    @classmethod
+    @tracer.start_as_current_span("buscar_chaves_jwks")
+    async def _buscar_chaves(cls):
+        timeout = aiohttp.ClientTimeout(total=20)
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
+            async with session.get(ENTRAID_JWKS_URL, timeout=timeout) as response:
+                dados = await response.json()
+
+        chaves = jwt.PyJWKSet.from_dict(dados).keys
+
+        cls._chaves = {chave.key_id: chave for chave in chaves if chave.key_id}
+        cls._atualizado_em = time.monotonic()
+        cls._metricas["atualizacoes"] += 1
+
+        logger.info(f"{len(cls._chaves)} chaves de assinatura do EntraID carregadas")
+
+    @classmethod
+    def _atualizar(cls) -> asyncio.Task:
+        # requests concorrentes aguardam a mesma busca
+        if cls._atualizacao is None or cls._atualizacao.done():
+            cls._ultima_busca = time.monotonic()
+            cls._atualizacao = asyncio.ensure_future(cls._buscar_chaves())
+            cls._atualizacao.add_done_callback(cls._finalizar_atualizacao)
+
+        return cls._atualizacao
+
+    @classmethod
+    def _finalizar_atualizacao(cls, tarefa: asyncio.Task):
+        if not tarefa.cancelled() and tarefa.exception() is not None:
+            cls._metricas["falhas"] += 1
+
+            logger.warning(
+                f"Erro ao buscar as chaves de assinatura do EntraID: "
+                f"{tarefa.exception()}"
+            )
+
+    @classmethod
+    @tracer.start_as_current_span("obter_chave_jwks")
+    async def obter_chave(cls, kid: str) -> jwt.PyJWK:
+        chave = cls._chaves.get(kid)
+
+        if chave is not None:
+            if time.monotonic() - cls._atualizado_em > JWKS_CACHE_TTL:
+                cls._atualizar()
+
+            cls._metricas["hits"] += 1
+
+            return chave
+
+        cls._metricas["kids_desconhecidos"] += 1
+
+        # evita que tokens com kids aleatórios provoquem uma busca por request
+        em_andamento = cls._atualizacao is not None and not cls._atualizacao.done()
+
+        if (
+            cls._chaves
+            and not em_andamento
+            and time.monotonic() - cls._ultima_busca < JWKS_INTERVALO_MINIMO_BUSCA
+        ):
+            raise jwt.InvalidTokenError(f"Chave de assinatura desconhecida: {kid}")
+
+        await asyncio.shield(cls._atualizar())
+
+        chave = cls._chaves.get(kid)
+
+        if chave is None:
+            raise jwt.InvalidTokenError(f"Chave de assinatura desconhecida: {kid}")
+
+        return chave
+
+    @classmethod
+    async def obter_chave_do_token(cls, token: str) -> jwt.PyJWK:
+        kid = jwt.get_unverified_header(token).get("kid")
+
+        return await cls.obter_chave(kid)
+
+    @classmethod
+    def limpar(cls):
+        cls._chaves = {}
+        cls._atualizado_em = 0.0
+        cls._ultima_busca = 0.0
+        cls._atualizacao = None
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "chaves": len(cls._chaves),
+            "idade": (
+                int(time.monotonic() - cls._atualizado_em) if cls._chaves else None
+            ),
+            **cls._metricas,
+        }
+
+
+class TokenValidadoCache:
+    """LRU dos claims dos tokens EntraID já validados, indexados pelo sha256
+    do token e mantidos até o "exp". Requests da mesma sessão dispensam a
+    verificação da assinatura RSA."""
+
+    _itens: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+    _metricas: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def gerar_chave(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def obter(cls, token: str) -> Optional[dict]:
+        chave = cls.gerar_chave(token)
+        item = cls._itens.get(chave)
+
+        if item is None or item[0] <= time.time():
+            cls._itens.pop(chave, None)
+            cls._metricas["misses"] += 1
+
+            return None
+
+        cls._itens.move_to_end(chave)
+        cls._metricas["hits"] += 1
+
+        # cópia: os claims são complementados a cada request
+        return dict(item[1])
+
+    @classmethod
+    def armazenar(cls, token: str, claims: dict):
+        exp = claims.get("exp")
+
+        if not exp:
+            return
+
+        chave = cls.gerar_chave(token)
+
+        cls._itens[chave] = (float(exp), dict(claims))
+        cls._itens.move_to_end(chave)
+
+        while len(cls._itens) > TOKEN_VALIDADO_CACHE_MAX_ITENS:
+            cls._itens.popitem(last=False)
+
+    @classmethod
+    def limpar(cls):
+        cls._itens.clear()
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {"itens": len(cls._itens), **cls._metricas}
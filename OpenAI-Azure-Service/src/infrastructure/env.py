@@ -20,11 +20,31 @@ HEADERS = {"Content-Type": "application/json"}
 
 PADDING = "=="
 
+ENTRAID_JWKS_URL = (
+    "https://login.microsoftonline.com/bf158188-9a11-44c2-b7fc-21e85613ba27"
+    + "/discovery/v2.0/keys"
+)
+# segundos até a atualização (em segundo plano) das chaves de assinatura
+JWKS_CACHE_TTL = int(os.getenv("JWKS_CACHE_TTL", "3600"))
+# segundos entre buscas motivadas por um kid desconhecido
+JWKS_INTERVALO_MINIMO_BUSCA = 60
+# tokens EntraID já validados, mantidos até o "exp"
+TOKEN_VALIDADO_CACHE_MAX_ITENS = int(
+    os.getenv("TOKEN_VALIDADO_CACHE_MAX_ITENS", "2048")
+)
+# tokens de serviço (autenticar_servico) por (usuário, recurso computacional);
+# segundos de antecedência da renovação em relação ao "exp"
+TOKEN_SERVICO_MARGEM_RENOVACAO = 60
+# segundos de validade assumidos quando o token não informa o "exp"
+TOKEN_SERVICO_TTL_PADRAO = 300
+TOKEN_SERVICO_MAX_ITENS = int(os.getenv("TOKEN_SERVICO_MAX_ITENS", "1024"))
+
 ## PARA LLM/RAG
 CHUNK_SIZE = 1500
 CHUNK_OVERLAP = 250
 
 INDICE_ELASTIC = "openai-azure-log"
+INDICE_ELASTIC_MENSAGENS = "openai-azure-log-mensagens"
 INDEX_NAME_DOCUMENTOS = "documentos_upload"
 INDEX_NAME_SISTEMA_CASA = "sistema_casa-embedding-3-large"
 INDEX_NAME_JURISPRUDENCIA = "jurisprudencia_selecionada"
@@ -43,10 +63,184 @@ DB_NAME_STORE = "store_data"
 COLLECTION_NAME_ESPECIALISTA = "especialista"
 COLLECTION_NAME_CATEGORIA = "categoria"
 
+# busca com o prompt original do usuário executada em paralelo à chamada ao LLM
+# que extrai os filtros/pergunta; os resultados são reaproveitados quando os
+# filtros extraídos podem ser aplicados localmente
+BUSCA_ESPECULATIVA_ATIVA = (
+    os.getenv("BUSCA_ESPECULATIVA_ATIVA", "true").lower() == "true"
+)
+# a busca especulativa retorna top_k * fator trechos, para que ainda restem
+# top_k após a aplicação dos filtros extraídos
+BUSCA_ESPECULATIVA_FATOR_TOP = int(os.getenv("BUSCA_ESPECULATIVA_FATOR_TOP", "3"))
+
+# cache dos filtros/perguntas extraídos pelo LLM antes das buscas, por prompt
+# normalizado; o nível Redis é compartilhado entre as instâncias
+FILTRO_BUSCA_CACHE_MAX_ITENS = int(os.getenv("FILTRO_BUSCA_CACHE_MAX_ITENS", "4096"))
+# segundos
+FILTRO_BUSCA_CACHE_TTL = int(os.getenv("FILTRO_BUSCA_CACHE_TTL", "3600"))
+FILTRO_BUSCA_CACHE_REDIS_ATIVO = (
+    os.getenv("FILTRO_BUSCA_CACHE_REDIS_ATIVO", "false").lower() == "true"
+)
+# segundos (1 dia)
+FILTRO_BUSCA_CACHE_REDIS_TTL = int(os.getenv("FILTRO_BUSCA_CACHE_REDIS_TTL", "86400"))
+
+# cache semântico das respostas dos especialistas sem contexto de conversa
+# (opt-in): perguntas com similaridade de cosseno >= limiar reaproveitam a
+# resposta gerada anteriormente para o mesmo agente e modelo
+RESPOSTA_CACHE_ATIVO = os.getenv("RESPOSTA_CACHE_ATIVO", "false").lower() == "true"
+RESPOSTA_CACHE_TOOLS = ("CONHECIMENTOGERAL", "ADMINISTRATIVA")
+RESPOSTA_CACHE_LIMIAR_SIMILARIDADE = float(
+    os.getenv("RESPOSTA_CACHE_LIMIAR_SIMILARIDADE", "0.97")
+)
+# respostas mantidas por agente/modelo (a busca semântica percorre todas)
+RESPOSTA_CACHE_MAX_ITENS = int(os.getenv("RESPOSTA_CACHE_MAX_ITENS", "256"))
+# segundos
+RESPOSTA_CACHE_TTL = int(os.getenv("RESPOSTA_CACHE_TTL", "86400"))
+
+## PARA A SUMARIZAÇÃO DE DOCUMENTOS LONGOS
+# estratégia usada por cada tool quando o documento possui mais de um segmento:
+# "map_reduce" resume os segmentos em paralelo e combina os resumos parciais;
+# "refine" refina um único resumo, segmento a segmento (sequencial)
+SUMARIZACAO_ESTRATEGIAS = {
+    "SUMARIZACAO": os.getenv("SUMARIZACAO_ESTRATEGIA_SUMARIZACAO", "map_reduce"),
+    "RESUMOFOCADODOCUMENTOS": os.getenv(
+        "SUMARIZACAO_ESTRATEGIA_RESUMOFOCADODOCUMENTOS", "map_reduce"
+    ),
+    "UPLOAD": os.getenv("SUMARIZACAO_ESTRATEGIA_UPLOAD", "map_reduce"),
+}
+# segmentos resumidos simultaneamente por sumarização
+SUMARIZACAO_MAP_REDUCE_CONCORRENCIA = int(
+    os.getenv("SUMARIZACAO_MAP_REDUCE_CONCORRENCIA", "4")
+)
+# tokens (estimados) de resumos parciais combinados em cada chamada de redução
+SUMARIZACAO_REDUCE_MAX_TOKENS = int(os.getenv("SUMARIZACAO_REDUCE_MAX_TOKENS", "60000"))
+# tokens por minuto de cada deployment, compartilhados pelas sumarizações da
+# instância
+SUMARIZACAO_TPM_PADRAO = int(os.getenv("SUMARIZACAO_TPM_PADRAO", "150000"))
+SUMARIZACAO_TPM_MODELOS: Dict[str, int] = {
+    "GPT-4o": int(os.getenv("SUMARIZACAO_TPM_GPT_4O", "450000")),
+}
+
+## PARA O POOL DE CONEXÕES DO ELASTIC
+ELASTIC_POOL_MAX_CONEXOES = int(os.getenv("ELASTIC_POOL_MAX_CONEXOES", "100"))
+ELASTIC_POOL_MAX_CONEXOES_POR_HOST = int(
+    os.getenv("ELASTIC_POOL_MAX_CONEXOES_POR_HOST", "50")
+)
+# segundos
+ELASTIC_POOL_KEEPALIVE_TIMEOUT = 30
+ELASTIC_POOL_TIMEOUT = 60
+
+# grava cada mensagem como um documento de INDICE_ELASTIC_MENSAGENS em vez de
+# acrescentá-la ao array "mensagens" do documento do chat; a leitura considera
+# os dois formatos, pois os chats antigos mantêm as mensagens no próprio documento
+ELASTIC_MENSAGENS_EM_INDICE_PROPRIO = (
+    os.getenv("ELASTIC_MENSAGENS_EM_INDICE_PROPRIO", "false").lower() == "true"
+)
+ELASTIC_MAX_MENSAGENS_POR_CHAT = 10000
+
 
 MODELO_EMBEDDING = "Text-Embedding-Ada"
 MODELO_EMBEDDING_002 = "Text-Embedding-Ada-002"
 
+# quantidade de trechos enviados em cada requisição de embedding
+# (limitada pela quantidade máxima de inputs aceita pelo deployment)
+EMBEDDING_TAMANHO_LOTE = int(os.getenv("EMBEDDING_TAMANHO_LOTE", "16"))
+EMBEDDING_MAX_LOTES_CONCORRENTES = int(
+    os.getenv("EMBEDDING_MAX_LOTES_CONCORRENTES", "4")
+)
+EMBEDDING_MAX_TENTATIVAS = 5
+# segundos, dobrado a cada nova tentativa após um 429
+EMBEDDING_BACKOFF_INICIAL = 1
+
+# cache de embeddings por (deployment, sha256 do texto normalizado)
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "64"))
+EMBEDDING_CACHE_REDIS_ATIVO = (
+    os.getenv("EMBEDDING_CACHE_REDIS_ATIVO", "false").lower() == "true"
+)
+# segundos (7 dias)
+EMBEDDING_CACHE_REDIS_TTL = int(os.getenv("EMBEDDING_CACHE_REDIS_TTL", "604800"))
+
+# cache das imagens do histórico dos chats, já em base64, por nome do blob
+# (derivado do hash do conteúdo)
+HISTORICO_IMAGEM_CACHE_MAX_MB = int(os.getenv("HISTORICO_IMAGEM_CACHE_MAX_MB", "64"))
+# as imagens maiores são reduzidas ao tamanho utilizado pelo modelo no detalhe
+# "high" (cabe em 2048x2048, com o menor lado de até 768 pixels); 0 desativa
+HISTORICO_IMAGEM_LADO_MAXIMO = int(os.getenv("HISTORICO_IMAGEM_LADO_MAXIMO", "2048"))
+HISTORICO_IMAGEM_MENOR_LADO_MAXIMO = int(
+    os.getenv("HISTORICO_IMAGEM_MENOR_LADO_MAXIMO", "768")
+)
+# imagens do histórico enviadas ao modelo: apenas as últimas N e/ou as dos
+# últimos K turnos (mensagens do usuário); 0 desativa o respectivo limite
+HISTORICO_MAX_IMAGENS = int(os.getenv("HISTORICO_MAX_IMAGENS", "5"))
+HISTORICO_IMAGENS_ULTIMOS_TURNOS = int(
+    os.getenv("HISTORICO_IMAGENS_ULTIMOS_TURNOS", "0")
+)
+
+# memo dos vetores das perguntas (buscas vetoriais)
+CONSULTA_VETOR_MEMO_MAX_ITENS = 1024
+# segundos
+CONSULTA_VETOR_MEMO_TTL = int(os.getenv("CONSULTA_VETOR_MEMO_TTL", "900"))
+
+# quantidade de seções enviadas ao AI Search em cada upload durante a indexação
+INDEXACAO_TAMANHO_LOTE = 100
+# lotes de seções já vetorizadas aguardando upload (limita a memória do pipeline)
+INDEXACAO_MAX_LOTES_PENDENTES = 2
+
+## PARA O PARSING DE DOCUMENTOS (POOL DE PROCESSOS)
+PARSER_POOL_MAX_PROCESSOS = int(
+    os.getenv("PARSER_POOL_MAX_PROCESSOS", str(min(os.cpu_count() or 1, 4)))
+)
+# segundos por tarefa submetida ao pool (um intervalo de páginas, uma planilha...)
+PARSER_POOL_TIMEOUT = int(os.getenv("PARSER_POOL_TIMEOUT", "120"))
+# teto de memória (espaço de endereçamento) de cada processo; 0 desativa
+PARSER_POOL_LIMITE_MEMORIA_MB = int(os.getenv("PARSER_POOL_LIMITE_MEMORIA_MB", "4096"))
+# páginas de PDF extraídas por tarefa
+PARSER_POOL_PAGINAS_POR_TAREFA = 20
+
+## PARA A CARGA DOS DOCUMENTOS DE UPLOAD EM CONTEXTO COMPLETO
+# downloads simultâneos dos blobs selecionados; o parsing de cada documento
+# é iniciado no ParserPool assim que o seu download termina
+FULL_CONTEXT_DOWNLOAD_CONCORRENCIA = int(
+    os.getenv("FULL_CONTEXT_DOWNLOAD_CONCORRENCIA", "4")
+)
+# segundos para o download e o parsing de cada documento; os que excederem
+# o prazo são desconsiderados na resposta
+FULL_CONTEXT_TIMEOUT_DOCUMENTO = int(os.getenv("FULL_CONTEXT_TIMEOUT_DOCUMENTO", "60"))
+
+## PARA O STREAMING DAS RESPOSTAS
+# versão do protocolo solicitada pelo cliente no header X-Stream-Protocol:
+# 1 (padrão) reenvia todos os campos a cada chunk; 2 envia um evento de
+# início, os deltas dos tokens, os trechos quando alterados e um evento final
+PROTOCOLO_STREAM_PADRAO = 1
+PROTOCOLO_STREAM_DELTA = 2
+# tokens consecutivos são agrupados em um único frame, enviado após
+# STREAM_AGRUPAMENTO_MS milissegundos ou STREAM_AGRUPAMENTO_BYTES bytes, o que
+# ocorrer primeiro; o primeiro token é sempre enviado imediatamente (0 desativa)
+STREAM_AGRUPAMENTO_MS = int(os.getenv("STREAM_AGRUPAMENTO_MS", "40"))
+STREAM_AGRUPAMENTO_BYTES = int(os.getenv("STREAM_AGRUPAMENTO_BYTES", "512"))
+
+## PARA A GRAVAÇÃO ASSÍNCRONA (WRITE-BEHIND) AO FINAL DOS STREAMS
+WRITE_BEHIND_MAX_ITENS = int(os.getenv("WRITE_BEHIND_MAX_ITENS", "1000"))
+WRITE_BEHIND_WORKERS = int(os.getenv("WRITE_BEHIND_WORKERS", "4"))
+WRITE_BEHIND_TENTATIVAS = 3
+# segundos aguardando o esvaziamento da fila no shutdown
+WRITE_BEHIND_TIMEOUT_ENCERRAMENTO = int(
+    os.getenv("WRITE_BEHIND_TIMEOUT_ENCERRAMENTO", "20")
+)
+# tarefas não concluídas são gravadas no arquivo e reprocessadas no startup
+WRITE_BEHIND_ARQUIVO = os.getenv(
+    "WRITE_BEHIND_ARQUIVO", "/tmp/chattcu_write_behind.pkl"
+)
+
+## PARA O MONITORAMENTO DO EVENT LOOP (DEBUG)
+# registra a pilha da thread do event loop quando ele fica bloqueado por mais
+# de MONITOR_EVENT_LOOP_LIMIAR_MS milissegundos e as chamadas síncronas ao LLM
+# feitas a partir do loop
+MONITOR_EVENT_LOOP_ATIVO = (
+    os.getenv("MONITOR_EVENT_LOOP_ATIVO", "false").lower() == "true"
+)
+MONITOR_EVENT_LOOP_LIMIAR_MS = int(os.getenv("MONITOR_EVENT_LOOP_LIMIAR_MS", "200"))
+
 QTD_MAX_CARACTERES_TITULO = 100
 
 ## PARA UPLOADS
@@ -66,6 +260,18 @@ EXT_ALVOS_GABI = ["mp3", "mp4"]
 TAM_MAXIMO_ARQUIVO: int = 50 * 1024 * 1024
 CONTAINER_NAME = "container-chattcu"
 NOME_PASTA_PADRAO = "Arquivos gerais"
+# bytes lidos do blob por requisição (inclusive a primeira) nos downloads:
+# limita a memória de cada download transmitido em partes
+BLOB_DOWNLOAD_TAMANHO_PARTE = int(
+    os.getenv("BLOB_DOWNLOAD_TAMANHO_PARTE", str(4 * 1024 * 1024))
+)
+# arquivos baixados antecipadamente (inclusive o que está sendo enviado) no
+# download de pastas zipadas; limita também os arquivos mantidos em memória
+ZIP_DOWNLOAD_CONCORRENCIA = int(os.getenv("ZIP_DOWNLOAD_CONCORRENCIA", "2"))
+# 2 GB; o zip gerado não utiliza ZIP64 e é limitado a 4 GB
+ZIP_TAMANHO_MAXIMO = int(
+    os.getenv("ZIP_TAMANHO_MAXIMO", str(2 * 1024 * 1024 * 1024))
+)
 
 # https://learn.microsoft.com/pt-br/azure/ai-services/openai/concepts/models
 # https://github.com/openai/openai-cookbook/blob/main/examples/How_to_count_tokens_with_tiktoken.ipynb
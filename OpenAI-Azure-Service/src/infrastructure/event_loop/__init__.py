@@ -0,0 +1 @@
+""" event loop """
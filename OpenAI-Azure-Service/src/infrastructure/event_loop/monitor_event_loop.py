@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from src.infrastructure.env import (
+    MONITOR_EVENT_LOOP_ATIVO,
+    MONITOR_EVENT_LOOP_LIMIAR_MS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorEventLoop:
+    """Detector de bloqueios do event loop, para uso em depuração.
+
+    Um batimento agendado no loop a cada metade do limiar registra o atraso
+    com que foi executado; uma thread de vigilância, ao perceber que o
+    batimento está atrasado além do limiar, registra a pilha da thread do
+    loop, apontando o código síncrono responsável pelo bloqueio. As chamadas
+    síncronas ao LLM feitas a partir do loop são registradas pelo
+    DetectorChamadaSincronaLLM."""
+
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _thread_loop: Optional[int] = None
+    _vigilancia: Optional[threading.Thread] = None
+    _parar = threading.Event()
+    _ultimo_batimento = 0.0
+    _bloqueio_reportado = False
+    _metricas: Dict[str, float] = {
+        "bloqueios": 0,
+        "maior_bloqueio_ms": 0,
+        "chamadas_sincronas_llm": 0,
+    }
+
+    @classmethod
+    def _intervalo(cls) -> float:
+        return MONITOR_EVENT_LOOP_LIMIAR_MS / 2000
+
+    @classmethod
+    def iniciar(cls):
+        if not MONITOR_EVENT_LOOP_ATIVO or cls._vigilancia is not None:
+            return
+
+        cls._loop = asyncio.get_running_loop()
+        cls._thread_loop = threading.get_ident()
+        cls._ultimo_batimento = time.monotonic()
+        cls._parar.clear()
+        cls._loop.call_later(cls._intervalo(), cls._batimento)
+
+        cls._vigilancia = threading.Thread(
+            target=cls._vigiar, name="monitor-event-loop", daemon=True
+        )
+        cls._vigilancia.start()
+
+        logger.info(
+            f"Monitor do event loop ativo (limiar de {MONITOR_EVENT_LOOP_LIMIAR_MS} ms)"
+        )
+
+    @classmethod
+    def _batimento(cls):
+        agora = time.monotonic()
+        atraso_ms = (agora - cls._ultimo_batimento - cls._intervalo()) * 1000
+
+        if atraso_ms > MONITOR_EVENT_LOOP_LIMIAR_MS:
+            cls._metricas["bloqueios"] += 1
+            cls._metricas["maior_bloqueio_ms"] = max(
+                cls._metricas["maior_bloqueio_ms"], round(atraso_ms)
+            )
+
+            logger.warning(f"Event loop bloqueado por {atraso_ms:.0f} ms")
+
+        cls._ultimo_batimento = agora
+        cls._bloqueio_reportado = False
+
+        if not cls._parar.is_set():
+            cls._loop.call_later(cls._intervalo(), cls._batimento)
+
+    @classmethod
+    def _vigiar(cls):
+        while not cls._parar.wait(cls._intervalo()):
+            atraso_ms = (
+                time.monotonic() - cls._ultimo_batimento - cls._intervalo()
+            ) * 1000
+
+            if cls._bloqueio_reportado or atraso_ms <= MONITOR_EVENT_LOOP_LIMIAR_MS:
+                continue
+
+            cls._bloqueio_reportado = True
+            frame = sys._current_frames().get(cls._thread_loop)
+
+            if frame is not None:
+                logger.warning(
+                    f"Event loop bloqueado há {atraso_ms:.0f} ms em:\n"
+                    + "".join(traceback.format_stack(frame))
+                )
+
+    @classmethod
+    def registrar_chamada_sincrona(cls, nome: str):
+        cls._metricas["chamadas_sincronas_llm"] += 1
+
+        logger.warning(
+            f"Chamada síncrona ao LLM {nome} a partir do event loop em:\n"
+            + "".join(traceback.format_stack(limit=15))
+        )
+
+    @classmethod
+    def encerrar(cls):
+        if cls._vigilancia is None:
+            return
+
+        cls._parar.set()
+        cls._vigilancia.join()
+        cls._vigilancia = None
+
+    @classmethod
+    def limpar(cls):
+        for chave in cls._metricas:
+            cls._metricas[chave] = 0
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {"ativo": MONITOR_EVENT_LOOP_ATIVO, **cls._metricas}
@@ -0,0 +1 @@
+""" parser pool """
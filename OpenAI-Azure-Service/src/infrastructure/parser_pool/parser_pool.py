@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from opentelemetry import trace
+
+from src.exceptions import ServiceException
+from src.infrastructure.env import (
+    PARSER_POOL_LIMITE_MEMORIA_MB,
+    PARSER_POOL_MAX_PROCESSOS,
+    PARSER_POOL_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+def _inicializar_processo(limite_memoria_mb: int):
+    """Aplica o teto de memória no processo do pool. Um documento que
+    ultrapasse o limite gera MemoryError apenas no processo que o analisa."""
+    if limite_memoria_mb <= 0:
+        return
+
+    try:
+        import resource
+
+        limite = limite_memoria_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limite, limite))
+    except (ImportError, ValueError, OSError) as erro:
+        logger.warning(f"Não foi possível limitar a memória do processo: {erro}")
+
+
+class ParserPool:
+    """Pool de processos responsável pelo parsing (CPU-bound) dos documentos,
+    mantendo o event loop livre para os demais requests (ex.: streams de chat)."""
+
+    _pool: Optional[ProcessPoolExecutor] = None
+    _metricas: Dict[str, int] = {
+        "pendentes": 0,
+        "concluidos": 0,
+        "falhas": 0,
+        "timeouts": 0,
+        "reinicios": 0,
+    }
+
+    @classmethod
+    def _criar_pool(cls) -> ProcessPoolExecutor:
+        # spawn evita herdar via fork o estado das threads da aplicação
+        # (redis, exporters do opentelemetry...)
+        return ProcessPoolExecutor(
+            max_workers=PARSER_POOL_MAX_PROCESSOS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_inicializar_processo,
+            initargs=(PARSER_POOL_LIMITE_MEMORIA_MB,),
+        )
+
+    @classmethod
+    @tracer.start_as_current_span("iniciar")
+    def iniciar(cls):
+        cls.encerrar()
+
+        cls._pool = cls._criar_pool()
+
+        logger.info(
+            f"Pool de parsing iniciado com {PARSER_POOL_MAX_PROCESSOS} processos"
+        )
+
+    @classmethod
+    @tracer.start_as_current_span("encerrar")
+    def encerrar(cls):
+        if cls._pool:
+            cls._pool.shutdown(wait=False, cancel_futures=True)
+
+            logger.info("Pool de parsing encerrado")
+
+        cls._pool = None
+
+    @classmethod
+    def _reiniciar(cls, pool: ProcessPoolExecutor):
+        """Substitui o pool informado por um novo, finalizando os processos
+        antigos. É a única forma de interromper uma tarefa que excedeu o tempo
+        limite, já que o ProcessPoolExecutor não cancela tarefas em execução."""
+        if cls._pool is not pool:
+            # outra tarefa já reiniciou o pool
+            return
+
+        cls._pool = cls._criar_pool()
+        cls._metricas["reinicios"] += 1
+
+        # o executor não expõe os processos publicamente
+        for processo in list((getattr(pool, "_processes", None) or {}).values()):
+            processo.terminate()
+
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        logger.warning("Pool de parsing reiniciado")
+
+    @classmethod
+    async def executar(
+        cls, funcao: Callable[..., Any], *args, timeout: int = PARSER_POOL_TIMEOUT
+    ) -> Any:
+        """Executa a função no pool de processos. Caso o pool não tenha sido
+        iniciado (ex.: scripts e testes), executa em uma thread."""
+        cls._metricas["pendentes"] += 1
+
+        try:
+            if cls._pool is None:
+                resultado = await asyncio.wait_for(
+                    asyncio.to_thread(funcao, *args), timeout=timeout
+                )
+                cls._metricas["concluidos"] += 1
+
+                return resultado
+
+            loop = asyncio.get_running_loop()
+
+            # uma nova tentativa apenas quando o pool foi derrubado por outra
+            # tarefa (timeout ou estouro de memória de outro documento)
+            for tentativa in range(2):
+                pool = cls._pool
+
+                try:
+                    resultado = await asyncio.wait_for(
+                        loop.run_in_executor(pool, funcao, *args), timeout=timeout
+                    )
+                    cls._metricas["concluidos"] += 1
+
+                    return resultado
+                except asyncio.TimeoutError:
+                    cls._reiniciar(pool)
+                    raise
+                except BrokenProcessPool:
+                    cls._reiniciar(pool)
+
+                    if tentativa:
+                        raise
+        except asyncio.TimeoutError as erro:
+            cls._metricas["timeouts"] += 1
+
+            raise ServiceException(
+                f"Tempo limite de {timeout}s excedido ao processar o documento"
+            ) from erro
+        except Exception:
+            cls._metricas["falhas"] += 1
+            raise
+        finally:
+            cls._metricas["pendentes"] -= 1
+
+    @classmethod
+    def metricas(cls) -> dict:
+        pendentes = cls._metricas["pendentes"]
+
+        return {
+            "ativo": cls._pool is not None,
+            "max_processos": PARSER_POOL_MAX_PROCESSOS,
+            "em_fila": max(0, pendentes - PARSER_POOL_MAX_PROCESSOS),
+            **cls._metricas,
+        }
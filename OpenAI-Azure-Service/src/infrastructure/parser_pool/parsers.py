@@ -0,0 +1,75 @@
+"""Funções de extração executadas nos processos do ParserPool.
+
+Precisam ser funções de módulo (serializáveis via pickle) e manter as
+dependências mínimas, pois cada processo do pool importa este módulo."""
+
+import logging
+from typing import List
+
+import fitz  # PyMuPDF
+import pandas as pd
+from langchain.docstore.document import Document
+from langchain_community.document_loaders import CSVLoader
+
+logger = logging.getLogger(__name__)
+
+
+def contar_paginas_pdf(caminho: str) -> int:
+    with fitz.open(filename=caminho, filetype="pdf") as pdf:
+        return len(pdf)
+
+
+def extrair_paginas_pdf(
+    caminho: str, filename: str, inicio: int, fim: int
+) -> List[Document]:
+    """Extrai o texto das páginas [inicio, fim) do PDF."""
+    pages = []
+
+    with fitz.open(filename=caminho, filetype="pdf") as pdf:
+        for i in range(inicio, min(fim, len(pdf))):
+            page = pdf.load_page(i)
+
+            pages.append(
+                Document(
+                    page_content=page.get_text(),
+                    metadata={"source": filename, "page": i + 1},
+                )
+            )
+
+    return pages
+
+
+def extrair_planilhas_xlsx(caminho: str, filename: str) -> List[Document]:
+    xls = pd.ExcelFile(caminho, engine="openpyxl")
+
+    pages = []
+
+    for i, plan_name in enumerate(xls.sheet_names):
+        logger.info(f"Processando planilha {i+1}:{plan_name}")
+
+        df = pd.read_excel(xls, sheet_name=i)
+        df.fillna("", inplace=False)
+
+        pages.append(
+            Document(
+                page_content=df.to_html(),
+                metadata={"page": i + 1, "source": filename},
+            )
+        )
+
+    xls.close()
+
+    return pages
+
+
+def extrair_csv(caminho: str, filename: str, page_number: int = 1) -> List[Document]:
+    loader = CSVLoader(caminho, encoding="utf-8")
+
+    data = loader.load()
+
+    page = Document(
+        page_content=" ".join([doc.page_content for doc in data]),
+        metadata={"page": page_number, "source": filename},
+    )
+
+    return [page]
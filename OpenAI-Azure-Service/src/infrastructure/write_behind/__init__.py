@@ -0,0 +1 @@
+""" write behind """
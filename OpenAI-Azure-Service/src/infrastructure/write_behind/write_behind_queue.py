@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import os
+import pickle
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from opentelemetry import trace
+
+from src.infrastructure.env import (
+    WRITE_BEHIND_ARQUIVO,
+    WRITE_BEHIND_MAX_ITENS,
+    WRITE_BEHIND_TENTATIVAS,
+    WRITE_BEHIND_TIMEOUT_ENCERRAMENTO,
+    WRITE_BEHIND_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+Tarefa = Tuple[Callable[..., Awaitable[Any]], tuple]
+
+
+class WriteBehindQueue:
+    """Fila de gravações executadas em segundo plano (ex.: persistência das
+    mensagens e atualização de quota ao final dos streams), para que o
+    término da resposta não dependa da latência do Elastic ou da API de
+    quotas.
+
+    Tarefas que falharem após WRITE_BEHIND_TENTATIVAS ou que não forem
+    concluídas até o shutdown são gravadas em WRITE_BEHIND_ARQUIVO e
+    reprocessadas no próximo startup (entrega pelo menos uma vez). As funções
+    e argumentos enfileirados devem, portanto, ser serializáveis via pickle."""
+
+    _fila: Optional[asyncio.Queue] = None
+    _workers: List[asyncio.Task] = []
+    _metricas: Dict[str, int] = {
+        "enfileiradas": 0,
+        "concluidas": 0,
+        "falhas": 0,
+        "executadas_no_request": 0,
+        "gravadas_em_disco": 0,
+        "reprocessadas": 0,
+    }
+
+    @classmethod
+    @tracer.start_as_current_span("iniciar")
+    async def iniciar(cls):
+        cls._fila = asyncio.Queue(maxsize=WRITE_BEHIND_MAX_ITENS)
+        cls._workers = [
+            asyncio.create_task(cls._processar(cls._fila))
+            for _ in range(WRITE_BEHIND_WORKERS)
+        ]
+
+        tarefas = cls._carregar_do_disco()
+
+        for tarefa in tarefas:
+            await cls._fila.put(tarefa)
+
+        cls._metricas["reprocessadas"] += len(tarefas)
+
+        logger.info(
+            f"Fila write-behind iniciada com {WRITE_BEHIND_WORKERS} workers "
+            f"({len(tarefas)} tarefas recuperadas do disco)"
+        )
+
+    @classmethod
+    @tracer.start_as_current_span("encerrar")
+    async def encerrar(cls):
+        """Aguarda o esvaziamento da fila por até
+        WRITE_BEHIND_TIMEOUT_ENCERRAMENTO segundos. O restante é gravado em
+        disco para o próximo startup."""
+        fila, workers = cls._fila, cls._workers
+
+        if fila is None:
+            return
+
+        # novas tarefas passam a ser executadas no próprio request
+        cls._fila = None
+        cls._workers = []
+
+        try:
+            await asyncio.wait_for(
+                fila.join(), timeout=WRITE_BEHIND_TIMEOUT_ENCERRAMENTO
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Tempo limite excedido ao esvaziar a fila write-behind")
+
+        for worker in workers:
+            worker.cancel()
+
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        pendentes = []
+
+        while not fila.empty():
+            pendentes.append(fila.get_nowait())
+
+        if pendentes:
+            cls._gravar_em_disco(pendentes)
+
+        logger.info("Fila write-behind encerrada")
+
+    @classmethod
+    async def enfileirar(cls, funcao: Callable[..., Awaitable[Any]], *args):
+        """Agenda a execução de funcao(*args). Caso a fila não tenha sido
+        iniciada (ex.: scripts e testes), executa imediatamente."""
+        if cls._fila is None:
+            await funcao(*args)
+            return
+
+        try:
+            cls._fila.put_nowait((funcao, args))
+            cls._metricas["enfileiradas"] += 1
+        except asyncio.QueueFull:
+            # fila cheia: o próprio request aguarda a gravação (backpressure)
+            logger.warning("Fila write-behind cheia, executando no request")
+
+            cls._metricas["executadas_no_request"] += 1
+
+            await cls._executar((funcao, args))
+
+    @classmethod
+    async def _processar(cls, fila: asyncio.Queue):
+        while True:
+            tarefa = await fila.get()
+
+            try:
+                await cls._executar(tarefa)
+            except asyncio.CancelledError:
+                # shutdown durante a execução: reprocessada no próximo startup
+                cls._gravar_em_disco([tarefa])
+                raise
+            finally:
+                fila.task_done()
+
+    @classmethod
+    async def _executar(cls, tarefa: Tarefa):
+        funcao, args = tarefa
+        nome = getattr(funcao, "__qualname__", repr(funcao))
+
+        for tentativa in range(1, WRITE_BEHIND_TENTATIVAS + 1):
+            try:
+                await funcao(*args)
+                cls._metricas["concluidas"] += 1
+
+                return
+            except Exception as erro:
+                logger.warning(
+                    f"Falha na tentativa {tentativa} de {nome} (write-behind): {erro}"
+                )
+
+                if tentativa < WRITE_BEHIND_TENTATIVAS:
+                    await asyncio.sleep(0.5 * 2 ** (tentativa - 1))
+
+        cls._metricas["falhas"] += 1
+        cls._gravar_em_disco([tarefa])
+
+    @classmethod
+    def _gravar_em_disco(cls, tarefas: List[Tarefa]):
+        try:
+            with open(WRITE_BEHIND_ARQUIVO, "ab") as arquivo:
+                for tarefa in tarefas:
+                    try:
+                        arquivo.write(pickle.dumps(tarefa))
+                        cls._metricas["gravadas_em_disco"] += 1
+                    except Exception as erro:
+                        logger.error(
+                            f"Tarefa write-behind descartada, não serializável: {erro}"
+                        )
+        except OSError as erro:
+            logger.error(f"Erro ao gravar as tarefas write-behind em disco: {erro}")
+            return
+
+        logger.warning(f"{len(tarefas)} tarefas write-behind gravadas em disco")
+
+    @staticmethod
+    def _carregar_do_disco() -> List[Tarefa]:
+        if not os.path.exists(WRITE_BEHIND_ARQUIVO):
+            return []
+
+        # o arquivo é renomeado antes da leitura para que as falhas do
+        # reprocessamento sejam gravadas em um novo arquivo
+        arquivo_reprocessamento = f"{WRITE_BEHIND_ARQUIVO}.{os.getpid()}"
+        os.replace(WRITE_BEHIND_ARQUIVO, arquivo_reprocessamento)
+
+        tarefas = []
+
+        with open(arquivo_reprocessamento, "rb") as arquivo:
+            while True:
+                try:
+                    tarefas.append(pickle.load(arquivo))
+                except EOFError:
+                    break
+                except Exception as erro:
+                    logger.error(f"Erro ao ler as tarefas write-behind: {erro}")
+                    break
+
+        os.remove(arquivo_reprocessamento)
+
+        return tarefas
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "ativo": cls._fila is not None,
+            "na_fila": cls._fila.qsize() if cls._fila else 0,
+            "workers": len(cls._workers),
+            **cls._metricas,
+        }
@@ -9,10 +9,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from langchain.globals import set_debug, set_verbose
 
 from src.domain.enum.type_channel_redis_enum import TypeChannelRedisEnum
+from src.infrastructure.azure_blob.blob_client_pool import BlobClientPool
+from src.infrastructure.cognitive_search.search_client_pool import SearchClientPool
+from src.infrastructure.elasticsearch.elasticsearch_pool import ElasticSearchPool
 from src.infrastructure.env import VERBOSE
+from src.infrastructure.event_loop.monitor_event_loop import MonitorEventLoop
 from src.infrastructure.mongo.mongo import Mongo
+from src.infrastructure.parser_pool.parser_pool import ParserPool
 from src.infrastructure.redis.redis_chattcu import RedisClient
 from src.infrastructure.routes import router
+from src.infrastructure.write_behind.write_behind_queue import WriteBehindQueue
 
 REDIS_THREAD = None
 if os.environ["PROFILE"] in ["prod", "aceite", "desenvol"]:
@@ -51,14 +57,25 @@ app = fastapi.FastAPI(
 
 @app.on_event("startup")
 async def startup_event():
+    MonitorEventLoop.iniciar()
     await Mongo.conectar()
+    await ElasticSearchPool.conectar()
+    ParserPool.iniciar()
+    await WriteBehindQueue.iniciar()
     if REDIS_THREAD:
         REDIS_THREAD.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # antes do Elastic: as gravações pendentes utilizam o pool de conexões
+    await WriteBehindQueue.encerrar()
     await Mongo.fechar_conexao()
+    await ElasticSearchPool.fechar_conexao()
+    await SearchClientPool.fechar_conexoes()
+    await BlobClientPool.fechar_conexoes()
+    ParserPool.encerrar()
+    MonitorEventLoop.encerrar()
 
 
 origins = [
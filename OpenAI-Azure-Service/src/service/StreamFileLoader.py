@@ -89,6 +89,33 @@ def _parse_docx(data: BytesIO, file_name: str) -> str:
     return file_name + ":" + content
 
 
+def extrair_conteudo(data: bytes, file_name: str) -> str:
+    """Extrai o texto de um arquivo PDF, DOCX, XLSX ou CSV. Os demais
+    formatos são ignorados. Função de módulo, para execução no ParserPool."""
+    file_extension = file_name.split(".")[-1].lower()
+
+    if file_extension == "pdf":
+        return _parse_pdf(BytesIO(data), file_name)
+    if file_extension == "docx":
+        return _parse_docx(BytesIO(data), file_name)
+    if file_extension == "xlsx":
+        return _parse_xlsx(BytesIO(data), file_name)
+    if file_extension == "csv":
+        return _parse_csv(BytesIO(data), file_name)
+
+    return ""
+
+
+def montar_documentos(conteudos: List[str]) -> List[Document]:
+    """Combina o texto dos arquivos, na ordem informada, em segmentos."""
+    final_segments = _split_content_into_segments("".join(conteudos))
+
+    return [
+        Document(page_content=segment, metadata={"source": "combined"})
+        for segment in final_segments
+    ]
+
+
 class StreamFileLoader(BasePDFLoader):
     """Load `PDF`, `DOCX`, `XLSX`, and `CSV` files."""
 
@@ -113,32 +140,9 @@ class StreamFileLoader(BasePDFLoader):
             for data, file_name in zip(self.data_list, self.file_names):
                 blobs.append(Blob.from_data(data.read(), path=file_name))
 
-            all_content = []
-            for blob in blobs:
-                file_extension = blob.source.split(".")[-1].lower()
-                if file_extension == "pdf":
-                    content = _parse_pdf(BytesIO(blob.data), blob.source)
-                elif file_extension == "docx":
-                    content = _parse_docx(BytesIO(blob.data), blob.source)
-                elif file_extension == "xlsx":
-                    content = _parse_xlsx(BytesIO(blob.data), blob.source)
-                elif file_extension == "csv":
-                    content = _parse_csv(BytesIO(blob.data), blob.source)
-                else:
-                    continue
-
-                all_content.extend(content)
-
-            combined_content = "".join(all_content)
-            final_segments = _split_content_into_segments(combined_content)
-
-            documents = []
-            for segment in final_segments:
-                documents.append(
-                    Document(page_content=segment, metadata={"source": "combined"})
-                )
+            all_content = [extrair_conteudo(blob.data, blob.source) for blob in blobs]
 
-            return documents
+            return montar_documentos(all_content)
         except Exception as e:
             logger.error(f"Erro ao processar o documento: {e}")
             traceback.print_exc()
@@ -10,10 +10,10 @@ import aiohttp
 import jwt
 from fastapi import Header, HTTPException, status
 from fastapi.responses import JSONResponse
-from jwt import PyJWKClient
 from opentelemetry import trace
 
 from src.conf.env import configs
+from src.infrastructure.entraid_cache import JwksCache, TokenValidadoCache
 from src.infrastructure.env import (
     HEADERS,
     PADDING,
@@ -35,21 +35,26 @@ tracer = trace.get_tracer(__name__)
 async def verify_decode_entraid_token(
     token: str, x_tkn: str | None, x_ufp: str | None
 ) -> DecodedEntraIDToken:
-    url = "https://login.microsoftonline.com/bf158188-9a11-44c2-b7fc-21e85613ba27/discovery/v2.0/keys"
     try:
-        jwks_client = PyJWKClient(
-            url,
-        )
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
-        data = jwt.decode(
-            token,
-            signing_key.key,
-            algorithms=["RS256"],
-            options={"verify_exp": True, "verify_signature": True, "verify_aud": False},
-            audience=configs.AUDIENCE,
-        )
+        data = TokenValidadoCache.obter(token)
+
+        if data is None:
+            signing_key = await JwksCache.obter_chave_do_token(token)
+            data = jwt.decode(
+                token,
+                signing_key.key,
+                algorithms=["RS256"],
+                options={
+                    "verify_exp": True,
+                    "verify_signature": True,
+                    "verify_aud": False,
+                },
+                audience=configs.AUDIENCE,
+            )
 
-        logger.info("Token EntraID validado com sucesso!")
+            TokenValidadoCache.armazenar(token, data)
+
+            logger.info("Token EntraID validado com sucesso!")
 
         if data:
             data["raw_token"] = token
@@ -70,7 +75,7 @@ async def verify_decode_entraid_token(
     except jwt.ExpiredSignatureError as exc:
         traceback.print_exc()
         raise jwt.ExpiredSignatureError("Token Entra ID expirado!") from exc
-    except Exception:
+    except Exception as exc:
         traceback.print_exc()
         raise jwt.InvalidTokenError("Token EntraID inválido!") from exc
 
@@ -157,9 +162,6 @@ async def autenticar_servico_token_2019(
     ufp_usuario_logado_servico_origem: str,
     recurso_computacional: List[str],
 ):
-    HEADERS["Authorization"] = f"Bearer {token_usuario_logado_servico_origem}"
-    HEADERS["X-UFP"] = ufp_usuario_logado_servico_origem
-
     url = re.sub(r"\/$", "", configs.AUTH_JWT_MS_URL)
 
     body = {
@@ -14,7 +14,7 @@ from src.domain.schemas import (
 )
 from src.exceptions import ServiceException
 from src.infrastructure.elasticsearch.elasticsearch import ElasticSearch
-from src.infrastructure.env import INDICE_ELASTIC
+from src.infrastructure.env import INDICE_ELASTIC, PROTOCOLO_STREAM_PADRAO
 from src.infrastructure.mongo.compatilhamento_mongo import CompartilhamentoMongo
 from src.infrastructure.security_tokens import DecodedToken
 from src.service.image_service import salva_imagem_no_blob
@@ -43,6 +43,7 @@ async def executar_prompt(
     app_origem: str,
     chat_id: Optional[str],
     client_app_header: str,
+    protocolo_stream: int = PROTOCOLO_STREAM_PADRAO,
 ):
     logger.info(
         f"chamou o executar prompt com o tool: {chat_input.tool_selecionada} usuário: {token.login}"
@@ -73,6 +74,7 @@ async def executar_prompt(
         token=token,
         app_origem=app_origem,
         client_app_header=client_app_header,
+        protocolo_stream=protocolo_stream,
     )
     return await engine.executar_prompt()
 
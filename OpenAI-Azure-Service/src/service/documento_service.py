@@ -19,14 +19,13 @@ from src.domain import documento
 from src.domain.llm.util.util import num_tokens_from_string
 from src.exceptions import ServiceException
 from src.infrastructure.realtimeaudio.util_realtime import Bcolors
-from src.service.auth_service import autenticar_servico
 from src.service.coarse_grained_pymupdf_parser import CoarseGrainedPyMUPDFParser
+from src.service.token_servico_broker import TokenServicoBroker
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
 RECURSO_COMPUTACIONAL_PECAS_PROCESSOS = 394
-HEADERS = {"Content-Type": "application/json"}
 
 
 @tracer.start_as_current_span("obter_pecas_processo")
@@ -40,14 +39,14 @@ async def obter_pecas_processo(numero_processo: str, token: str):
         ano = numero_processo[6:10]
         dv = numero_processo[-1]
 
-        HEADERS["Authorization"] = (
-            f"Bearer {await autenticar_servico(token, RECURSO_COMPUTACIONAL_PECAS_PROCESSOS)}"
+        headers = await TokenServicoBroker.obter_headers(
+            token, RECURSO_COMPUTACIONAL_PECAS_PROCESSOS
         )
 
         async with aiohttp.ClientSession() as session:
             async with session.get(
                 (f"{url_base_processo}/processos?numero={numero}&ano={ano}&dv={dv}"),
-                headers=HEADERS,
+                headers=headers,
             ) as response:
                 # Lança uma exceção se o código de status não for 2xx
                 response.raise_for_status()
@@ -57,7 +56,7 @@ async def obter_pecas_processo(numero_processo: str, token: str):
 
                 async with session.get(
                     f"{url_base_processo_novo}/processos/{codigo_processo}/pecas",
-                    headers=HEADERS,
+                    headers=headers,
                 ) as response:
                     # Lança uma exceção se o código de status não for 2xx
                     response.raise_for_status()
@@ -111,15 +110,15 @@ async def obter_stream_documento(id_documento: int, token: str) -> BytesIO:
     try:
         url_base_documento = re.sub(r"\/$", "", configs.BASE_DOCUMENTO_URL)
 
-        HEADERS["Authorization"] = (
-            f"Bearer {await autenticar_servico(token, RECURSO_COMPUTACIONAL_PECAS_PROCESSOS)}"
+        headers = await TokenServicoBroker.obter_headers(
+            token, RECURSO_COMPUTACIONAL_PECAS_PROCESSOS
         )
 
         # ENDPOINT OBSOLETO
         async with aiohttp.ClientSession() as session:
             async with session.get(
                 f"{url_base_documento}/documentos/{id_documento}/conteudo",
-                headers=HEADERS,
+                headers=headers,
             ) as response:
                 # Lança uma exceção se o código de status não for 2xx
                 response.raise_for_status()
@@ -141,13 +140,10 @@ async def obter_stream_documento(id_documento: int, token: str) -> BytesIO:
 async def obter_documento_pdf(id_documento: int, token: str):
     logger.info(f"\n\n>>{id_documento} - OBTENDO O DOCUMENTO PDF\n\n")
     try:
-        HEADERS["Authorization"] = (
-            f"Bearer {await autenticar_servico(token, RECURSO_COMPUTACIONAL_PECAS_PROCESSOS)}"
+        headers = await TokenServicoBroker.obter_headers(
+            token, RECURSO_COMPUTACIONAL_PECAS_PROCESSOS
         )
 
-        if not HEADERS["Authorization"]:
-            raise ServiceException("Authorization token é nullo ou inválido!")
-
         logger.info(
             Bcolors.FAIL
             + f">> {token} - Obtendo o stream do documento {id_documento}"
@@ -158,7 +154,7 @@ async def obter_documento_pdf(id_documento: int, token: str):
         async with aiohttp.ClientSession() as session:
             async with session.get(
                 f"{configs.BASE_DOCUMENTO_URL}/documentos/{id_documento}/conteudo-pdf",
-                headers=HEADERS,
+                headers=headers,
                 timeout=timeout,
             ) as response:
                 # Lança uma exceção se o código de status não for 2xx
@@ -166,6 +162,10 @@ async def obter_documento_pdf(id_documento: int, token: str):
 
                 return BytesIO(await response.read())
     except aiohttp.ClientResponseError as erro:
+        if erro.status == 401:
+            # token de serviço revogado: o próximo request gera um novo
+            TokenServicoBroker.invalidar(token, RECURSO_COMPUTACIONAL_PECAS_PROCESSOS)
+
         logger.error(
             Bcolors.BOLD
             + Bcolors.FAIL
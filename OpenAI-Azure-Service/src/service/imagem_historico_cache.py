@@ -0,0 +1,132 @@
+import asyncio
+import io
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from opentelemetry import trace
+
+from src.infrastructure.env import (
+    HISTORICO_IMAGEM_CACHE_MAX_MB,
+    HISTORICO_IMAGEM_LADO_MAXIMO,
+    HISTORICO_IMAGEM_MENOR_LADO_MAXIMO,
+)
+from src.service.image_service import binario_to_base64, get_imagem_do_blob
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+def reduzir_imagem(imagem_binario: bytes) -> bytes:
+    """Reduz a imagem às dimensões que o modelo utiliza no detalhe "high",
+    diminuindo o payload sem alterar o que é efetivamente analisado. Retorna
+    a imagem original quando não há redução ou ela não pode ser feita."""
+    if HISTORICO_IMAGEM_LADO_MAXIMO <= 0:
+        return imagem_binario
+
+    try:
+        # o Pillow é instalado como dependência do pdfplumber
+        from PIL import Image
+    except ImportError:
+        return imagem_binario
+
+    try:
+        with Image.open(io.BytesIO(imagem_binario)) as imagem:
+            largura, altura = imagem.size
+            escala = min(1, HISTORICO_IMAGEM_LADO_MAXIMO / max(largura, altura))
+
+            if HISTORICO_IMAGEM_MENOR_LADO_MAXIMO > 0:
+                escala = min(
+                    escala, HISTORICO_IMAGEM_MENOR_LADO_MAXIMO / min(largura, altura)
+                )
+
+            if escala >= 1:
+                return imagem_binario
+
+            reduzida = imagem.convert("RGB").resize(
+                (max(1, round(largura * escala)), max(1, round(altura * escala))),
+                Image.LANCZOS,
+            )
+
+        saida = io.BytesIO()
+        reduzida.save(saida, format="JPEG", quality=85)
+
+        return saida.getvalue()
+    except Exception as erro:
+        logger.warning(f"Não foi possível reduzir a imagem: {erro}")
+        return imagem_binario
+
+
+class ImagemHistoricoCache:
+    """LRU, limitado por HISTORICO_IMAGEM_CACHE_MAX_MB, das imagens do
+    histórico dos chats já reduzidas e codificadas em base64. A chave é o
+    nome do blob, derivado do hash e do tamanho do conteúdo, de modo que uma
+    imagem nunca é alterada sob a mesma chave."""
+
+    _itens: "OrderedDict[str, str]" = OrderedDict()
+    _bytes: int = 0
+    _metricas: Dict[str, int] = {
+        "hits": 0,
+        "misses": 0,
+        "reduzidas": 0,
+        "remocoes": 0,
+        "falhas": 0,
+    }
+
+    @classmethod
+    def _set(cls, id_imagem: str, imagem_base64: str):
+        anterior = cls._itens.pop(id_imagem, None)
+
+        if anterior is not None:
+            cls._bytes -= len(anterior)
+
+        cls._itens[id_imagem] = imagem_base64
+        cls._bytes += len(imagem_base64)
+
+        limite = HISTORICO_IMAGEM_CACHE_MAX_MB * 1024 * 1024
+
+        while cls._bytes > limite and cls._itens:
+            _, removida = cls._itens.popitem(last=False)
+            cls._bytes -= len(removida)
+            cls._metricas["remocoes"] += 1
+
+    @classmethod
+    @tracer.start_as_current_span("obter_imagem_historico")
+    async def obter(cls, id_imagem: str) -> Optional[str]:
+        """Retorna a imagem em base64, baixando-a do blob apenas na primeira
+        vez, ou None se ela não puder ser obtida."""
+        imagem_base64 = cls._itens.get(id_imagem)
+
+        if imagem_base64 is not None:
+            cls._itens.move_to_end(id_imagem)
+            cls._metricas["hits"] += 1
+
+            return imagem_base64
+
+        cls._metricas["misses"] += 1
+
+        imagem_binario = await get_imagem_do_blob(id_imagem)
+
+        if not imagem_binario:
+            cls._metricas["falhas"] += 1
+
+            return None
+
+        reduzida = await asyncio.to_thread(reduzir_imagem, imagem_binario)
+
+        if reduzida is not imagem_binario:
+            cls._metricas["reduzidas"] += 1
+
+        imagem_base64 = binario_to_base64(reduzida)
+        cls._set(id_imagem, imagem_base64)
+
+        return imagem_base64
+
+    @classmethod
+    def limpar(cls):
+        cls._itens.clear()
+        cls._bytes = 0
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {"itens": len(cls._itens), "bytes": cls._bytes, **cls._metricas}
@@ -7,7 +7,8 @@ from opentelemetry import trace
 from src.conf.env import configs
 from src.domain.schemas import DestinatarioOut
 from src.infrastructure.env import HEADERS
-from src.service.auth_service import autenticar_servico, autenticar_servico_token_2019
+from src.service.auth_service import autenticar_servico_token_2019
+from src.service.token_servico_broker import TokenServicoBroker
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -17,16 +18,14 @@ RECURSO_COMPUTACIONAL_GRH = 23
 
 @tracer.start_as_current_span("buscar_pessoas_por_nome")
 async def buscar_pessoas_por_nome(parametro: str, login: str):
-    HEADERS["Authorization"] = (
-        f"Bearer {await autenticar_servico(login, RECURSO_COMPUTACIONAL_GRH)}"
-    )
+    headers = await TokenServicoBroker.obter_headers(login, RECURSO_COMPUTACIONAL_GRH)
 
     timeout = aiohttp.ClientTimeout(total=20)
     async with aiohttp.ClientSession() as session:
         async with session.post(
             f"{configs.BASE_GRH_URL}/pessoas/pesquisa-por-nome",
             json={"query": parametro},
-            headers=HEADERS,
+            headers=headers,
             timeout=timeout,
         ) as result:
             logger.info(await result.text())
@@ -61,13 +60,16 @@ async def buscar_pessoa_por_codigo(codigo: int, tkn_usr: str, ufp_usr: str):
         tkn_usr, ufp_usr, [RECURSO_COMPUTACIONAL_GRH]
     )
 
-    HEADERS["Authorization"] = f"Bearer {tokens['tokenJwt']}"
-    HEADERS["X-UFP"] = tokens["userFingerPrint"]
+    headers = {
+        **HEADERS,
+        "Authorization": f"Bearer {tokens['tokenJwt']}",
+        "X-UFP": tokens["userFingerPrint"],
+    }
 
     timeout = aiohttp.ClientTimeout(total=20)  # seconds
     async with aiohttp.ClientSession() as session:
         async with session.get(
-            f"{configs.BASE_GRH_URL}/pessoas/{codigo}", headers=HEADERS, timeout=timeout
+            f"{configs.BASE_GRH_URL}/pessoas/{codigo}", headers=headers, timeout=timeout
         ) as result:
             # Lança uma exceção se o código de status não for 2xx
             result.raise_for_status()
@@ -79,15 +81,13 @@ async def buscar_pessoa_por_codigo(codigo: int, tkn_usr: str, ufp_usr: str):
 
 @tracer.start_as_current_span("buscar_pessoa_por_matricula")
 async def buscar_pessoa_por_matricula(matricula: str, login: str):
-    HEADERS["Authorization"] = (
-        f"Bearer {await autenticar_servico(login, RECURSO_COMPUTACIONAL_GRH)}"
-    )
+    headers = await TokenServicoBroker.obter_headers(login, RECURSO_COMPUTACIONAL_GRH)
 
     timeout = aiohttp.ClientTimeout(total=20)  # seconds
     async with aiohttp.ClientSession() as session:
         async with session.post(
             f"{configs.BASE_GRH_URL}/pessoas/matricula/{matricula}",
-            headers=HEADERS,
+            headers=headers,
             timeout=timeout,
         ) as result:
             # Lança uma exceção se o código de status não for 2xx
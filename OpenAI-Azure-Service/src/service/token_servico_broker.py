@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import jwt
+from opentelemetry import trace
+
+from src.exceptions import ServiceException
+from src.infrastructure.env import (
+    TOKEN_SERVICO_MARGEM_RENOVACAO,
+    TOKEN_SERVICO_MAX_ITENS,
+    TOKEN_SERVICO_TTL_PADRAO,
+)
+from src.service.auth_service import autenticar_servico
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+Chave = Tuple[str, str]
+
+
+class TokenServicoBroker:
+    """Tokens JWT de serviço (autenticar_servico) reutilizados por
+    (usuário, recurso computacional) até TOKEN_SERVICO_MARGEM_RENOVACAO
+    segundos antes do "exp". Requests concorrentes pelo mesmo par aguardam
+    uma única autenticação.
+
+    Os headers são retornados em um novo dict a cada chamada; o dict global
+    HEADERS não deve ser alterado, pois é compartilhado pelos requests."""
+
+    _tokens: "OrderedDict[Chave, Tuple[float, str]]" = OrderedDict()
+    _em_andamento: Dict[Chave, asyncio.Task] = {}
+    _metricas: Dict[str, int] = {"hits": 0, "misses": 0, "compartilhados": 0}
+
+    @staticmethod
+    def _calcular_expiracao(token: str) -> float:
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except Exception:
+            exp = None
+
+        if not exp:
+            return time.time() + TOKEN_SERVICO_TTL_PADRAO
+
+        return float(exp) - TOKEN_SERVICO_MARGEM_RENOVACAO
+
+    @classmethod
+    async def _autenticar(cls, chave: Chave) -> str:
+        usuario, recurso_computacional = chave
+
+        token = await autenticar_servico(usuario, recurso_computacional)
+
+        if token:
+            cls._tokens[chave] = (cls._calcular_expiracao(token), token)
+            cls._tokens.move_to_end(chave)
+
+            while len(cls._tokens) > TOKEN_SERVICO_MAX_ITENS:
+                cls._tokens.popitem(last=False)
+
+        return token
+
+    @classmethod
+    @tracer.start_as_current_span("obter_token_servico")
+    async def obter_token(cls, usuario: str, recurso_computacional) -> str:
+        chave = (usuario, str(recurso_computacional))
+        item = cls._tokens.get(chave)
+
+        if item is not None and item[0] > time.time():
+            cls._tokens.move_to_end(chave)
+            cls._metricas["hits"] += 1
+
+            return item[1]
+
+        tarefa = cls._em_andamento.get(chave)
+
+        if tarefa is not None:
+            cls._metricas["compartilhados"] += 1
+        else:
+            cls._metricas["misses"] += 1
+
+            tarefa = asyncio.ensure_future(cls._autenticar(chave))
+            cls._em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda _: cls._em_andamento.pop(chave, None))
+
+        return await asyncio.shield(tarefa)
+
+    @classmethod
+    async def obter_headers(cls, usuario: str, recurso_computacional) -> dict:
+        token = await cls.obter_token(usuario, recurso_computacional)
+
+        if not token:
+            raise ServiceException("Authorization token é nullo ou inválido!")
+
+        return {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+
+    @classmethod
+    def invalidar(cls, usuario: str, recurso_computacional):
+        cls._tokens.pop((usuario, str(recurso_computacional)), None)
+
+    @classmethod
+    def limpar(cls):
+        cls._tokens.clear()
+        cls._em_andamento.clear()
+
+    @classmethod
+    def metricas(cls) -> dict:
+        return {
+            "tokens": len(cls._tokens),
+            "em_andamento": len(cls._em_andamento),
+            **cls._metricas,
+        }
@@ -23,13 +23,16 @@ async def busca_unidade(parametro: str, tkn_usr: str, ufp_usr: str):
         tkn_usr, ufp_usr, [RECURSO_COMPUTACIONAL_GRH]
     )
 
-    HEADERS["Authorization"] = f"Bearer {tokens['tokenJwt']}"
-    HEADERS["X-UFP"] = tokens["userFingerPrint"]
+    headers = {
+        **HEADERS,
+        "Authorization": f"Bearer {tokens['tokenJwt']}",
+        "X-UFP": tokens["userFingerPrint"],
+    }
 
     timeout = aiohttp.ClientTimeout(total=20)  # seconds
     async with aiohttp.ClientSession() as session:
         async with session.get(
-            f"{configs.BASE_GRH_URL}/unidades/ativas", headers=HEADERS, timeout=timeout
+            f"{configs.BASE_GRH_URL}/unidades/ativas", headers=headers, timeout=timeout
         ) as result:
             # Lança uma exceção se o código de status não for 2xx
             result.raise_for_status()
@@ -60,14 +63,17 @@ async def busca_arvore_unidades(tkn_usr: str, ufp_usr: str):
         tkn_usr, ufp_usr, [RECURSO_COMPUTACIONAL_GRH]
     )
 
-    HEADERS["Authorization"] = f"Bearer {tokens['tokenJwt']}"
-    HEADERS["X-UFP"] = tokens["userFingerPrint"]
+    headers = {
+        **HEADERS,
+        "Authorization": f"Bearer {tokens['tokenJwt']}",
+        "X-UFP": tokens["userFingerPrint"],
+    }
 
     timeout = aiohttp.ClientTimeout(total=20)  # seconds
     async with aiohttp.ClientSession() as session:
         async with session.get(
             f"{configs.BASE_UNIDADES_URL}api/v1/unidades/arvore",
-            headers=HEADERS,
+            headers=headers,
             timeout=timeout,
         ) as result:
             # Lança uma exceção se o código de status não for 2xx
@@ -1,13 +1,14 @@
-import io
+import asyncio
 import logging
 import re
-import zipfile
+from collections import deque
 from datetime import datetime
-from typing import List, Literal
+from typing import AsyncIterator, Deque, List, Literal, Optional, Tuple
 
 import aiohttp
 from fastapi import UploadFile, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from azure.core.exceptions import HttpResponseError
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from opentelemetry import trace
 
 from src.conf.env import configs
@@ -18,6 +19,7 @@ from src.infrastructure.azure_blob.azure_blob import AzureBlob
 from src.infrastructure.cognitive_search.documentos_cs import DocumentoCS
 from src.infrastructure.env import CHUNK_OVERLAP  # TAM_MAXIMO_ARQUIVO,
 from src.infrastructure.env import (
+    BLOB_DOWNLOAD_TAMANHO_PARTE,
     CHUNK_SIZE,
     CONTAINER_NAME,
     EXT_ALVOS_GABI,
@@ -25,6 +27,8 @@ from src.infrastructure.env import (
     MIME_TYPES_PERMITIDOS,
     NOME_PASTA_PADRAO,
     PERMITIDOS,
+    ZIP_DOWNLOAD_CONCORRENCIA,
+    ZIP_TAMANHO_MAXIMO,
 )
 from src.infrastructure.mongo.upload_mongo import UploadMongo
 from src.infrastructure.roles import DESENVOLVEDOR
@@ -32,6 +36,7 @@ from src.infrastructure.security_tokens import DecodedToken
 
 # from src.service.gabi_service import process_audio
 from src.util.upload_util import calcula_hash, parse_item
+from src.util.zip_stream import ZipStreamWriter
 
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
@@ -342,7 +347,12 @@ async def renomear_item(item_id: str, novo_nome: str, login: str):
 
 
 @tracer.start_as_current_span("download_item")
-async def download_item(item_id: str, login: str):
+async def download_item(
+    item_id: str,
+    login: str,
+    range_header: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+):
     # colocado a verificação com o null pois o frontend está
     # enviando null no lugar do id e ao receber está recebendo como string
     if not item_id or item_id == "null":
@@ -370,33 +380,132 @@ async def download_item(item_id: str, login: str):
 
     if item:
         if item.st_arquivo:
-            return await download_arquivo(item)
+            return await download_arquivo(item, range_header, if_none_match)
 
         return await download_pasta_zipada(item)
 
     raise ServiceException("Item para download não localizado")
 
 
+def _gerar_etag(arquivo: ItemSistema) -> Optional[str]:
+    # o nome do blob é derivado do hash e do tamanho do conteúdo
+    if not arquivo.nome_blob:
+        return None
+
+    return f'"{arquivo.nome_blob.rsplit(".", 1)[0]}"'
+
+
+def _etag_corresponde(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or not etag:
+        return False
+
+    etags = [valor.strip().removeprefix("W/") for valor in if_none_match.split(",")]
+
+    return "*" in etags or etag in etags
+
+
+def _interpretar_range(range_header: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Retorna (inicio, fim) de um único intervalo "bytes=inicio-[fim]". Os
+    demais formatos (sufixo, múltiplos intervalos) são ignorados e o arquivo
+    é enviado integralmente, como permitido pela RFC 9110."""
+    if not range_header:
+        return None
+
+    intervalo = re.fullmatch(r"\s*bytes=(\d+)-(\d*)\s*", range_header)
+
+    if not intervalo:
+        return None
+
+    inicio = int(intervalo.group(1))
+    fim = int(intervalo.group(2)) if intervalo.group(2) else None
+
+    if fim is not None and fim < inicio:
+        return None
+
+    return inicio, fim
+
+
 @tracer.start_as_current_span("download_arquivo")
-async def download_arquivo(arquivo: ItemSistema):
+async def download_arquivo(
+    arquivo: ItemSistema,
+    range_header: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+):
+    """Transmite o arquivo em partes, sem carregá-lo integralmente em memória.
+    Atende requisições condicionais (If-None-Match) sem acessar o blob e
+    intervalos de bytes (Range) para downloads retomados e visualizadores de
+    PDF."""
     try:
+        etag = _gerar_etag(arquivo)
+        headers = {
+            "Content-Disposition": f"attachment;filename={re.sub('[^0-9a-zA-Z_-]', '_', arquivo.nome)}",
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, no-cache",
+        }
+
+        if etag:
+            headers["ETag"] = etag
+
+        if _etag_corresponde(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
         azb = AzureBlob()
+        intervalo = _interpretar_range(range_header)
 
-        data = await azb.download_blob(
-            container_name=CONTAINER_NAME, filename=arquivo.nome_blob
-        )
+        try:
+            downloader, partes = await azb.download_blob_em_partes(
+                container_name=CONTAINER_NAME,
+                filename=arquivo.nome_blob,
+                offset=intervalo[0] if intervalo else None,
+                length=(
+                    intervalo[1] - intervalo[0] + 1
+                    if intervalo and intervalo[1] is not None
+                    else None
+                ),
+            )
+        except HttpResponseError as erro:
+            if erro.status_code != status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE:
+                raise erro
+
+            # intervalo além do fim do arquivo: envia o arquivo integralmente
+            intervalo = None
+            downloader, partes = await azb.download_blob_em_partes(
+                container_name=CONTAINER_NAME, filename=arquivo.nome_blob
+            )
+
+        headers["Content-Length"] = str(downloader.size)
+        status_code = status.HTTP_200_OK
+
+        if intervalo:
+            inicio = intervalo[0]
+            headers["Content-Range"] = (
+                f"bytes {inicio}-{inicio + downloader.size - 1}"
+                + f"/{downloader.properties.size}"
+            )
+            status_code = status.HTTP_206_PARTIAL_CONTENT
 
         return StreamingResponse(
-            iter([data]),
+            partes,
+            status_code=status_code,
             media_type=arquivo.tipo_midia,
-            headers={
-                "Content-Disposition": f"attachment;filename={re.sub('[^0-9a-zA-Z_-]', '_', arquivo.nome)}"
-            },
+            headers=headers,
         )
     except Exception as error:
         raise error
 
 
+def _tamanho_total(arquivos: List[ItemSistema]) -> int:
+    total = 0
+
+    for arquivo in arquivos:
+        try:
+            total += int(arquivo.tamanho or 0)
+        except ValueError:
+            continue
+
+    return total
+
+
 @tracer.start_as_current_span("download_pasta_zipada")
 async def download_pasta_zipada(pasta: ItemSistema):
     logger.info("Tentando download de pasta zipada")
@@ -409,7 +518,12 @@ async def download_pasta_zipada(pasta: ItemSistema):
         )
 
         if pasta.arquivos:
-            zip_stream = await generate_zip_stream(pasta.arquivos, azb)
+            if _tamanho_total(pasta.arquivos) > ZIP_TAMANHO_MAXIMO:
+                raise ServiceException(
+                    "A pasta excede o tamanho máximo permitido para download"
+                )
+
+            zip_stream = generate_zip_stream(pasta.arquivos, azb)
 
             return StreamingResponse(
                 zip_stream,
@@ -424,21 +538,72 @@ async def download_pasta_zipada(pasta: ItemSistema):
         raise error
 
 
-@tracer.start_as_current_span("generate_zip_stream")
-async def generate_zip_stream(files: List[ItemSistema], azb: AzureBlob):
-    zip_stream = io.BytesIO()
-
-    with zipfile.ZipFile(zip_stream, mode="w") as zip_file:
-        for file in files:
-            data = await azb.download_blob(
-                container_name=CONTAINER_NAME, filename=file.nome_blob
+async def generate_zip_stream(
+    files: List[ItemSistema], azb: AzureBlob
+) -> AsyncIterator[bytes]:
+    """Gera o zip à medida que os arquivos são baixados. Até
+    ZIP_DOWNLOAD_CONCORRENCIA arquivos são baixados em paralelo, à frente do
+    que está sendo enviado, e um novo download só é iniciado quando o arquivo
+    atual termina de ser entregue ao cliente, limitando a memória utilizada
+    aos arquivos dessa janela."""
+    escritor = ZipStreamWriter(ZIP_TAMANHO_MAXIMO)
+    pendentes = iter(files)
+    downloads: Deque[Tuple[ItemSistema, asyncio.Task]] = deque()
+
+    def agendar():
+        while len(downloads) < ZIP_DOWNLOAD_CONCORRENCIA:
+            file = next(pendentes, None)
+
+            if file is None:
+                return
+
+            download = asyncio.create_task(
+                azb.download_blob(
+                    container_name=CONTAINER_NAME, filename=file.nome_blob
+                )
             )
+            downloads.append((file, download))
 
-            zip_file.writestr(file.nome, data)
+    try:
+        agendar()
+
+        while downloads:
+            file, download = downloads[0]
+
+            # o cabeçalho local não depende do conteúdo, que é descrito ao
+            # final da entrada
+            yield escritor.iniciar_entrada(file.nome)
+
+            data = await download
+            downloads.popleft()
+
+            if data is None:
+                raise ServiceException(f"Falha ao baixar o arquivo {file.nome}")
+
+            conteudo = memoryview(data)
 
-    zip_stream.seek(0)
+            for inicio in range(0, len(conteudo), BLOB_DOWNLOAD_TAMANHO_PARTE):
+                parte = await asyncio.to_thread(
+                    escritor.escrever,
+                    conteudo[inicio : inicio + BLOB_DOWNLOAD_TAMANHO_PARTE],
+                )
 
-    return zip_stream
+                if parte:
+                    yield parte
+
+            del conteudo, data
+            agendar()
+
+            yield escritor.finalizar_entrada()
+
+        yield escritor.finalizar()
+    except Exception as error:
+        logger.error(f"Erro ao gerar o zip da pasta: {error}")
+        raise error
+    finally:
+        # cliente desconectado ou falha: descarta os downloads antecipados
+        for _, download in downloads:
+            download.cancel()
 
 
 @tracer.start_as_current_span("copiar_itens")
@@ -0,0 +1,206 @@
+import struct
+import time
+import zlib
+from typing import List, Optional
+
+from src.exceptions import ServiceException
+
+# formatos já comprimidos, em que o deflate consome CPU sem reduzir o tamanho
+EXTENSOES_SEM_COMPRESSAO = {
+    "pdf",
+    "zip",
+    "gz",
+    "7z",
+    "rar",
+    "docx",
+    "xlsx",
+    "pptx",
+    "odt",
+    "jpg",
+    "jpeg",
+    "png",
+    "gif",
+    "webp",
+    "mp3",
+    "mp4",
+}
+
+METODO_STORED = 0
+METODO_DEFLATE = 8
+# bit 3: CRC e tamanhos informados no data descriptor, após os dados
+# bit 11: nome do arquivo codificado em UTF-8
+FLAGS = 0x0008 | 0x0800
+VERSAO = 20
+# sem ZIP64, os offsets e tamanhos são limitados a 32 bits
+LIMITE_ZIP32 = 0xFFFFFFFF
+
+
+class _Entrada:
+    def __init__(self, nome: bytes, metodo: int, offset: int, data_hora: tuple):
+        self.nome = nome
+        self.metodo = metodo
+        self.offset = offset
+        self.data_hora = data_hora
+        self.crc = 0
+        self.tamanho = 0
+        self.tamanho_comprimido = 0
+
+
+class ZipStreamWriter:
+    """Escritor de arquivos ZIP em fluxo: cada método retorna os bytes a
+    serem enviados, sem manter o arquivo em memória. O cabeçalho local é
+    emitido antes do conteúdo, com o CRC e os tamanhos gravados no data
+    descriptor ao final de cada entrada, o que permite iniciar o envio antes
+    do download do primeiro arquivo."""
+
+    def __init__(self, tamanho_maximo: int = LIMITE_ZIP32):
+        self.tamanho_maximo = min(tamanho_maximo, LIMITE_ZIP32)
+        self._entradas: List[_Entrada] = []
+        self._atual: Optional[_Entrada] = None
+        self._compressor = None
+        self._offset = 0
+
+    @staticmethod
+    def _metodo(nome: str) -> int:
+        extensao = nome.rsplit(".", 1)[-1].lower() if "." in nome else ""
+
+        if extensao in EXTENSOES_SEM_COMPRESSAO:
+            return METODO_STORED
+
+        return METODO_DEFLATE
+
+    @staticmethod
+    def _data_hora_dos(instante: time.struct_time) -> tuple:
+        ano = max(instante.tm_year, 1980)
+        data = (ano - 1980) << 9 | instante.tm_mon << 5 | instante.tm_mday
+        hora = instante.tm_hour << 11 | instante.tm_min << 5 | instante.tm_sec // 2
+
+        return hora, data
+
+    def _emitir(self, dados: bytes) -> bytes:
+        self._offset += len(dados)
+
+        if self._offset > self.tamanho_maximo:
+            raise ServiceException("O arquivo zip excede o tamanho máximo permitido")
+
+        return dados
+
+    def iniciar_entrada(self, nome: str) -> bytes:
+        """Retorna o cabeçalho local da entrada."""
+        if self._atual is not None:
+            raise ServiceException("A entrada anterior do zip não foi finalizada")
+
+        metodo = self._metodo(nome)
+        self._atual = _Entrada(
+            nome.encode("utf-8"),
+            metodo,
+            self._offset,
+            self._data_hora_dos(time.localtime()),
+        )
+        self._compressor = (
+            zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            if metodo == METODO_DEFLATE
+            else None
+        )
+
+        cabecalho = struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            VERSAO,
+            FLAGS,
+            metodo,
+            *self._atual.data_hora,
+            0,
+            0,
+            0,
+            len(self._atual.nome),
+            0,
+        )
+
+        return self._emitir(cabecalho + self._atual.nome)
+
+    def escrever(self, dados: bytes) -> bytes:
+        """Retorna o conteúdo (comprimido, se for o caso) da parte informada.
+        Com o deflate, parte dos bytes pode ficar retida até a próxima
+        chamada."""
+        entrada = self._atual
+        entrada.crc = zlib.crc32(dados, entrada.crc)
+        entrada.tamanho += len(dados)
+
+        if self._compressor is not None:
+            dados = self._compressor.compress(dados)
+        else:
+            dados = bytes(dados)
+
+        entrada.tamanho_comprimido += len(dados)
+
+        return self._emitir(dados)
+
+    def finalizar_entrada(self) -> bytes:
+        """Retorna os bytes restantes do compressor e o data descriptor."""
+        entrada = self._atual
+        restante = b""
+
+        if self._compressor is not None:
+            restante = self._compressor.flush()
+            entrada.tamanho_comprimido += len(restante)
+
+        if entrada.tamanho > LIMITE_ZIP32:
+            raise ServiceException("O arquivo zip excede o tamanho máximo permitido")
+
+        descritor = struct.pack(
+            "<IIII",
+            0x08074B50,
+            entrada.crc,
+            entrada.tamanho_comprimido,
+            entrada.tamanho,
+        )
+
+        self._entradas.append(entrada)
+        self._atual = None
+        self._compressor = None
+
+        return self._emitir(restante + descritor)
+
+    def finalizar(self) -> bytes:
+        """Retorna o diretório central e o registro de fim do arquivo."""
+        if len(self._entradas) > 0xFFFF:
+            raise ServiceException("O arquivo zip excede a quantidade de arquivos")
+
+        inicio = self._offset
+        diretorio = b"".join(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50,
+                VERSAO,
+                VERSAO,
+                FLAGS,
+                entrada.metodo,
+                *entrada.data_hora,
+                entrada.crc,
+                entrada.tamanho_comprimido,
+                entrada.tamanho,
+                len(entrada.nome),
+                0,
+                0,
+                0,
+                0,
+                0,
+                entrada.offset,
+            )
+            + entrada.nome
+            for entrada in self._entradas
+        )
+        fim = struct.pack(
+            "<IHHHHIIH",
+            0x06054B50,
+            0,
+            0,
+            len(self._entradas),
+            len(self._entradas),
+            len(diretorio),
+            inicio,
+            0,
+        )
+
+        return self._emitir(diretorio + fim)
@@ -1,7 +1,17 @@
 import pytest
 
+from src.infrastructure.azure_blob.blob_client_pool import BlobClientPool
+from src.infrastructure.cognitive_search.embedding_cache import EmbeddingCache
+from src.infrastructure.cognitive_search.filtro_busca_cache import FiltroBuscaCache
+from src.infrastructure.cognitive_search.query_vector_memo import QueryVectorMemo
+from src.infrastructure.cognitive_search.resposta_semantica_cache import (
+    RespostaSemanticaCache,
+)
+from src.infrastructure.entraid_cache import JwksCache, TokenValidadoCache
 from src.infrastructure.roles import DESENVOLVEDOR
 from src.infrastructure.security_tokens import DecodedEntraIDToken, DecodedToken
+from src.service.imagem_historico_cache import ImagemHistoricoCache
+from src.service.token_servico_broker import TokenServicoBroker
 
 
 @pytest.fixture
@@ -26,3 +36,34 @@ def decoded_token(token_data):
 def decoded_token_com_role(token_data):
     token_data["siga_roles"] = [DESENVOLVEDOR]
     return DecodedToken.model_validate(token_data)
+
+
+@pytest.fixture(autouse=True)
+def limpar_caches_de_embedding():
+    # os caches são compartilhados pelo processo; evita que um teste
+    # reaproveite os vetores gerados por outro
+    EmbeddingCache.limpar()
+    QueryVectorMemo.limpar()
+    FiltroBuscaCache.limpar()
+    RespostaSemanticaCache.limpar()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def limpar_caches_de_autenticacao():
+    JwksCache.limpar()
+    TokenValidadoCache.limpar()
+    TokenServicoBroker.limpar()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def limpar_cache_de_containers():
+    BlobClientPool.limpar()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def limpar_cache_de_imagens():
+    ImagemHistoricoCache.limpar()
+    yield
@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.infrastructure.azure_blob.blob_client_pool import BlobClientPool
+
+CONNECT_STR = (
+    "DefaultEndpointsProtocol=https;AccountName=conta;"
+    + "AccountKey=Y2hhdmU=;EndpointSuffix=core.windows.net"
+)
+
+
+class TestBlobClientPool:
+    @pytest.mark.asyncio
+    async def test_get_client_reutiliza_por_connection_string(self):
+        client_1 = BlobClientPool.get_client(CONNECT_STR)
+        client_2 = BlobClientPool.get_client(CONNECT_STR)
+        client_outra_conta = BlobClientPool.get_client(
+            CONNECT_STR.replace("conta", "outra")
+        )
+
+        assert client_1 is client_2
+        assert client_1 is not client_outra_conta
+        assert BlobClientPool.metricas()["clientes"] == 2
+
+        await BlobClientPool.fechar_conexoes()
+
+    @pytest.mark.asyncio
+    async def test_fechar_conexoes(self, mocker):
+        client = BlobClientPool.get_client(CONNECT_STR)
+        mocker.patch.object(client, "close", new_callable=AsyncMock)
+
+        await BlobClientPool.fechar_conexoes()
+
+        client.close.assert_awaited_once()
+        assert BlobClientPool.metricas()["clientes"] == 0
+        assert BlobClientPool.get_client(CONNECT_STR) is not client
+
+        await BlobClientPool.fechar_conexoes()
+
+    def test_cache_de_containers(self):
+        metricas = BlobClientPool.metricas()
+
+        assert not BlobClientPool.container_existe("container")
+
+        BlobClientPool.registrar_container("container")
+
+        assert BlobClientPool.container_existe("container")
+
+        BlobClientPool.invalidar_container("container")
+
+        assert not BlobClientPool.container_existe("container")
+        assert (
+            BlobClientPool.metricas()["containers_em_cache"]
+            == metricas["containers_em_cache"] + 1
+        )
+        assert (
+            BlobClientPool.metricas()["containers_consultados"]
+            == metricas["containers_consultados"] + 2
+        )
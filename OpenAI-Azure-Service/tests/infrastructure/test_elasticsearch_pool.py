@@ -0,0 +1,45 @@
+import pytest
+
+from src.infrastructure.elasticsearch.elasticsearch_pool import ElasticSearchPool
+
+
+class TestElasticSearchPool:
+    @pytest.mark.asyncio
+    async def test_get_session_reutiliza_sessao(self):
+        await ElasticSearchPool.conectar()
+
+        session_1 = await ElasticSearchPool.get_session()
+        session_2 = await ElasticSearchPool.get_session()
+
+        assert session_1 is session_2
+        assert not session_1.closed
+
+        await ElasticSearchPool.fechar_conexao()
+
+        assert session_1.closed
+        assert ElasticSearchPool.session is None
+
+    @pytest.mark.asyncio
+    async def test_get_session_cria_sob_demanda(self):
+        await ElasticSearchPool.fechar_conexao()
+
+        session = await ElasticSearchPool.get_session()
+
+        assert session is not None
+        assert session.connector.limit > 0
+
+        await ElasticSearchPool.fechar_conexao()
+
+    @pytest.mark.asyncio
+    async def test_metricas(self):
+        await ElasticSearchPool.conectar()
+
+        metricas = ElasticSearchPool.metricas()
+
+        assert metricas["ativo"] is True
+        assert metricas["max_conexoes"] > 0
+        assert "hosts" in metricas
+
+        await ElasticSearchPool.fechar_conexao()
+
+        assert ElasticSearchPool.metricas()["ativo"] is False
@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.infrastructure.cognitive_search.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    def test_gerar_chave_normaliza_texto(self):
+        chave = EmbeddingCache.gerar_chave("ada", "resuma   o\n documento ")
+
+        assert chave == EmbeddingCache.gerar_chave("ada", "resuma o documento")
+        assert chave != EmbeddingCache.gerar_chave("3-large", "resuma o documento")
+        assert chave.startswith("embedding:ada:")
+
+    @pytest.mark.asyncio
+    async def test_obter_e_armazenar(self):
+        misses = EmbeddingCache.metricas()["misses"]
+        hits = EmbeddingCache.metricas()["hits_memoria"]
+
+        assert await EmbeddingCache.obter("ada", ["a", "b"]) == [None, None]
+
+        await EmbeddingCache.armazenar("ada", ["a"], [[0.5, 0.25]])
+
+        assert await EmbeddingCache.obter("ada", ["a", "b"]) == [[0.5, 0.25], None]
+        assert EmbeddingCache.metricas()["misses"] == misses + 3
+        assert EmbeddingCache.metricas()["hits_memoria"] == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_remove_itens_menos_usados_ao_exceder_limite(self, mocker):
+        # 1 MB comporta 2 vetores de 100 mil floats (400 KB cada)
+        mocker.patch(
+            "src.infrastructure.cognitive_search.embedding_cache.EMBEDDING_CACHE_MAX_MB",
+            1,
+        )
+        vetor = [0.0] * 100_000
+
+        await EmbeddingCache.armazenar("ada", ["a", "b"], [vetor, vetor])
+        await EmbeddingCache.obter("ada", ["a"])
+        await EmbeddingCache.armazenar("ada", ["c"], [vetor])
+
+        assert await EmbeddingCache.obter("ada", ["a", "b", "c"]) == [
+            vetor,
+            None,
+            vetor,
+        ]
+        assert EmbeddingCache.metricas()["itens"] == 2
+        assert EmbeddingCache.metricas()["bytes"] <= 1024 * 1024
+
+    @pytest.mark.asyncio
+    async def test_obter_do_redis(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.embedding_cache.EMBEDDING_CACHE_REDIS_ATIVO",
+            True,
+        )
+        redis = MagicMock()
+        mocker.patch.object(EmbeddingCache, "_get_redis", return_value=redis)
+
+        await EmbeddingCache.armazenar("ada", ["a"], [[1.5]])
+        valor = redis.pipeline.return_value.__enter__.return_value.set.call_args.args[1]
+
+        EmbeddingCache.limpar()
+        redis.mget.return_value = [valor, None]
+
+        assert await EmbeddingCache.obter("ada", ["a", "b"]) == [[1.5], None]
+        # promovido para o nível em memória
+        assert EmbeddingCache.metricas()["itens"] == 1
+
+    @pytest.mark.asyncio
+    async def test_obter_ignora_falha_no_redis(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.embedding_cache.EMBEDDING_CACHE_REDIS_ATIVO",
+            True,
+        )
+        redis = MagicMock()
+        redis.mget.side_effect = RedisError("indisponível")
+        mocker.patch.object(EmbeddingCache, "_get_redis", return_value=redis)
+
+        assert await EmbeddingCache.obter("ada", ["a"]) == [None]
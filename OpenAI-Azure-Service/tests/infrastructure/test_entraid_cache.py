@@ -0,0 +1,127 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from src.infrastructure.entraid_cache import JwksCache, TokenValidadoCache
+
+
+@pytest.fixture(scope="module")
+def chave_privada():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def jwks(chave_privada):
+    jwk = RSAAlgorithm.to_jwk(chave_privada.public_key(), as_dict=True)
+
+    return {"keys": [{**jwk, "kid": "kid-1", "use": "sig", "alg": "RS256"}]}
+
+
+@pytest.fixture
+def mock_get(jwks):
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.json = AsyncMock(return_value=jwks)
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        yield mock_get
+
+
+def gerar_token(chave_privada, kid="kid-1"):
+    return jwt.encode(
+        {"sub": "usuario", "exp": int(time.time()) + 600},
+        chave_privada,
+        algorithm="RS256",
+        headers={"kid": kid},
+    )
+
+
+class TestJwksCache:
+    @pytest.mark.asyncio
+    async def test_obter_chave_do_token_reaproveita_chaves(
+        self, mock_get, chave_privada
+    ):
+        token = gerar_token(chave_privada)
+
+        chave = await JwksCache.obter_chave_do_token(token)
+        await JwksCache.obter_chave_do_token(token)
+
+        assert jwt.decode(token, chave.key, algorithms=["RS256"])["sub"] == "usuario"
+        mock_get.assert_called_once()
+        assert JwksCache.metricas()["chaves"] == 1
+
+    @pytest.mark.asyncio
+    async def test_obter_chave_kid_desconhecido_respeita_intervalo(
+        self, mock_get, chave_privada
+    ):
+        await JwksCache.obter_chave("kid-1")
+
+        with pytest.raises(jwt.InvalidTokenError):
+            await JwksCache.obter_chave_do_token(gerar_token(chave_privada, "kid-2"))
+
+        # a busca recente não é repetida para o kid desconhecido
+        mock_get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_obter_chave_concorrente_busca_uma_vez(self, mock_get):
+        chaves = await asyncio.gather(
+            *[JwksCache.obter_chave("kid-1") for _ in range(5)]
+        )
+
+        assert len({id(chave) for chave in chaves}) == 1
+        mock_get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_obter_chave_expirada_atualiza_em_segundo_plano(
+        self, mocker, mock_get
+    ):
+        chave = await JwksCache.obter_chave("kid-1")
+        mocker.patch("src.infrastructure.entraid_cache.JWKS_CACHE_TTL", -1)
+
+        # a chave atual é retornada sem aguardar a nova busca
+        assert await JwksCache.obter_chave("kid-1") is chave
+
+        await JwksCache._atualizacao
+
+        assert mock_get.call_count == 2
+
+
+class TestTokenValidadoCache:
+    def test_obter_token_armazenado(self):
+        claims = {"sub": "usuario", "exp": time.time() + 600}
+
+        TokenValidadoCache.armazenar("token", claims)
+        resultado = TokenValidadoCache.obter("token")
+        resultado["raw_token"] = "token"
+
+        assert resultado["sub"] == "usuario"
+        assert "raw_token" not in TokenValidadoCache.obter("token")
+        assert "token" not in str(list(TokenValidadoCache._itens))
+
+    def test_obter_token_expirado(self):
+        TokenValidadoCache.armazenar("token", {"exp": time.time() - 1})
+
+        assert TokenValidadoCache.obter("token") is None
+        assert TokenValidadoCache.metricas()["itens"] == 0
+
+    def test_armazenar_token_sem_exp(self):
+        TokenValidadoCache.armazenar("token", {"sub": "usuario"})
+
+        assert TokenValidadoCache.obter("token") is None
+
+    def test_armazenar_descarta_menos_utilizados(self, mocker):
+        mocker.patch(
+            "src.infrastructure.entraid_cache.TOKEN_VALIDADO_CACHE_MAX_ITENS", 1
+        )
+        exp = time.time() + 600
+
+        TokenValidadoCache.armazenar("token-1", {"exp": exp})
+        TokenValidadoCache.armazenar("token-2", {"exp": exp})
+
+        assert TokenValidadoCache.obter("token-1") is None
+        assert TokenValidadoCache.obter("token-2") is not None
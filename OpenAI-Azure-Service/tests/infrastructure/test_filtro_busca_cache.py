@@ -0,0 +1,104 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.infrastructure.cognitive_search.filtro_busca_cache import FiltroBuscaCache
+
+FILTRO = {"ano_inicial": 2020, "ano_final": None, "pergunta": "dispensa"}
+
+
+class TestFiltroBuscaCache:
+    def test_gerar_chave_normaliza_prompt(self):
+        chave = FiltroBuscaCache.gerar_chave("normas", "Qual a  norma\n de férias?")
+
+        assert chave == FiltroBuscaCache.gerar_chave("normas", "qual a norma de férias")
+        assert chave != FiltroBuscaCache.gerar_chave("juris", "qual a norma de férias")
+        assert chave != FiltroBuscaCache.gerar_chave(
+            "normas", "qual a norma de férias", contexto="01.01.2025"
+        )
+        assert chave.startswith("filtro_busca:normas:")
+
+    @pytest.mark.asyncio
+    async def test_obter_e_armazenar(self):
+        assert await FiltroBuscaCache.obter("normas", "prompt") is None
+
+        await FiltroBuscaCache.armazenar("normas", "prompt", FILTRO)
+        resp = await FiltroBuscaCache.obter("normas", "Prompt?")
+
+        assert resp == FILTRO
+
+        # o chamador pode alterar o filtro sem afetar o cache
+        resp["pergunta"] = "outra"
+
+        assert await FiltroBuscaCache.obter("normas", "prompt") == FILTRO
+
+        metricas = FiltroBuscaCache.metricas()["tipos"]["normas"]
+
+        assert metricas["hits_memoria"] == 2
+        assert metricas["misses"] == 1
+        assert metricas["taxa_acerto"] == round(2 / 3, 4)
+
+    @pytest.mark.asyncio
+    async def test_itens_expirados(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.filtro_busca_cache.FILTRO_BUSCA_CACHE_TTL",
+            -1,
+        )
+
+        await FiltroBuscaCache.armazenar("normas", "prompt", FILTRO)
+
+        assert await FiltroBuscaCache.obter("normas", "prompt") is None
+        assert FiltroBuscaCache.metricas()["itens"] == 0
+
+    @pytest.mark.asyncio
+    async def test_remove_itens_menos_usados_ao_exceder_limite(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.filtro_busca_cache.FILTRO_BUSCA_CACHE_MAX_ITENS",
+            2,
+        )
+
+        await FiltroBuscaCache.armazenar("normas", "a", FILTRO)
+        await FiltroBuscaCache.armazenar("normas", "b", FILTRO)
+        await FiltroBuscaCache.obter("normas", "a")
+        await FiltroBuscaCache.armazenar("normas", "c", FILTRO)
+
+        assert await FiltroBuscaCache.obter("normas", "a") == FILTRO
+        assert await FiltroBuscaCache.obter("normas", "b") is None
+        assert await FiltroBuscaCache.obter("normas", "c") == FILTRO
+
+    @pytest.mark.asyncio
+    async def test_obter_do_redis(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.filtro_busca_cache.FILTRO_BUSCA_CACHE_REDIS_ATIVO",
+            True,
+        )
+        redis = MagicMock()
+        mocker.patch.object(FiltroBuscaCache, "_get_redis", return_value=redis)
+
+        await FiltroBuscaCache.armazenar("normas", "prompt", FILTRO)
+        chave, valor = redis.set.call_args.args
+
+        FiltroBuscaCache.limpar()
+        redis.get.return_value = valor
+
+        assert await FiltroBuscaCache.obter("normas", "prompt") == FILTRO
+        assert json.loads(valor) == FILTRO
+        redis.get.assert_called_once_with(chave)
+        # promovido para o nível em memória
+        assert FiltroBuscaCache.metricas()["itens"] == 1
+        assert FiltroBuscaCache.metricas()["tipos"]["normas"]["hits_redis"] == 1
+
+    @pytest.mark.asyncio
+    async def test_obter_ignora_falha_no_redis(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.filtro_busca_cache.FILTRO_BUSCA_CACHE_REDIS_ATIVO",
+            True,
+        )
+        redis = MagicMock()
+        redis.get.side_effect = RedisError("indisponível")
+        mocker.patch.object(FiltroBuscaCache, "_get_redis", return_value=redis)
+
+        assert await FiltroBuscaCache.obter("normas", "prompt") is None
+        assert FiltroBuscaCache.metricas()["tipos"]["normas"]["erros_redis"] == 1
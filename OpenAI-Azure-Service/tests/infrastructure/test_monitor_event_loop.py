@@ -0,0 +1,73 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.domain.llm.callback.detector_chamada_sincrona import (
+    DetectorChamadaSincronaLLM,
+)
+from src.infrastructure.event_loop.monitor_event_loop import MonitorEventLoop
+
+
+@pytest.fixture(autouse=True)
+def limpar_metricas():
+    MonitorEventLoop.limpar()
+    yield
+    MonitorEventLoop.encerrar()
+    MonitorEventLoop.limpar()
+
+
+def test_iniciar_inativo():
+    MonitorEventLoop.iniciar()
+
+    assert MonitorEventLoop._vigilancia is None
+    assert MonitorEventLoop.metricas()["ativo"] is False
+
+
+@pytest.mark.asyncio
+async def test_detecta_bloqueio_do_event_loop(mocker):
+    mocker.patch(
+        "src.infrastructure.event_loop.monitor_event_loop.MONITOR_EVENT_LOOP_ATIVO",
+        True,
+    )
+    mocker.patch(
+        "src.infrastructure.event_loop.monitor_event_loop.MONITOR_EVENT_LOOP_LIMIAR_MS",
+        50,
+    )
+    logger = mocker.patch("src.infrastructure.event_loop.monitor_event_loop.logger")
+
+    MonitorEventLoop.iniciar()
+    await asyncio.sleep(0.05)
+
+    # código síncrono executado no loop
+    time.sleep(0.3)
+    await asyncio.sleep(0.05)
+
+    metricas = MonitorEventLoop.metricas()
+
+    assert metricas["bloqueios"] >= 1
+    assert metricas["maior_bloqueio_ms"] >= 200
+    # a pilha registrada pela thread de vigilância aponta o time.sleep
+    pilhas = [c.args[0] for c in logger.warning.call_args_list if "em:\n" in c.args[0]]
+    assert any("time.sleep(0.3)" in pilha for pilha in pilhas)
+
+
+@pytest.mark.asyncio
+async def test_detector_registra_chamada_sincrona_no_loop():
+    detector = DetectorChamadaSincronaLLM()
+
+    detector.on_chat_model_start({"name": "AzureChatOpenAI"}, [[MagicMock()]])
+
+    assert MonitorEventLoop.metricas()["chamadas_sincronas_llm"] == 1
+
+
+@pytest.mark.asyncio
+async def test_detector_ignora_callbacks_fora_do_loop():
+    detector = DetectorChamadaSincronaLLM()
+
+    # o langchain executa os callbacks síncronos das invocações assíncronas
+    # em uma thread do executor
+    await asyncio.to_thread(detector.on_llm_start, {"name": "AzureChatOpenAI"}, [])
+
+    assert MonitorEventLoop.metricas()["chamadas_sincronas_llm"] == 0
@@ -0,0 +1,79 @@
+import time
+
+import fitz
+import pytest
+
+from src.exceptions import ServiceException
+from src.infrastructure.parser_pool.parser_pool import ParserPool
+from src.infrastructure.parser_pool.parsers import (
+    contar_paginas_pdf,
+    extrair_paginas_pdf,
+)
+
+
+@pytest.fixture
+def pool():
+    ParserPool.iniciar()
+    yield ParserPool
+    ParserPool.encerrar()
+
+
+@pytest.fixture
+def caminho_pdf(tmp_path):
+    caminho = tmp_path / "documento.pdf"
+
+    with fitz.open() as pdf:
+        for i in range(3):
+            pdf.new_page().insert_text((72, 72), f"Página {i + 1}")
+        pdf.save(caminho)
+
+    return str(caminho)
+
+
+class TestParserPool:
+    @pytest.mark.asyncio
+    async def test_executar_sem_pool_utiliza_thread(self):
+        ParserPool.encerrar()
+
+        resultado = await ParserPool.executar(sum, [1, 2, 3])
+
+        assert resultado == 6
+        assert ParserPool.metricas()["ativo"] is False
+
+    @pytest.mark.asyncio
+    async def test_executar_extrai_paginas_no_pool(self, pool, caminho_pdf):
+        total = await pool.executar(contar_paginas_pdf, caminho_pdf)
+        pages = await pool.executar(
+            extrair_paginas_pdf, caminho_pdf, "documento.pdf", 1, 10
+        )
+
+        assert total == 3
+        assert [p.metadata["page"] for p in pages] == [2, 3]
+        assert "Página 2" in pages[0].page_content
+        assert pool.metricas()["ativo"] is True
+
+    @pytest.mark.asyncio
+    async def test_executar_timeout_reinicia_pool(self, pool):
+        reinicios = pool.metricas()["reinicios"]
+        timeouts = pool.metricas()["timeouts"]
+        pool_anterior = pool._pool
+
+        with pytest.raises(ServiceException):
+            await pool.executar(time.sleep, 5, timeout=0.5)
+
+        assert pool._pool is not pool_anterior
+        assert pool.metricas()["reinicios"] == reinicios + 1
+        assert pool.metricas()["timeouts"] == timeouts + 1
+        assert pool.metricas()["pendentes"] == 0
+
+        # o novo pool continua atendendo as próximas tarefas
+        assert await pool.executar(sum, [1, 2]) == 3
+
+    @pytest.mark.asyncio
+    async def test_executar_propaga_erro_do_parser(self, pool):
+        falhas = pool.metricas()["falhas"]
+
+        with pytest.raises(RuntimeError):
+            await pool.executar(contar_paginas_pdf, "/arquivo/inexistente.pdf")
+
+        assert pool.metricas()["falhas"] == falhas + 1
@@ -0,0 +1,72 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.infrastructure.cognitive_search.query_vector_memo import QueryVectorMemo
+
+
+class TestQueryVectorMemo:
+    @pytest.mark.asyncio
+    async def test_obter_reaproveita_vetor(self):
+        fn_gerar = AsyncMock(return_value=[0.1, 0.2])
+
+        assert await QueryVectorMemo.obter("chave", fn_gerar) == [0.1, 0.2]
+        assert await QueryVectorMemo.obter("chave", fn_gerar) == [0.1, 0.2]
+
+        fn_gerar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_obter_concorrente_compartilha_geracao(self):
+        chamadas = 0
+
+        async def fn_gerar():
+            nonlocal chamadas
+            chamadas += 1
+            await asyncio.sleep(0.05)
+            return [1.0]
+
+        compartilhados = QueryVectorMemo.metricas()["compartilhados"]
+
+        resultados = await asyncio.gather(
+            *[QueryVectorMemo.obter("chave", fn_gerar) for _ in range(5)]
+        )
+
+        assert resultados == [[1.0]] * 5
+        assert chamadas == 1
+        assert QueryVectorMemo.metricas()["compartilhados"] == compartilhados + 4
+        assert QueryVectorMemo.metricas()["em_andamento"] == 0
+
+    @pytest.mark.asyncio
+    async def test_obter_expira_apos_ttl(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.query_vector_memo.CONSULTA_VETOR_MEMO_TTL",
+            0,
+        )
+        fn_gerar = AsyncMock(return_value=[0.1])
+
+        await QueryVectorMemo.obter("chave", fn_gerar)
+        await QueryVectorMemo.obter("chave", fn_gerar)
+
+        assert fn_gerar.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_obter_nao_memoriza_erro(self):
+        fn_gerar = AsyncMock(side_effect=[RuntimeError("falha"), [0.3]])
+
+        with pytest.raises(RuntimeError):
+            await QueryVectorMemo.obter("chave", fn_gerar)
+
+        assert await QueryVectorMemo.obter("chave", fn_gerar) == [0.3]
+
+    @pytest.mark.asyncio
+    async def test_obter_descarta_menos_utilizados(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.query_vector_memo.CONSULTA_VETOR_MEMO_MAX_ITENS",
+            2,
+        )
+
+        for chave in ["a", "b", "a", "c"]:
+            await QueryVectorMemo.obter(chave, AsyncMock(return_value=[0.0]))
+
+        assert list(QueryVectorMemo._itens) == ["a", "c"]
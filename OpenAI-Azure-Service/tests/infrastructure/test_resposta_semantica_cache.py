@@ -0,0 +1,94 @@
+import pytest
+
+from src.infrastructure.cognitive_search.resposta_semantica_cache import (
+    RespostaSemanticaCache,
+)
+
+PARTICAO = RespostaSemanticaCache.gerar_particao("ADMINISTRATIVA", "gpt-4o", "inst")
+TRECHO = {"conteudo": "Serviço: descrição", "id_registro": "Serviço"}
+
+
+def armazenar(prompt, vetor, indice=None, particao=PARTICAO):
+    RespostaSemanticaCache.armazenar(
+        particao,
+        prompt,
+        vetor,
+        resposta=f"resposta para {prompt}",
+        trechos=[TRECHO],
+        arquivos_busca="Sistema CASA",
+        indice=indice,
+    )
+
+
+class TestRespostaSemanticaCache:
+    def test_gerar_particao(self):
+        assert PARTICAO.startswith("ADMINISTRATIVA:gpt-4o:")
+        assert PARTICAO != RespostaSemanticaCache.gerar_particao(
+            "ADMINISTRATIVA", "gpt-4o", "outras instruções"
+        )
+
+    def test_hit_exato_apos_normalizacao(self):
+        armazenar("Como solicitar férias?", [1.0, 0.0])
+
+        resultado = RespostaSemanticaCache.buscar(
+            PARTICAO, "como  solicitar FÉRIAS", [0.0, 1.0]
+        )
+
+        assert resultado == {
+            "resposta": "resposta para Como solicitar férias?",
+            "trechos": [TRECHO],
+            "arquivos_busca": "Sistema CASA",
+            "similaridade": 1.0,
+        }
+        assert RespostaSemanticaCache.metricas()["hits_exatos"] == 1
+
+    def test_hit_semantico_acima_do_limiar(self):
+        armazenar("como solicitar férias", [1.0, 0.0, 0.0])
+        armazenar("como solicitar um notebook", [0.0, 1.0, 0.0])
+
+        resultado = RespostaSemanticaCache.buscar(
+            PARTICAO, "quero pedir minhas férias", [0.99, 0.05, 0.0]
+        )
+
+        assert resultado["resposta"] == "resposta para como solicitar férias"
+        assert resultado["similaridade"] == pytest.approx(0.9987, abs=1e-4)
+        assert RespostaSemanticaCache.metricas()["hits_semanticos"] == 1
+
+    def test_miss_abaixo_do_limiar_ou_em_outra_particao(self):
+        armazenar("como solicitar férias", [1.0, 0.0])
+
+        assert RespostaSemanticaCache.buscar(PARTICAO, "outra", [0.7, 0.7]) is None
+        assert RespostaSemanticaCache.buscar("LLM:gpt:x", "outra", [1.0, 0.0]) is None
+        assert RespostaSemanticaCache.metricas()["misses"] == 2
+
+    def test_itens_expirados(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.resposta_semantica_cache.RESPOSTA_CACHE_TTL",
+            -1,
+        )
+        armazenar("férias", [1.0, 0.0])
+
+        assert RespostaSemanticaCache.buscar(PARTICAO, "férias", [1, 0]) is None
+        assert RespostaSemanticaCache.metricas()["itens"] == 0
+
+    def test_remove_itens_menos_usados_ao_exceder_limite(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.resposta_semantica_cache.RESPOSTA_CACHE_MAX_ITENS",
+            2,
+        )
+        armazenar("a", [1.0, 0.0, 0.0])
+        armazenar("b", [0.0, 1.0, 0.0])
+        RespostaSemanticaCache.buscar(PARTICAO, "a", [1.0, 0.0, 0.0])
+        armazenar("c", [0.0, 0.0, 1.0])
+
+        assert RespostaSemanticaCache.buscar(PARTICAO, "a", [1.0, 0.0, 0.0])
+        assert RespostaSemanticaCache.buscar(PARTICAO, "b", [0.0, 1.0, 0.0]) is None
+
+    def test_invalidar_por_indice(self):
+        armazenar("serviço", [1.0, 0.0], indice="sistema_casa")
+        armazenar("conhecimento geral", [0.0, 1.0])
+
+        assert RespostaSemanticaCache.invalidar("sistema_casa") == 1
+        assert RespostaSemanticaCache.buscar(PARTICAO, "serviço", [1, 0]) is None
+        assert RespostaSemanticaCache.buscar(PARTICAO, "conhecimento geral", [0, 1])
+        assert RespostaSemanticaCache.metricas()["invalidadas"] == 1
@@ -0,0 +1,51 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from azure.core.credentials import AzureKeyCredential
+
+from src.infrastructure.cognitive_search.search_client_pool import SearchClientPool
+
+
+class TestSearchClientPool:
+    @pytest.mark.asyncio
+    async def test_get_client_reutiliza_por_indice_e_credencial(self):
+        credencial = AzureKeyCredential("chave")
+
+        client_1 = SearchClientPool.get_client("https://busca", "indice", credencial)
+        client_2 = SearchClientPool.get_client(
+            "https://busca", "indice", AzureKeyCredential("chave")
+        )
+        client_outro_indice = SearchClientPool.get_client(
+            "https://busca", "outro", credencial
+        )
+        client_outra_chave = SearchClientPool.get_client(
+            "https://busca", "indice", AzureKeyCredential("outra")
+        )
+
+        assert client_1 is client_2
+        assert client_1 is not client_outro_indice
+        assert client_1 is not client_outra_chave
+        assert SearchClientPool.metricas()["clientes"] == 3
+        assert "chave" not in str(SearchClientPool._clientes.keys())
+
+        await SearchClientPool.fechar_conexoes()
+
+    @pytest.mark.asyncio
+    async def test_fechar_conexoes(self, mocker):
+        client = SearchClientPool.get_client(
+            "https://busca", "indice", AzureKeyCredential("chave")
+        )
+        mocker.patch.object(client, "close", new_callable=AsyncMock)
+
+        await SearchClientPool.fechar_conexoes()
+
+        client.close.assert_awaited_once()
+        assert SearchClientPool.metricas()["clientes"] == 0
+        assert (
+            SearchClientPool.get_client(
+                "https://busca", "indice", AzureKeyCredential("chave")
+            )
+            is not client
+        )
+
+        await SearchClientPool.fechar_conexoes()
@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.infrastructure.write_behind.write_behind_queue import WriteBehindQueue
+
+MODULO = "src.infrastructure.write_behind.write_behind_queue"
+
+gravados = []
+elastic = {"disponivel": True, "latencia": 0}
+
+
+async def gravar(valor):
+    await asyncio.sleep(elastic["latencia"])
+
+    if not elastic["disponivel"]:
+        raise RuntimeError("elastic indisponível")
+
+    gravados.append(valor)
+
+
+@pytest.fixture(autouse=True)
+def arquivo(mocker, tmp_path):
+    caminho = tmp_path / "write_behind.pkl"
+    mocker.patch(f"{MODULO}.WRITE_BEHIND_ARQUIVO", str(caminho))
+    mocker.patch(f"{MODULO}.WRITE_BEHIND_TENTATIVAS", 1)
+    gravados.clear()
+    elastic.update(disponivel=True, latencia=0)
+
+    return caminho
+
+
+class TestWriteBehindQueue:
+    @pytest.mark.asyncio
+    async def test_enfileirar_sem_iniciar_executa_no_request(self):
+        funcao = AsyncMock()
+
+        await WriteBehindQueue.enfileirar(funcao, "chat", [])
+
+        funcao.assert_awaited_once_with("chat", [])
+
+    @pytest.mark.asyncio
+    async def test_enfileirar_nao_aguarda_a_gravacao(self):
+        liberar = asyncio.Event()
+
+        async def gravar_lento(valor):
+            await liberar.wait()
+            gravados.append(valor)
+
+        await WriteBehindQueue.iniciar()
+
+        await WriteBehindQueue.enfileirar(gravar_lento, 1)
+
+        assert gravados == []
+        assert WriteBehindQueue.metricas()["ativo"]
+
+        liberar.set()
+        await WriteBehindQueue.encerrar()
+
+        assert gravados == [1]
+        assert not WriteBehindQueue.metricas()["ativo"]
+
+    @pytest.mark.asyncio
+    async def test_falha_grava_em_disco_e_reprocessa_no_startup(self, arquivo):
+        elastic["disponivel"] = False
+
+        await WriteBehindQueue.iniciar()
+        await WriteBehindQueue.enfileirar(gravar, 1)
+        await WriteBehindQueue.encerrar()
+
+        assert arquivo.exists()
+        assert WriteBehindQueue.metricas()["falhas"] >= 1
+
+        # no novo startup, a tarefa lida do disco é executada novamente
+        elastic["disponivel"] = True
+
+        await WriteBehindQueue.iniciar()
+        await WriteBehindQueue.encerrar()
+
+        assert gravados == [1]
+        assert not arquivo.exists()
+
+    @pytest.mark.asyncio
+    async def test_encerrar_grava_pendentes_apos_timeout(self, mocker, arquivo):
+        mocker.patch(f"{MODULO}.WRITE_BEHIND_TIMEOUT_ENCERRAMENTO", 0)
+        mocker.patch(f"{MODULO}.WRITE_BEHIND_WORKERS", 1)
+        elastic["latencia"] = 10
+
+        await WriteBehindQueue.iniciar()
+        await WriteBehindQueue.enfileirar(gravar, 1)
+        await WriteBehindQueue.enfileirar(gravar, 2)
+        await WriteBehindQueue.encerrar()
+
+        # a tarefa em execução e a que aguardava na fila vão para o disco
+        assert gravados == []
+        assert arquivo.exists()
+
+        elastic["latencia"] = 0
+
+        await WriteBehindQueue.iniciar()
+        await WriteBehindQueue.encerrar()
+
+        assert sorted(gravados) == [1, 2]
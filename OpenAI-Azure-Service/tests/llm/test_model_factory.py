@@ -1,7 +1,10 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.domain.llm.callback.detector_chamada_sincrona import (
+    DetectorChamadaSincronaLLM,
+)
 from src.domain.llm.model_factory import ModelFactory
 from src.exceptions import ServiceException
 from src.infrastructure.env import GEMINI_API_KEY, MODELO_PADRAO, MODELOS
@@ -172,3 +175,21 @@ class TestModelFactory:
             disable_streaming=True,
             callbacks=None,
         )
+
+    @patch("src.domain.llm.model_factory.MONITOR_EVENT_LOOP_ATIVO", True)
+    @patch("src.domain.llm.model_factory.ChatGoogleGenerativeAI")
+    def test_deve_incluir_detector_de_chamadas_sincronas(
+        self, mock_chat_google_genai, decoded_token
+    ):
+        callback = MagicMock()
+
+        ModelFactory.get_model(
+            model=MODELOS["GEMINI-1.5-Pro"],
+            token=decoded_token,
+            callbacks=[callback],
+        )
+
+        callbacks = mock_chat_google_genai.call_args.kwargs["callbacks"]
+
+        assert callbacks[0] is callback
+        assert isinstance(callbacks[1], DetectorChamadaSincronaLLM)
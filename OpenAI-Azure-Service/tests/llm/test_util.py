@@ -0,0 +1,65 @@
+import random
+import re
+
+from src.domain.llm.util.util import LocalizadorCitacoes, filtrar_trechos_utilizados
+from src.domain.trecho import Trecho
+
+
+def criar_trechos():
+    return [
+        Trecho(conteudo="a", id_registro="Arquivo relatorio.pdf"),
+        Trecho(conteudo="b", id_registro="AC-1234/2023"),
+        Trecho(conteudo="c", id_registro="AC-99/2020"),
+        Trecho(conteudo="d", id_registro=None),
+    ]
+
+
+def filtrar_por_regex(trechos, texto):
+    # implementação anterior, aplicada ao texto completo
+    encontrados = re.findall(r"\[([^]]+)\]", texto)
+
+    return [
+        trecho
+        for i, trecho in enumerate(trechos)
+        if trecho.id_registro in encontrados
+        or (trecho.id_registro or "").replace("Arquivo ", "") in encontrados
+        or f"^{i+1}^" in encontrados
+        or f"^{i+1}" in encontrados
+        or f"{i+1}" in encontrados
+    ]
+
+
+class TestLocalizadorCitacoes:
+    def test_filtrar_trechos_utilizados_formatos_de_referencia(self):
+        trechos = criar_trechos()
+
+        assert filtrar_trechos_utilizados(trechos, "[relatorio.pdf]") == [trechos[0]]
+        assert filtrar_trechos_utilizados(trechos, "[AC-1234/2023]") == [trechos[1]]
+        assert filtrar_trechos_utilizados(trechos, "[^3^] [^4]") == trechos[2:]
+        assert filtrar_trechos_utilizados(trechos, "[2] [] [5]") == [trechos[1]]
+
+    def test_adicionar_citacao_dividida_entre_tokens(self):
+        trechos = criar_trechos()
+        localizador = LocalizadorCitacoes(trechos)
+
+        assert localizador.adicionar("Conforme [AC-12") == []
+        assert localizador.adicionar("34/20") == []
+        assert localizador.adicionar("23] e [^") == [trechos[1]]
+        assert localizador.adicionar("1^].") == trechos[:2]
+
+    def test_adicionar_equivale_a_regex_no_texto_acumulado(self):
+        trechos = criar_trechos()
+        fragmentos = ["[", "]", "^", "1", "2", "3", "4", "AC-99/2020", " ", "x"]
+        aleatorio = random.Random(42)
+
+        for _ in range(200):
+            texto = "".join(aleatorio.choices(fragmentos, k=40))
+            localizador = LocalizadorCitacoes(trechos)
+            posicao = 0
+
+            while posicao < len(texto):
+                tamanho = aleatorio.randint(1, 5)
+                resultado = localizador.adicionar(texto[posicao : posicao + tamanho])
+                posicao += tamanho
+
+                assert resultado == filtrar_por_regex(trechos, texto[:posicao])
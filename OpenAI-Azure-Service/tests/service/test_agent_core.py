@@ -10,7 +10,11 @@ from starlette.responses import StreamingResponse
 from src.domain.agent import Agent
 from src.domain.agent_core import AgentCore
 from src.domain.schemas import ChatGptInput, ChatLLMResponse
-from src.infrastructure.env import VERBOSE
+from src.domain.trecho import Trecho, trecho_para_dict
+from src.infrastructure.cognitive_search.resposta_semantica_cache import (
+    RespostaSemanticaCache,
+)
+from src.infrastructure.env import PROTOCOLO_STREAM_DELTA, VERBOSE
 from src.infrastructure.security_tokens import DecodedToken
 from tests.util.mock_objects import MockObjects
 
@@ -126,6 +130,9 @@ class TestAgentCore:
             "langchain.schema.runnable.RunnableSequence.ainvoke",
             new_callable=AsyncMock,
             return_value=json.dumps({"pergunta": "result"}),
+        ), patch(
+            "src.domain.llm.retriever.busca_especulativa.BUSCA_ESPECULATIVA_ATIVA",
+            False,
         ):
             await agent_core._prepara_prompt_documentos()
 
@@ -134,6 +141,68 @@ class TestAgentCore:
         )
         agent_core._create_mensagem.assert_called_once()
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "filtro_extraido, paginas_esperadas, buscas",
+        [
+            ({"pagina_inicial": None, "pagina_final": None}, [1, 2], 1),
+            ({"pagina_inicial": 2, "pagina_final": 3}, [2, 3], 1),
+            ({"pagina_inicial": 7, "pagina_final": None}, [], 2),
+        ],
+    )
+    async def test_prepara_prompt_documentos_busca_especulativa(
+        self, mock_dependencies, filtro_extraido, paginas_esperadas, buscas
+    ):
+        chatinput, agent, app_origem, token = mock_dependencies
+        chatinput.arquivos_selecionados_prontos = ["doc1"]
+        chatinput.top_documentos = 2
+        agent_core = AgentCore(
+            chat_id="chat_id",
+            chatinput=chatinput,
+            agent=agent,
+            app_origem=app_origem,
+            token=token,
+        )
+
+        trechos = [
+            Trecho(
+                pagina_arquivo=pagina,
+                conteudo=f"conteudo {pagina}",
+                search_score=1.0,
+                id_registro=f"doc1 - página {pagina}",
+            )
+            for pagina in [1, 2, 3]
+        ]
+
+        agent_core._get_llm = MagicMock(return_value=MagicMock(spec=BaseLLM))
+        agent_core._buscar_docs_relevantes = AsyncMock(
+            side_effect=[
+                {"content": "especulativo", "trechos": trechos},
+                {"content": "refeita", "trechos": []},
+            ]
+        )
+        agent_core._create_mensagem = MagicMock()
+
+        with patch(
+            "langchain.schema.runnable.RunnableSequence.ainvoke",
+            new_callable=AsyncMock,
+            return_value=json.dumps({"pergunta": "result", **filtro_extraido}),
+        ):
+            await agent_core._prepara_prompt_documentos()
+
+        chamadas = agent_core._buscar_docs_relevantes.call_args_list
+
+        assert len(chamadas) == buscas
+        # a busca especulativa usa o prompt original e mais trechos
+        assert chamadas[0].args[1]["pergunta"] == chatinput.prompt_usuario
+        assert chamadas[0].kwargs["top_documentos"] == 6
+        assert [t.pagina_arquivo for t in agent_core.msg.trechos] == (
+            paginas_esperadas
+        )
+
+        if buscas == 2:
+            assert chamadas[1].args[1]["pagina_inicial"] == 7
+
     @pytest.mark.asyncio
     async def test_buscar_docs_relevantes(self):
         chatinput = ChatGptInput(
@@ -263,6 +332,115 @@ class TestAgentCore:
                         "\n"
                     ]
 
+    @pytest.mark.asyncio
+    async def test_get_response_by_streaming_protocolo_delta(self, mock_dependencies):
+        chatinput, agent, app_origem, token = mock_dependencies
+        trecho = MockObjects.mock_mensagem.trechos[0]
+        msg2 = MagicMock(codigo="codigo_resposta", trechos=[])
+
+        class CallbackComTrechos(MockCallbackHandler):
+            async def aiter(self):
+                yield "Olá"
+                # o callback identifica a citação durante o stream
+                msg2.trechos = [trecho]
+                yield " mundo"
+                yield "!"
+
+        agent_core = AgentCore(
+            chat_id="test_chat_id",
+            chatinput=chatinput,
+            agent=agent,
+            app_origem=app_origem,
+            token=token,
+            protocolo_stream=PROTOCOLO_STREAM_DELTA,
+        )
+        agent_core.historico = []
+        agent_core.prompt = MagicMock()
+        agent_core.callback = CallbackComTrechos()
+        agent_core.msg1 = MockObjects.mock_mensagem
+        agent_core.msg2 = msg2
+        agent_core.msg = MagicMock(arquivos_busca="Sistema CASA")
+
+        with patch.object(AgentCore, "_get_llm"), patch.object(
+            AgentCore, "_get_task_llm", return_value=MockTask(AsyncMock()())
+        ):
+            eventos = [
+                json.loads(evento)
+                async for evento in agent_core._get_response_by_streaming(
+                    agent_core.chatinput, "test_title"
+                )
+            ]
+
+        assert [evento["tipo"] for evento in eventos] == [
+            "inicio",
+            "token",
+            "token",
+            "trechos",
+            "fim",
+        ]
+        assert eventos[0] == {
+            "tipo": "inicio",
+            "versao": PROTOCOLO_STREAM_DELTA,
+            "chat_id": "test_chat_id",
+            "chat_titulo": "test_title",
+            "codigo_prompt": "teste_codigo",
+            "codigo_response": "codigo_resposta",
+            "arquivos_busca": "Sistema CASA",
+        }
+        # o primeiro token é enviado sozinho; os seguintes são agrupados
+        assert [e["response"] for e in eventos if e["tipo"] == "token"] == [
+            "Olá",
+            " mundo!",
+        ]
+        assert all("trechos" not in e for e in eventos if e["tipo"] == "token")
+        assert eventos[3]["trechos"] == [trecho_para_dict(trecho)]
+        assert eventos[-1] == {
+            "tipo": "fim",
+            "codigo_response": "codigo_resposta",
+            "quantidade_chunks": 2,
+            "quantidade_trechos": 1,
+            "arquivos_busca": "Sistema CASA",
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_response_by_streaming_protocolo_delta_erro(
+        self, mock_dependencies
+    ):
+        chatinput, agent, app_origem, token = mock_dependencies
+
+        agent_core = AgentCore(
+            chat_id="test_chat_id",
+            chatinput=chatinput,
+            agent=agent,
+            app_origem=app_origem,
+            token=token,
+            protocolo_stream=PROTOCOLO_STREAM_DELTA,
+        )
+        agent_core.historico = []
+        agent_core.prompt = MagicMock()
+        agent_core.callback = MockCallbackHandler()
+        agent_core.msg1 = MockObjects.mock_mensagem
+        agent_core.msg2 = MockObjects.mock_mensagem
+        agent_core.msg = MockObjects.mock_mensagem
+
+        with patch.object(AgentCore, "_get_llm"), patch.object(
+            AgentCore,
+            "_get_task_llm",
+            return_value=MockTask(AsyncMock(side_effect=Exception("falha"))()),
+        ):
+            eventos = [
+                json.loads(evento)
+                async for evento in agent_core._get_response_by_streaming(
+                    agent_core.chatinput, "test_title"
+                )
+            ]
+
+        assert eventos[-1] == {
+            "tipo": "erro",
+            "status": 0,
+            "message": "Erro durante a transmissão: falha",
+        }
+
     @pytest.mark.asyncio
     async def test_executar_prompt(self, mock_dependencies):
         chatinput, agent, app_origem, token = mock_dependencies
@@ -486,3 +664,94 @@ class TestAgentCore:
         await agent_core._prepara_prompt_tool_especifica()
 
         assert agent_core.agent.msg_sistema == "Source: Test outputComplemento Casa"
+
+    @pytest.mark.asyncio
+    @patch("src.domain.agent_core.RESPOSTA_CACHE_ATIVO", True)
+    @patch("src.domain.agent_core.CognitiveSearch.obter_vetor", new_callable=AsyncMock)
+    async def test_executar_prompt_resposta_em_cache(
+        self, mock_obter_vetor, mock_dependencies
+    ):
+        chatinput, agent, app_origem, token = mock_dependencies
+        chatinput.stream = False
+        chatinput.tool_selecionada = "ADMINISTRATIVA"
+        agent_core = AgentCore(
+            chat_id=None,
+            chatinput=chatinput,
+            agent=agent,
+            app_origem=app_origem,
+            token=token,
+        )
+        agent_core.modelo = {"deployment_name": "gpt-4o"}
+        mock_obter_vetor.return_value = [1.0, 0.0]
+        trecho = Trecho(id_registro="Serviço", conteudo="descrição")
+
+        RespostaSemanticaCache.armazenar(
+            RespostaSemanticaCache.gerar_particao("ADMINISTRATIVA", "gpt-4o", ""),
+            "Como solicitar férias?",
+            [0.99, 0.05],
+            resposta="Resposta em cache",
+            trechos=[trecho_para_dict(trecho)],
+            arquivos_busca="Sistema CASA",
+        )
+
+        agent_core._define_model = AsyncMock()
+        agent_core._criar_novo_chat_com_input = AsyncMock(
+            return_value=("new_chat_id", "new_title")
+        )
+        agent_core._prepara_prompt = AsyncMock()
+        agent_core._create_mensagem = MagicMock(return_value=MagicMock())
+        agent_core._acoes_ao_preparar_prompt = MagicMock()
+        agent_core.msg1 = MagicMock(codigo="codigo_prompt")
+        agent_core.msg2 = MagicMock(codigo="codigo_response")
+        agent_core._registrar_mensagens = AsyncMock()
+
+        with patch(
+            "src.domain.agent_core.WriteBehindQueue.enfileirar", new_callable=AsyncMock
+        ) as mock_enfileirar:
+            response = await agent_core.executar_prompt()
+
+        agent_core._prepara_prompt.assert_not_called()
+        agent_core._registrar_mensagens.assert_called_once_with(
+            chat_id="new_chat_id", chatinput=chatinput
+        )
+        mock_enfileirar.assert_called_once()
+        assert response.response == "Resposta em cache"
+        assert response.trechos[0].id_registro == "Serviço"
+        assert response.arquivos_busca == "Sistema CASA"
+
+    @pytest.mark.asyncio
+    @patch("src.domain.agent_core.RESPOSTA_CACHE_ATIVO", True)
+    @patch("src.domain.agent_core.CognitiveSearch.obter_vetor", new_callable=AsyncMock)
+    async def test_buscar_resposta_em_cache_armazena_resposta_gerada(
+        self, mock_obter_vetor, mock_dependencies
+    ):
+        chatinput, agent, app_origem, token = mock_dependencies
+        chatinput.tool_selecionada = "CONHECIMENTOGERAL"
+        agent_core = AgentCore(
+            chat_id=None,
+            chatinput=chatinput,
+            agent=agent,
+            app_origem=app_origem,
+            token=token,
+        )
+        agent_core.modelo = {"deployment_name": "gpt-4o"}
+        agent_core.msg = MagicMock(trechos=[], arquivos_busca=None)
+        mock_obter_vetor.return_value = [1.0, 0.0]
+
+        assert await agent_core._buscar_resposta_em_cache() is None
+
+        agent_core._armazenar_resposta_em_cache("Resposta gerada")
+
+        assert await agent_core._buscar_resposta_em_cache() == {
+            "resposta": "Resposta gerada",
+            "trechos": [],
+            "arquivos_busca": None,
+            "similaridade": 1.0,
+        }
+
+        # perguntas com histórico não são reaproveitadas
+        agent_core.historico = [("pergunta", "resposta")]
+        agent_core.resposta_em_cache = None
+
+        assert await agent_core._buscar_resposta_em_cache() is None
+        assert mock_obter_vetor.call_count == 2
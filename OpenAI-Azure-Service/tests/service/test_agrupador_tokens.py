@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.domain.llm.callback.agrupador_tokens import AgrupadorTokens
+
+
+async def gerar_tokens(tokens, intervalo=0.0):
+    for token in tokens:
+        if intervalo:
+            await asyncio.sleep(intervalo)
+
+        yield token
+
+
+async def coletar(agrupador, tokens):
+    return [frame async for frame in agrupador.agrupar(tokens)]
+
+
+@pytest.fixture(autouse=True)
+def limpar_metricas():
+    AgrupadorTokens.limpar()
+    yield
+    AgrupadorTokens.limpar()
+
+
+@pytest.mark.asyncio
+async def test_primeiro_token_enviado_imediatamente():
+    agrupador = AgrupadorTokens(intervalo_ms=10_000, limite_bytes=10_000)
+    frames = agrupador.agrupar(gerar_tokens(["a", "b", "c"]))
+
+    assert await asyncio.wait_for(frames.__anext__(), timeout=1) == "a"
+    assert await frames.__anext__() == "bc"
+
+    with pytest.raises(StopAsyncIteration):
+        await frames.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_descarga_por_tamanho():
+    agrupador = AgrupadorTokens(intervalo_ms=10_000, limite_bytes=4)
+
+    frames = await coletar(agrupador, gerar_tokens(["x", "ab", "cd", "ef", "g"]))
+
+    assert frames == ["x", "abcd", "efg"]
+    assert agrupador.frames == 3
+    assert AgrupadorTokens.metricas()["descargas_por_tamanho"] == 1
+
+
+@pytest.mark.asyncio
+async def test_descarga_por_tempo():
+    agrupador = AgrupadorTokens(intervalo_ms=20, limite_bytes=10_000)
+
+    async def tokens_lentos():
+        yield "a"
+        yield "b"
+        yield "c"
+        # pausa maior que o intervalo: "bc" é enviado sem aguardar o "d"
+        await asyncio.sleep(0.2)
+        yield "d"
+
+    frames = await coletar(agrupador, tokens_lentos())
+
+    assert frames == ["a", "bc", "d"]
+    assert AgrupadorTokens.metricas()["descargas_por_tempo"] == 1
+
+
+@pytest.mark.asyncio
+async def test_desativado_repassa_cada_token():
+    agrupador = AgrupadorTokens(intervalo_ms=0, limite_bytes=0)
+
+    frames = await coletar(agrupador, gerar_tokens(["a", "b", "c"]))
+
+    assert frames == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_erro_na_origem_entrega_o_texto_acumulado():
+    agrupador = AgrupadorTokens(intervalo_ms=10_000, limite_bytes=10_000)
+
+    async def tokens_com_erro():
+        yield "a"
+        yield "b"
+        raise ValueError("falha")
+
+    frames = []
+
+    with pytest.raises(ValueError):
+        async for frame in agrupador.agrupar(tokens_com_erro()):
+            frames.append(frame)
+
+    assert frames == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_metricas():
+    await coletar(
+        AgrupadorTokens(intervalo_ms=10_000, limite_bytes=10_000),
+        gerar_tokens(["a", "b", "c", "d"]),
+    )
+    await coletar(
+        AgrupadorTokens(intervalo_ms=10_000, limite_bytes=10_000),
+        gerar_tokens(["e", "f"]),
+    )
+
+    metricas = AgrupadorTokens.metricas()
+
+    assert metricas["respostas"] == 2
+    assert metricas["tokens"] == 6
+    assert metricas["frames"] == 4
+    assert metricas["frames_por_resposta"] == 2
+    assert metricas["tokens_por_frame"] == 1.5
+    assert metricas["descargas"] == 2
+    assert metricas["latencia_descarga_media_ms"] >= 0
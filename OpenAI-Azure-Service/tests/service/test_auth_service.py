@@ -1,6 +1,7 @@
 import base64
 import json
 import logging
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import jwt
@@ -34,7 +35,10 @@ class TestAuthService:
             "src.service.auth_service.verify_decode_siga_token",
             return_value=MagicMock(login="test_login"),
         ) as mock_siga:
-            with patch("jwt.PyJWKClient.get_signing_key_from_jwt") as mock_jwks:
+            with patch(
+                "src.service.auth_service.JwksCache.obter_chave_do_token",
+                new_callable=AsyncMock,
+            ) as mock_jwks:
                 mock_jwks.return_value = MagicMock(key="testkey")
                 with patch(
                     "jwt.decode",
@@ -58,6 +62,35 @@ class TestAuthService:
                     mock_decode.assert_called_once()
                     mock_siga.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_verify_decode_entraid_token_reutiliza_token_validado(self):
+        with patch(
+            "src.service.auth_service.JwksCache.obter_chave_do_token",
+            new_callable=AsyncMock,
+        ) as mock_jwks:
+            mock_jwks.return_value = MagicMock(key="testkey")
+            with patch(
+                "jwt.decode",
+                return_value={
+                    "azpacr": AuthMethod.BrowserOrTeams,
+                    "siga_culs": "teste",
+                    "siga_nuls": "value2",
+                    "siga_clot": "value3",
+                    "siga_slot": "value4",
+                    "siga_lot": "value5",
+                    "siga_luls": "test_login",
+                    "aud": "testeaud",
+                    "azp": "test",
+                    "exp": time.time() + 600,
+                },
+            ) as mock_decode:
+                primeiro = await verify_decode_entraid_token("fake_token", None, None)
+                segundo = await verify_decode_entraid_token("fake_token", None, None)
+
+                assert primeiro == segundo
+                mock_decode.assert_called_once()
+                mock_jwks.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_verify_decode_entraid_token_invalid(self):
         with patch("jwt.decode", side_effect=jwt.DecodeError("Not enough segments")):
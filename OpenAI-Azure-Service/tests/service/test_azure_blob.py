@@ -2,8 +2,13 @@ from io import BytesIO
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import StorageErrorCode
 
 from src.infrastructure.azure_blob.azure_blob import AzureBlob
+from src.infrastructure.azure_blob.blob_client_pool import BlobClientPool
+from tests.util.mock_objects import AsyncIterator
 
 
 class TestAzureBlob:
@@ -35,10 +40,15 @@ class TestAzureBlob:
             )
             mock_container_client.exists.assert_awaited_once()
             mock_container_client.close.assert_awaited_once()
-            mock_blob_service_client.close.assert_awaited_once()
+            # o cliente do serviço é compartilhado pelo processo
+            mock_blob_service_client.close.assert_not_awaited()
 
             assert result is True
 
+            # a existência confirmada fica em cache
+            assert await azure_blob.verifica_existencia_container("Test_Container")
+            mock_container_client.exists.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_verifica_existencia_container_nao_existe(self, azure_blob):
         with patch(
@@ -62,10 +72,14 @@ class TestAzureBlob:
             )
             mock_container_client.exists.assert_awaited_once()
             mock_container_client.close.assert_awaited_once()
-            mock_blob_service_client.close.assert_awaited_once()
+            mock_blob_service_client.close.assert_not_awaited()
 
             assert result is False
 
+            # a inexistência não fica em cache
+            await azure_blob.verifica_existencia_container("test_container")
+            assert mock_container_client.exists.await_count == 2
+
     @pytest.mark.asyncio
     async def test_verifica_existencia_arquivo_container(self, azure_blob):
         with patch(
@@ -73,15 +87,9 @@ class TestAzureBlob:
             return_value=MagicMock(),
         ) as mock_get_client:
             mock_blob_service_client = mock_get_client.return_value
-            mock_container_client = (
-                mock_blob_service_client.get_container_client.return_value
-            )
-            mock_blob_client = mock_container_client.get_blob_client.return_value
+            mock_blob_client = mock_blob_service_client.get_blob_client.return_value
 
-            mock_container_client.exists = AsyncMock(return_value=True)
             mock_blob_client.exists = AsyncMock(return_value=True)
-            mock_container_client.close = AsyncMock()
-            mock_blob_service_client.close = AsyncMock()
             mock_blob_client.close = AsyncMock()
 
             result = await azure_blob.verifica_existencia_arquivo_container(
@@ -89,7 +97,12 @@ class TestAzureBlob:
             )
 
             assert result is True
+            mock_blob_service_client.get_blob_client.assert_called_once_with(
+                container="test_container", blob="test_file"
+            )
             mock_blob_client.exists.assert_called_once()
+            # sem a consulta prévia do container
+            mock_blob_service_client.get_container_client.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_cria_container(self, azure_blob):
@@ -117,15 +130,38 @@ class TestAzureBlob:
             return_value=MagicMock(),
         ) as mock_get_client:
             mock_blob_service_client = mock_get_client.return_value
-            mock_container_client = (
-                mock_blob_service_client.get_container_client.return_value
+            mock_blob_client = mock_blob_service_client.get_blob_client.return_value
+
+            mock_blob_client.upload_blob = AsyncMock()
+            mock_blob_client.close = AsyncMock()
+
+            data = BytesIO(b"test data")
+            result = await azure_blob.upload_blob(
+                container_name="test_container", filename="test_file", data=data
             )
-            mock_blob_client = mock_container_client.get_blob_client.return_value
 
-            mock_container_client.exists = AsyncMock(return_value=False)
-            mock_container_client.upload_blob = AsyncMock(return_value=AsyncMock())
-            mock_container_client.close = AsyncMock()
-            mock_blob_service_client.close = AsyncMock()
+            assert result is None
+            # uma única requisição condicional (If-None-Match: *)
+            mock_blob_client.upload_blob.assert_awaited_once_with(
+                data,
+                overwrite=False,
+                etag="*",
+                match_condition=MatchConditions.IfMissing,
+            )
+            mock_blob_service_client.get_container_client.assert_not_called()
+            mock_blob_client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_upload_blob_arquivo_existente(self, azure_blob):
+        with patch(
+            "src.infrastructure.azure_blob.azure_blob.AzureBlob._AzureBlob__get_blob_service_client",
+            return_value=MagicMock(),
+        ) as mock_get_client:
+            mock_blob_client = mock_get_client.return_value.get_blob_client.return_value
+
+            mock_blob_client.upload_blob = AsyncMock(
+                side_effect=ResourceExistsError("BlobAlreadyExists")
+            )
             mock_blob_client.close = AsyncMock()
 
             result = await azure_blob.upload_blob(
@@ -135,7 +171,38 @@ class TestAzureBlob:
             )
 
             assert result is None
-            mock_container_client.upload_blob.assert_called_once()
+            mock_blob_client.upload_blob.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_upload_blob_cria_container_inexistente(self, azure_blob):
+        with patch(
+            "src.infrastructure.azure_blob.azure_blob.AzureBlob._AzureBlob__get_blob_service_client",
+            return_value=MagicMock(),
+        ) as mock_get_client:
+            mock_blob_service_client = mock_get_client.return_value
+            mock_blob_client = mock_blob_service_client.get_blob_client.return_value
+            mock_container_client = (
+                mock_blob_service_client.get_container_client.return_value
+            )
+
+            erro = ResourceNotFoundError("ContainerNotFound")
+            erro.error_code = StorageErrorCode.CONTAINER_NOT_FOUND
+            mock_blob_client.upload_blob = AsyncMock(side_effect=[erro, None])
+            mock_blob_client.close = AsyncMock()
+            mock_container_client.create_container = AsyncMock()
+            mock_container_client.close = AsyncMock()
+
+            data = BytesIO(b"test data")
+            data.read()
+
+            await azure_blob.upload_blob(
+                container_name="Test_Container", filename="test_file", data=data
+            )
+
+            mock_container_client.create_container.assert_awaited_once()
+            assert mock_blob_client.upload_blob.await_count == 2
+            assert data.tell() == 0
+            assert BlobClientPool.container_existe("test_container")
 
     @pytest.mark.asyncio
     async def test_recupera_blobs(self, azure_blob):
@@ -191,6 +258,84 @@ class TestAzureBlob:
                 assert result == b"data"
                 mock_blob_client.download_blob.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_download_blob_inexistente(self, azure_blob):
+        with patch(
+            "src.infrastructure.azure_blob.azure_blob.AzureBlob._AzureBlob__get_blob_service_client",
+            return_value=MagicMock(),
+        ) as mock_get_client:
+            mock_blob_client = mock_get_client.return_value.get_blob_client.return_value
+            mock_blob_client.download_blob = AsyncMock(
+                side_effect=ResourceNotFoundError("BlobNotFound")
+            )
+            mock_blob_client.close = AsyncMock()
+
+            with pytest.raises(Exception) as exc_info:
+                await azure_blob.download_blob(
+                    container_name="test_container", filename="test_file"
+                )
+
+            assert (
+                str(exc_info.value)
+                == "O arquivo desejado não encontra-se no repositório"
+            )
+            mock_blob_client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_download_blob_em_partes(self, azure_blob):
+        with patch(
+            "src.infrastructure.azure_blob.azure_blob.AzureBlob._AzureBlob__get_blob_service_client",
+            return_value=MagicMock(),
+        ) as mock_get_client:
+            mock_blob_client = mock_get_client.return_value.get_blob_client.return_value
+            mock_downloader = MagicMock()
+            mock_downloader.chunks.return_value = AsyncIterator([b"parte1", b"parte2"])
+            mock_blob_client.download_blob = AsyncMock(return_value=mock_downloader)
+            mock_blob_client.close = AsyncMock()
+
+            downloader, partes = await azure_blob.download_blob_em_partes(
+                container_name="Test_Container",
+                filename="test_file",
+                offset=10,
+                length=20,
+            )
+
+            mock_get_client.return_value.get_blob_client.assert_called_once_with(
+                container="test_container", blob="test_file"
+            )
+            mock_blob_client.download_blob.assert_awaited_once_with(
+                offset=10, length=20
+            )
+            assert downloader is mock_downloader
+            # o cliente do blob permanece aberto até o fim da leitura das partes
+            mock_blob_client.close.assert_not_awaited()
+
+            assert [parte async for parte in partes] == [b"parte1", b"parte2"]
+            mock_blob_client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_download_blob_em_partes_inexistente(self, azure_blob):
+        with patch(
+            "src.infrastructure.azure_blob.azure_blob.AzureBlob._AzureBlob__get_blob_service_client",
+            return_value=MagicMock(),
+        ) as mock_get_client:
+            mock_blob_client = mock_get_client.return_value.get_blob_client.return_value
+            mock_blob_client.download_blob = AsyncMock(
+                side_effect=ResourceNotFoundError("BlobNotFound")
+            )
+            mock_blob_client.close = AsyncMock()
+
+            with pytest.raises(Exception) as exc_info:
+                await azure_blob.download_blob_em_partes(
+                    container_name="test_container", filename="test_file"
+                )
+
+            assert (
+                str(exc_info.value)
+                == "O arquivo desejado não encontra-se no repositório"
+            )
+            mock_blob_client.close.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_download_blob_as_stream(self, azure_blob):
         with patch(
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from src.domain.llm.retriever.busca_especulativa import (
+    BuscaEspeculativa,
+    reordenar_por_termos,
+)
+from tests.util.mock_objects import AsyncIterator
+
+
+@pytest.fixture(autouse=True)
+def limpar_metricas():
+    BuscaEspeculativa.limpar()
+    yield
+    BuscaEspeculativa.limpar()
+
+
+def test_ativa(mocker):
+    assert BuscaEspeculativa.ativa(5)
+    assert not BuscaEspeculativa.ativa(None)
+
+    mocker.patch(
+        "src.domain.llm.retriever.busca_especulativa.BUSCA_ESPECULATIVA_ATIVA", False
+    )
+
+    assert not BuscaEspeculativa.ativa(5)
+
+
+@pytest.mark.asyncio
+async def test_listar():
+    assert await BuscaEspeculativa.listar(AsyncIterator([{"a": 1}, {"a": 2}])) == [
+        {"a": 1},
+        {"a": 2},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_executar_em_paralelo():
+    inicio_busca = asyncio.Event()
+
+    async def extrair():
+        # a extração só termina se a busca já tiver começado
+        await asyncio.wait_for(inicio_busca.wait(), timeout=1)
+        return "filtro"
+
+    async def buscar():
+        inicio_busca.set()
+        return ["doc"]
+
+    assert await BuscaEspeculativa.executar(extrair(), buscar()) == (
+        "filtro",
+        ["doc"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_executar_falha_na_busca():
+    async def extrair():
+        return "filtro"
+
+    async def buscar():
+        raise ValueError("erro")
+
+    assert await BuscaEspeculativa.executar(extrair(), buscar()) == ("filtro", None)
+    assert BuscaEspeculativa.metricas()["falhas"] == 1
+
+
+@pytest.mark.asyncio
+async def test_executar_falha_na_extracao_cancela_a_busca():
+    busca_iniciada = asyncio.Event()
+
+    async def extrair():
+        await busca_iniciada.wait()
+        raise ValueError("erro")
+
+    async def buscar():
+        busca_iniciada.set()
+        await asyncio.sleep(10)
+
+    tarefas_antes = asyncio.all_tasks()
+
+    with pytest.raises(ValueError):
+        await BuscaEspeculativa.executar(extrair(), buscar())
+
+    await asyncio.sleep(0)
+
+    assert all(t.done() for t in asyncio.all_tasks() - tarefas_antes)
+
+
+def test_aproveitar_sem_filtro():
+    docs = [{"id": i} for i in range(6)]
+
+    assert BuscaEspeculativa.aproveitar(docs, 2) == [{"id": 0}, {"id": 1}]
+    assert BuscaEspeculativa.metricas()["reaproveitadas"] == 1
+
+
+def test_aproveitar_com_filtro():
+    docs = [{"ano": ano} for ano in [2010, 2020, 2021, 2015, 2022]]
+
+    assert BuscaEspeculativa.aproveitar(
+        docs, 2, filtro=lambda doc: doc["ano"] >= 2020
+    ) == [{"ano": 2020}, {"ano": 2021}]
+    assert BuscaEspeculativa.metricas()["filtradas"] == 1
+
+
+def test_aproveitar_descarta_quando_restam_poucos_resultados():
+    docs = [{"ano": ano} for ano in [2010, 2020]]
+
+    assert (
+        BuscaEspeculativa.aproveitar(docs, 2, filtro=lambda doc: doc["ano"] >= 2020)
+        is None
+    )
+    assert BuscaEspeculativa.aproveitar(None, 2) is None
+    assert BuscaEspeculativa.metricas()["descartadas"] == 2
+
+
+def test_reordenar_por_termos():
+    docs = [
+        {"trecho": "licitação de obras"},
+        {"trecho": "pregão eletrônico para aquisição"},
+        {"trecho": "contratação de obras por pregão"},
+    ]
+
+    assert reordenar_por_termos(docs, "Pregão de obras", ["trecho"]) == [
+        docs[2],
+        docs[0],
+        docs[1],
+    ]
+    assert reordenar_por_termos(docs, "", ["trecho"]) == docs
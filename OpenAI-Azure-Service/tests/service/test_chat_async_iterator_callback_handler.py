@@ -1,5 +1,6 @@
 import logging
 from typing import List
+from unittest.mock import AsyncMock
 
 import pytest
 from langchain_core.outputs import Generation, LLMResult
@@ -8,6 +9,8 @@ from src.domain.llm.callback.chat_async_iterator_callback_handler import (
     ChatAsyncIteratorCallbackHandler,
 )
 from src.domain.mensagem import Mensagem
+from src.domain.trecho import Trecho
+from src.service.quota_service import update_quota
 from tests.util.mock_objects import MockObjects
 
 logger = logging.getLogger(__name__)
@@ -83,3 +86,57 @@ class TestChatAsyncInteratorCallbackHandler:
         llm_result = LLMResult(generations=[[generation]])
         resposta = await chat_async.on_llm_end(llm_result)
         assert resposta is None
+
+    @pytest.mark.asyncio
+    async def test_on_llm_end_agenda_gravacao(self, mocker):
+        mock_enfileirar = mocker.patch(
+            "src.domain.llm.callback.chat_async_iterator_callback_handler.WriteBehindQueue.enfileirar",
+            new_callable=AsyncMock,
+        )
+        mensagens = [MockObjects.mock_mensagem]
+        chat_async = ChatAsyncIteratorCallbackHandler(
+            chat_id="chat_id_test",
+            msg=mensagens,
+            acao=self._adicionar_mensagens,
+            model={"deployment_name": "claude-teste"},
+        )
+        generation = Generation(text="Teste")
+        llm_result = LLMResult(generations=[[generation]])
+
+        await chat_async.on_llm_end(llm_result)
+
+        (acao, *args_acao), _ = mock_enfileirar.await_args_list[0]
+        (acao_quota, *_), _ = mock_enfileirar.await_args_list[1]
+        assert acao == self._adicionar_mensagens
+        assert args_acao == ["chat_id_test", mensagens]
+        assert acao_quota is update_quota
+
+    @pytest.mark.asyncio
+    async def test_on_llm_new_token_localiza_citacoes_incrementalmente(self):
+        msg_sistema = MockObjects.mock_mensagem.model_copy(deep=True)
+        msg_sistema.arquivos_busca = "Arquivos"
+        msg_sistema.trechos = []
+        msg_resposta = MockObjects.mock_mensagem.model_copy(deep=True)
+        chat_async = ChatAsyncIteratorCallbackHandler(
+            chat_id="chat_id_test",
+            msg=[msg_sistema, msg_resposta],
+            acao=self._adicionar_mensagens,
+            model={"deployment_name": "teste"},
+        )
+
+        for token in ["Segundo [", "1", "] "]:
+            await chat_async.on_llm_new_token(token)
+
+        assert msg_resposta.trechos == []
+
+        # trechos definidos durante o stream (ex.: por uma tool): as citações
+        # já recebidas são consideradas
+        trecho_1 = Trecho(conteudo="trecho 1", id_registro="AC-1/2024")
+        trecho_2 = Trecho(conteudo="trecho 2", id_registro="AC-2/2024")
+        msg_sistema.trechos = [trecho_1, trecho_2]
+
+        await chat_async.on_llm_new_token("e [AC-2")
+        assert msg_resposta.trechos == [trecho_1]
+
+        await chat_async.on_llm_new_token("/2024]")
+        assert msg_resposta.trechos == [trecho_1, trecho_2]
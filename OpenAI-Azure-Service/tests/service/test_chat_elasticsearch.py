@@ -169,3 +169,54 @@ class TestChatElasticSearch:
             "_doc/_update_by_query", ANY, req_tipo="post"
         )
         assert resultado["updated"] == 3
+
+    @pytest.mark.asyncio
+    async def test_buscar_chat_leitura_combinada(self, mocker, chat_elasticsearch):
+        mocker.patch(
+            "src.infrastructure.elasticsearch.chat_elasticsearch.ELASTIC_MENSAGENS_EM_INDICE_PROPRIO",
+            True,
+        )
+
+        def mensagem(codigo, papel="USER"):
+            return {
+                "codigo": codigo,
+                "papel": papel,
+                "conteudo": f"conteudo {codigo}",
+                "data_envio": "2024-01-01 12:00:00",
+                "favoritado": False,
+            }
+
+        chat_elasticsearch.elasticsearch_query = AsyncMock(
+            return_value={
+                "hits": {
+                    "hits": [
+                        {
+                            "_id": "1",
+                            "_source": {
+                                "chat": {
+                                    "titulo": "Título",
+                                    "usuario": "USUARIO",
+                                    "data_ultima_iteracao": "2024-01-01 12:00:00",
+                                    "fixado": False,
+                                    "arquivado": False,
+                                },
+                                "mensagens": [mensagem("1"), mensagem("2", "ASSISTANT")],
+                            },
+                        }
+                    ]
+                }
+            }
+        )
+        # a mensagem "2" já foi migrada mas ainda consta no documento do chat
+        chat_elasticsearch.buscar_mensagens_do_indice = AsyncMock(
+            return_value=[
+                mensagem("2", "ASSISTANT"),
+                mensagem("3", "SYSTEM"),
+                mensagem("4"),
+            ]
+        )
+
+        resultado = await chat_elasticsearch.buscar_chat("1", "usuario")
+
+        chat_elasticsearch.buscar_mensagens_do_indice.assert_awaited_once_with("1")
+        assert [m.codigo for m in resultado.mensagens] == ["1", "2", "4"]
@@ -6,7 +6,7 @@ import pytest
 from aioresponses import aioresponses
 
 from src.conf.env import configs
-from src.service import documento_service
+from src.service import documento_service, token_servico_broker
 from src.service.documento_service import NoHeaderFooterPDFPlumberParser
 from tests.util import mock_objects
 from tests.util.mock_objects import MockObjects
@@ -16,7 +16,7 @@ class TestDocumentoService:
     @pytest.mark.asyncio
     async def test_obter_pecas_processo(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(documento_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         mockProcesso = {"cod": "1234567891011"}
         mockPeca = [MockObjects.mock_peca]
         with aioresponses() as mocked:
@@ -37,7 +37,7 @@ class TestDocumentoService:
     @pytest.mark.asyncio
     async def test_recuperar_peca_processo(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(documento_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         mockProcesso = {"cod": "1234567891011"}
         mockPeca = [MockObjects.mock_peca]
         with aioresponses() as mocked:
@@ -76,7 +76,7 @@ class TestDocumentoService:
     @pytest.mark.asyncio
     async def test_obter_stream_documento(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(documento_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         with aioresponses() as mocked:
             urlConteudo = f"{configs.BASE_DOCUMENTO_URL}/documentos/1/conteudo"
             retorno_esperado = {"extensaoArquivo": "pdf", "conteudoBase64": "VGVzdGU="}
@@ -87,7 +87,7 @@ class TestDocumentoService:
     @pytest.mark.asyncio
     async def test_obter_stream_documento_extensao_diferente_de_pdf(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(documento_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         with aioresponses() as mocked:
             urlConteudo = f"{configs.BASE_DOCUMENTO_URL}/documentos/1/conteudo"
             retorno_esperado = {"extensaoArquivo": "jpg", "conteudoBase64": "VGVzdGU="}
@@ -102,7 +102,7 @@ class TestDocumentoService:
     @pytest.mark.asyncio
     async def test_obter_documento_pdf(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(documento_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         with aioresponses() as mocked:
             urlConteudo = f"{configs.BASE_DOCUMENTO_URL}/documentos/1/conteudo-pdf"
             mocked.get(urlConteudo, payload="Teste", status=200)
@@ -112,7 +112,7 @@ class TestDocumentoService:
     @pytest.mark.asyncio
     async def test_obter_documento_pdf_status_nao_esperado(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(documento_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         with aioresponses() as mocked:
             urlConteudo = f"{configs.BASE_DOCUMENTO_URL}/documentos/1/conteudo-pdf"
             mocked.get(urlConteudo, payload={}, status=400)
@@ -131,7 +131,7 @@ class TestDocumentoService:
     @pytest.mark.asyncio
     async def test_process_page_content(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(documento_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         byteIso = BytesIO(b64decode(MockObjects.base64_pdf))
         retorno = (
             documento_service.NoHeaderFooterPDFPlumberParser._process_page_content(
@@ -1,8 +1,11 @@
+import asyncio
 from tempfile import SpooledTemporaryFile
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 from langchain.schema import Document
+from openai import RateLimitError
 
 from src.infrastructure.cognitive_search.documentos_cs import DocumentoCS
 from src.infrastructure.security_tokens import DecodedToken
@@ -36,18 +39,9 @@ class TestDocumentosCs:
         result = await mock_documento_cs.verifica_existencia_documento("test_filename")
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_persiste_documentos(self, mock_documento_cs):
-        mock_documento_cs.verifica_existencia_documento = AsyncMock(return_value=False)
-        mock_documento_cs.__trigger_azure_func = AsyncMock()
-        mock_documento_cs.__get_azure_func_status = AsyncMock()
-        mock_documento_cs.__criar_secoes = AsyncMock()
-        mock_documento_cs.__text_spliter = AsyncMock(return_value=["page1", "page2"])
-        mock_documento_cs._popular_indice = AsyncMock()
-        mock_documento_cs._get_embeddings = AsyncMock()
-
-        content_bytes = SpooledTemporaryFile()
-        token = DecodedToken(
+    @pytest.fixture
+    def token(self):
+        return DecodedToken(
             login="test_user",
             roles=["DESENVOLVEDOR"],
             siga_culs="value1",
@@ -58,6 +52,17 @@ class TestDocumentosCs:
             siga_luls="value6",
         )
 
+    @pytest.mark.asyncio
+    async def test_persiste_documentos(self, mock_documento_cs, token, mocker):
+        mock_documento_cs.verifica_existencia_documento = AsyncMock(return_value=False)
+        mock_documento_cs._popular_indice = AsyncMock()
+        mock_process = mocker.patch(
+            "src.infrastructure.cognitive_search.documentos_cs.LocalFileProcessor.process",
+            new_callable=AsyncMock,
+        )
+
+        content_bytes = SpooledTemporaryFile()
+
         await mock_documento_cs.persiste_documentos(
             real_filename="test_real_filename",
             user_filename="test_user_filename",
@@ -65,7 +70,37 @@ class TestDocumentosCs:
             extensao=".txt",
             token=token,
         )
-        mock_documento_cs._popular_indice.assert_called_once()
+
+        mock_process.assert_awaited_once()
+        assert (
+            mock_process.call_args.kwargs["fn_populate_intex"]
+            == mock_documento_cs._popular_indice
+        )
+
+    @pytest.mark.asyncio
+    async def test_persiste_documentos_remove_secoes_em_falha(
+        self, mock_documento_cs, token, mocker
+    ):
+        mock_documento_cs.verifica_existencia_documento = AsyncMock(return_value=False)
+        mock_documento_cs._DocumentoCS__remover_secoes = AsyncMock()
+        mocker.patch(
+            "src.infrastructure.cognitive_search.documentos_cs.LocalFileProcessor.process",
+            new_callable=AsyncMock,
+            side_effect=Exception("falha no embedding"),
+        )
+
+        with pytest.raises(Exception, match="falha no embedding"):
+            await mock_documento_cs.persiste_documentos(
+                real_filename="test_real_filename",
+                user_filename="test_user_filename",
+                content_bytes=SpooledTemporaryFile(),
+                extensao="pdf",
+                token=token,
+            )
+
+        mock_documento_cs._DocumentoCS__remover_secoes.assert_awaited_once_with(
+            "test_real_filename"
+        )
 
     @pytest.mark.asyncio
     async def test_text_spliter_none_pages(self, mock_documento_cs):
@@ -85,3 +120,122 @@ class TestDocumentosCs:
         result = await mock_documento_cs._DocumentoCS__text_spliter(pages)
         assert len(result) > 0
         assert all(isinstance(trecho, Document) for trecho in result)
+
+    @pytest.mark.asyncio
+    async def test_criar_secoes_em_lote(self, mock_documento_cs, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.cognitive_search.EMBEDDING_TAMANHO_LOTE",
+            2,
+        )
+
+        async def fake_create(input, model):
+            return MagicMock(
+                data=[
+                    MagicMock(index=i, embedding=[float(len(texto))])
+                    for i, texto in enumerate(input)
+                ]
+            )
+
+        mock_embeddings = MagicMock()
+        mock_embeddings.create = AsyncMock(side_effect=fake_create)
+        mock_documento_cs._get_embeddings = MagicMock(return_value=mock_embeddings)
+
+        trechos = [
+            Document(page_content="a" * (i + 1), metadata={"source": "t", "page": 1})
+            for i in range(5)
+        ]
+
+        secoes = await mock_documento_cs._DocumentoCS__criar_secoes(
+            real_filename="arquivo", user_filename="arquivo.pdf", trechos=trechos
+        )
+
+        assert len(secoes) == 5
+        assert [s["trechoVector"] for s in secoes] == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert mock_embeddings.create.await_count == 3
+        mock_documento_cs._get_embeddings.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_criar_secoes_reaproveita_embeddings_em_cache(
+        self, mock_documento_cs
+    ):
+        async def fake_create(input, model):
+            return MagicMock(
+                data=[
+                    MagicMock(index=i, embedding=[float(len(texto))])
+                    for i, texto in enumerate(input)
+                ]
+            )
+
+        mock_embeddings = MagicMock()
+        mock_embeddings.create = AsyncMock(side_effect=fake_create)
+        mock_documento_cs._get_embeddings = MagicMock(return_value=mock_embeddings)
+
+        trechos = [
+            Document(page_content=texto, metadata={"source": "t", "page": 1})
+            for texto in ["aa", "bbb", "aa"]
+        ]
+
+        for _ in range(2):
+            secoes = await mock_documento_cs._DocumentoCS__criar_secoes(
+                real_filename="arquivo", user_filename="arquivo.pdf", trechos=trechos
+            )
+
+        assert [s["trechoVector"] for s in secoes] == [[2.0], [3.0], [2.0]]
+        # textos repetidos são enviados uma única vez e a 2ª indexação usa o cache
+        mock_embeddings.create.assert_awaited_once()
+        assert mock_embeddings.create.await_args.kwargs["input"] == ["aa", "bbb"]
+
+    @pytest.mark.asyncio
+    async def test_get_vetores_reaproveita_vetor_da_pergunta(self, mock_documento_cs):
+        mock_embeddings = MagicMock()
+        mock_embeddings.create = AsyncMock(
+            return_value=MagicMock(data=[MagicMock(index=0, embedding=[0.5])])
+        )
+        mock_documento_cs._get_embeddings = MagicMock(return_value=mock_embeddings)
+
+        vetores = await asyncio.gather(
+            *[mock_documento_cs._get_vetores("resuma o documento", 3) for _ in range(3)]
+        )
+
+        assert all(v[0].vector == [0.5] for v in vetores)
+        mock_embeddings.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_criar_secoes_sem_trechos(self, mock_documento_cs):
+        mock_documento_cs._get_embeddings = MagicMock()
+
+        secoes = await mock_documento_cs._DocumentoCS__criar_secoes(
+            real_filename="arquivo", user_filename="arquivo.pdf", trechos=[]
+        )
+
+        assert secoes == []
+        mock_documento_cs._get_embeddings.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_criar_embeddings_retenta_em_429(self, mock_documento_cs, mocker):
+        mock_sleep = mocker.patch(
+            "src.infrastructure.cognitive_search.cognitive_search.asyncio.sleep",
+            new_callable=AsyncMock,
+        )
+        erro = RateLimitError(
+            "limite",
+            response=httpx.Response(
+                429, request=httpx.Request("POST", "http://teste"), headers={}
+            ),
+            body=None,
+        )
+        mock_embeddings = MagicMock()
+        mock_embeddings.create = AsyncMock(
+            side_effect=[
+                erro,
+                MagicMock(data=[MagicMock(index=0, embedding=[0.1])]),
+            ]
+        )
+
+        vetores = await mock_documento_cs._criar_embeddings_com_retentativa(
+            mock_embeddings, ["texto"]
+        )
+
+        assert vetores == [[0.1]]
+        assert mock_embeddings.create.await_count == 2
+        mock_sleep.assert_awaited_once()
@@ -0,0 +1,103 @@
+import base64
+import io
+from unittest.mock import AsyncMock
+
+import pytest
+from PIL import Image
+
+from src.service.imagem_historico_cache import ImagemHistoricoCache, reduzir_imagem
+
+
+def gerar_imagem(largura: int, altura: int, formato: str = "PNG") -> bytes:
+    saida = io.BytesIO()
+    Image.new("RGB", (largura, altura), color=(200, 30, 30)).save(saida, formato)
+
+    return saida.getvalue()
+
+
+def dimensoes(imagem_binario: bytes):
+    with Image.open(io.BytesIO(imagem_binario)) as imagem:
+        return imagem.size
+
+
+@pytest.fixture
+def get_imagem_do_blob(mocker):
+    return mocker.patch(
+        "src.service.imagem_historico_cache.get_imagem_do_blob",
+        new_callable=AsyncMock,
+    )
+
+
+def test_reduzir_imagem_grande():
+    reduzida = reduzir_imagem(gerar_imagem(4000, 2000))
+
+    # cabe em 2048x2048 e, depois, o menor lado é limitado a 768
+    assert dimensoes(reduzida) == (1536, 768)
+
+
+def test_reduzir_imagem_pequena_mantem_original():
+    original = gerar_imagem(600, 400)
+
+    assert reduzir_imagem(original) is original
+
+
+def test_reduzir_imagem_invalida_mantem_original():
+    assert reduzir_imagem(b"nao e uma imagem") == b"nao e uma imagem"
+
+
+def test_reduzir_imagem_desativado(mocker):
+    mocker.patch(
+        "src.service.imagem_historico_cache.HISTORICO_IMAGEM_LADO_MAXIMO", 0
+    )
+    original = gerar_imagem(4000, 2000)
+
+    assert reduzir_imagem(original) is original
+
+
+@pytest.mark.asyncio
+async def test_obter_baixa_apenas_uma_vez(get_imagem_do_blob):
+    get_imagem_do_blob.return_value = b"imagem"
+
+    assert await ImagemHistoricoCache.obter("hash-6.jpg") == "aW1hZ2Vt"
+    assert await ImagemHistoricoCache.obter("hash-6.jpg") == "aW1hZ2Vt"
+
+    get_imagem_do_blob.assert_awaited_once_with("hash-6.jpg")
+    assert ImagemHistoricoCache.metricas()["hits"] >= 1
+    assert ImagemHistoricoCache.metricas()["itens"] == 1
+
+
+@pytest.mark.asyncio
+async def test_obter_armazena_imagem_reduzida(get_imagem_do_blob):
+    get_imagem_do_blob.return_value = gerar_imagem(3000, 3000)
+
+    imagem_base64 = await ImagemHistoricoCache.obter("grande.jpg")
+
+    assert dimensoes(base64.b64decode(imagem_base64)) == (768, 768)
+
+
+@pytest.mark.asyncio
+async def test_obter_falha_nao_armazena(get_imagem_do_blob):
+    get_imagem_do_blob.return_value = None
+
+    assert await ImagemHistoricoCache.obter("inexistente.jpg") is None
+    assert await ImagemHistoricoCache.obter("inexistente.jpg") is None
+
+    assert get_imagem_do_blob.await_count == 2
+    assert ImagemHistoricoCache.metricas()["itens"] == 0
+
+
+@pytest.mark.asyncio
+async def test_obter_respeita_limite_de_bytes(get_imagem_do_blob, mocker):
+    mocker.patch(
+        "src.service.imagem_historico_cache.HISTORICO_IMAGEM_CACHE_MAX_MB", 1
+    )
+    # 600 KB em base64 por imagem: apenas uma cabe no limite de 1 MB
+    get_imagem_do_blob.return_value = b"x" * (450 * 1024)
+
+    await ImagemHistoricoCache.obter("a.jpg")
+    await ImagemHistoricoCache.obter("b.jpg")
+    await ImagemHistoricoCache.obter("a.jpg")
+
+    assert list(ImagemHistoricoCache._itens) == ["a.jpg"]
+    assert ImagemHistoricoCache.metricas()["bytes"] <= 1024 * 1024
+    assert get_imagem_do_blob.await_count == 3
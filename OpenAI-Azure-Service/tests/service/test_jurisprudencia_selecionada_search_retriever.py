@@ -119,3 +119,70 @@ class TestJurisprudenciaSelecionadaSearchRetriever:
         assert (
             juris.system_message.parametro_quantidade_trechos_relevantes_busca is None
         )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "filtro_extraido, acordaos_esperados, buscas",
+        [
+            ('"ano_inicial": null, "ano_final": null', ["3", "1"], 1),
+            ('"ano_inicial": "2020", "ano_final": null', ["3", "2"], 1),
+            ('"ano_inicial": "2023", "ano_final": null', ["9"], 2),
+        ],
+    )
+    async def test_aget_relevant_documents_busca_especulativa(
+        self, _search, _ainvoke, filtro_extraido, acordaos_esperados, buscas
+    ):
+        def gerar_doc(numero, ano, trecho):
+            return {
+                "numacordao": numero,
+                "anoacordao": ano,
+                "colegiado": "Plenário",
+                "funcaoautortese": "relator",
+                "autortese": "autor",
+                "trecho": trecho,
+                "@search.score": 1,
+                "linkPesquisaIntegrada": "link.teste.com",
+            }
+
+        _search.side_effect = [
+            mock_objects.AsyncIterator(
+                [
+                    gerar_doc("1", "2010", "dispensa de licitação"),
+                    gerar_doc("2", "2021", "sobrepreço em obras"),
+                    gerar_doc("3", "2022", "dispensa de licitação em obras"),
+                ]
+            ),
+            mock_objects.AsyncIterator([gerar_doc("9", "2023", "obras")]),
+        ]
+        _ainvoke.return_value = (
+            '{"autor": null, "pergunta": "dispensa de licitação em obras", '
+            + filtro_extraido
+            + "}"
+        )
+        juris = JurisprudenciaSearchRetriever(
+            system_message=MockObjects.mock_mensagem,
+            prompt_usuario="Quais acórdãos tratam de dispensa de licitação?",
+            llm=OpenAI(),
+            usr_roles=["adm"],
+            top_k=2,
+        )
+
+        await juris.get_trechos_relevantes()
+
+        chamadas = _search.call_args_list
+
+        assert len(chamadas) == buscas
+        # a busca especulativa usa o prompt original, sem filtro
+        assert chamadas[0].kwargs["search_text"] == juris.prompt_usuario
+        assert chamadas[0].kwargs["filter"] is None
+        assert chamadas[0].kwargs["top"] == 6
+        assert [
+            trecho.id_registro.split(" ")[1].split("/")[0]
+            for trecho in juris.system_message.trechos
+        ] == acordaos_esperados
+
+        if buscas == 2:
+            assert chamadas[1].kwargs["search_text"] == (
+                "dispensa de licitação em obras"
+            )
+            assert chamadas[1].kwargs["filter"] == "anoacordao ge '2023'"
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -57,6 +57,74 @@ class TestLLMBaseElasticSearch:
 
         assert isinstance(historico, list)
 
+    @pytest.mark.asyncio
+    async def test_carregar_historico_para_prompt_com_imagens(self, mocker):
+        mocker.patch(
+            "src.domain.llm.base.llm_base_elasticsearch.HISTORICO_MAX_IMAGENS", 2
+        )
+        mensagens = [
+            MagicMock(papel="USER", conteudo="primeira", imagens=["a.jpg"]),
+            MagicMock(papel="ASSISTANT", conteudo="resposta", imagens=[]),
+            MagicMock(papel="USER", conteudo="segunda", imagens=["b.jpg", "c.jpg"]),
+        ]
+        mocker.patch(
+            "src.infrastructure.elasticsearch.elasticsearch.ElasticSearch.buscar_chat",
+            new_callable=AsyncMock,
+            return_value=MagicMock(mensagens=mensagens),
+        )
+        obter = mocker.patch(
+            "src.domain.llm.base.llm_base_elasticsearch.ImagemHistoricoCache.obter",
+            new_callable=AsyncMock,
+            side_effect=lambda img: None if img == "c.jpg" else f"base64-{img}",
+        )
+
+        historico = await LLMBaseElasticSearch._carregar_historico_para_prompt(
+            "123", "user"
+        )
+
+        # apenas as duas últimas imagens são enviadas
+        assert sorted(c.args[0] for c in obter.await_args_list) == ["b.jpg", "c.jpg"]
+        assert historico[0]["content"] == [
+            {"type": "text", "text": "primeira"},
+            {
+                "type": "text",
+                "text": "[1 imagem(ns) enviada(s) anteriormente, omitida(s) do histórico]",
+            },
+        ]
+        # a imagem que não pôde ser obtida é desconsiderada
+        assert historico[2]["content"] == [
+            {"type": "text", "text": "segunda"},
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": "data:image/jpeg;base64,base64-b.jpg",
+                    "detail": "high",
+                },
+            },
+        ]
+
+    def test_selecionar_imagens_historico_ultimos_turnos(self, mocker):
+        mocker.patch(
+            "src.domain.llm.base.llm_base_elasticsearch.HISTORICO_MAX_IMAGENS", 0
+        )
+        mocker.patch(
+            "src.domain.llm.base.llm_base_elasticsearch.HISTORICO_IMAGENS_ULTIMOS_TURNOS",
+            2,
+        )
+        mensagens = [
+            MagicMock(papel="USER", imagens=["a.jpg"]),
+            MagicMock(papel="ASSISTANT", imagens=[]),
+            MagicMock(papel="USER", imagens=["b.jpg", "c.jpg"]),
+            MagicMock(papel="ASSISTANT", imagens=[]),
+            MagicMock(papel="USER", imagens=["d.jpg"]),
+        ]
+
+        assert LLMBaseElasticSearch._selecionar_imagens_historico(mensagens) == {
+            (2, "b.jpg"),
+            (2, "c.jpg"),
+            (4, "d.jpg"),
+        }
+
     @pytest.mark.asyncio
     async def test_adicionar_mensagem(self, mocker):
         mocker.patch(
@@ -72,8 +140,8 @@ class TestLLMBaseElasticSearch:
 
     @pytest.mark.asyncio
     async def test_adicionar_mensagens(self, mocker):
-        mocker.patch(
-            "src.infrastructure.elasticsearch.elasticsearch.ElasticSearch.adicionar_mensagem",
+        mock_adicionar_mensagens = mocker.patch(
+            "src.infrastructure.elasticsearch.elasticsearch.ElasticSearch.adicionar_mensagens",
             new_callable=AsyncMock,
         )
         cod_chat = "123"
@@ -81,4 +149,6 @@ class TestLLMBaseElasticSearch:
 
         await LLMBaseElasticSearch._adicionar_mensagens(cod_chat, mensagens)
 
-        assert True
+        mock_adicionar_mensagens.assert_awaited_once_with(
+            cod_chat=cod_chat, mensagens=mensagens
+        )
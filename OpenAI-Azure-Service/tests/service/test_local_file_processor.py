@@ -1,9 +1,14 @@
+import os
 from tempfile import NamedTemporaryFile
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from langchain.docstore.document import Document
+
+from src.domain.schemas import GabiResponse
 from src.infrastructure.cognitive_search.local_file_processor import LocalFileProcessor
+from src.infrastructure.parser_pool.parser_pool import ParserPool
 
 
 class TestLocalFileProcessor:
@@ -28,6 +33,33 @@ class TestLocalFileProcessor:
         assert len(pages) == 2
         assert pages[0].page_content == "Page content"
 
+    @pytest.mark.asyncio
+    async def test_load_document_from_pdf_bytes_em_intervalos(self, mocker):
+        mock_pdf = MagicMock()
+        mock_pdf.__enter__.return_value = mock_pdf
+        mock_pdf.load_page.side_effect = lambda i: MagicMock(
+            get_text=MagicMock(return_value=f"Página {i + 1}")
+        )
+        mock_pdf.__len__.return_value = 5
+        mocker.patch("fitz.open", return_value=mock_pdf)
+        mocker.patch(
+            "src.infrastructure.cognitive_search.local_file_processor.PARSER_POOL_PAGINAS_POR_TAREFA",
+            2,
+        )
+        mock_executar = mocker.spy(ParserPool, "executar")
+
+        with NamedTemporaryFile(suffix=".pdf") as temp_file:
+            temp_file.write(b"%PDF-1.4")
+            temp_file.seek(0)
+            pages = await LocalFileProcessor._LocalFileProcessor__load_document_from_pdf_bytes(
+                temp_file, "test.pdf"
+            )
+
+        assert [p.page_content for p in pages] == [f"Página {i}" for i in range(1, 6)]
+        assert [p.metadata["page"] for p in pages] == [1, 2, 3, 4, 5]
+        # contagem de páginas + 3 intervalos (2 + 2 + 1)
+        assert mock_executar.call_count == 4
+
     @pytest.mark.asyncio
     async def test_load_document_from_csv(self, mocker):
         mock_loader = MagicMock()
@@ -36,7 +68,7 @@ class TestLocalFileProcessor:
             MagicMock(page_content="Row 2"),
         ]
         mocker.patch(
-            "src.infrastructure.cognitive_search.local_file_processor.CSVLoader",
+            "src.infrastructure.parser_pool.parsers.CSVLoader",
             return_value=mock_loader,
         )
 
@@ -73,9 +105,10 @@ class TestLocalFileProcessor:
         assert pages[0].page_content == "<html>Data</html>"
 
     @pytest.mark.asyncio
-    async def test_process_docx(self, mocker):
+    async def test_converter_docx(self, mocker):
         mock_converter = MagicMock()
         with NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
+            temp_pdf.write(b"%PDF-1.4")
             mock_converter.converter.return_value = temp_pdf.name
 
         mocker.patch(
@@ -83,28 +116,19 @@ class TestLocalFileProcessor:
             return_value=mock_converter,
         )
 
-        mock_summarizer = AsyncMock()
-        mock_summarizer.sumarizar.return_value = "Summary content"
-
-        mock_load_document = AsyncMock(return_value=["Page 1"])
-        mocker.patch(
-            "src.infrastructure.cognitive_search.local_file_processor.LocalFileProcessor._LocalFileProcessor__load_document",
-            mock_load_document,
-        )
-
         with NamedTemporaryFile(suffix=".docx") as temp_file:
             temp_file.write(b"Dummy DOCX content")
             temp_file.seek(0)
 
-            pages, summary = await LocalFileProcessor._LocalFileProcessor__process_docx(
-                temp_file, "test.docx", mock_summarizer
+            path_pdf = await LocalFileProcessor._LocalFileProcessor__converter_docx(
+                temp_file
             )
 
-        assert pages == ["Page 1"]
-        assert summary == "Summary content"
         mock_converter.converter.assert_called_once_with(temp_file)
-        mock_summarizer.sumarizar.assert_called_once()
-        mock_load_document.assert_called_once()
+        assert not os.path.exists(temp_pdf.name)
+        with open(path_pdf, "rb") as f:
+            assert f.read() == b"%PDF-1.4"
+        os.unlink(path_pdf)
 
     @pytest.mark.asyncio
     async def test_load_document_pdf(self, mocker):
@@ -159,3 +183,91 @@ class TestLocalFileProcessor:
 
         assert pages == ["Page 1", "Page 2"]
         mock_load_xlsx.assert_called_once_with(temp_file, "test.xlsx")
+
+    @pytest.mark.asyncio
+    async def test_process_envia_lotes_assim_que_prontos(self, mocker):
+        mocker.patch(
+            "src.infrastructure.cognitive_search.local_file_processor.INDEXACAO_TAMANHO_LOTE",
+            2,
+        )
+
+        async def fn_text_spliter(pages):
+            return [
+                Document(page_content=f"{p.page_content}-{i}", metadata=p.metadata)
+                for p in pages
+                for i in range(3)
+            ]
+
+        async def fn_create_section(user_filename, real_filename, trechos, indice_inicial):
+            return [
+                {"id": indice_inicial + i, "trecho": t.page_content}
+                for i, t in enumerate(trechos)
+            ]
+
+        fn_populate_intex = AsyncMock()
+
+        await LocalFileProcessor.process(
+            content_bytes=GabiResponse(
+                transcript="transcricao", summary="resumo", itens_filenames=[]
+            ),
+            extensao="mp3",
+            real_filename="hash",
+            user_filename="reuniao.mp3",
+            token=None,
+            fn_text_spliter=fn_text_spliter,
+            fn_create_section=fn_create_section,
+            fn_populate_intex=fn_populate_intex,
+        )
+
+        lotes = [c.kwargs["sections"] for c in fn_populate_intex.await_args_list]
+
+        assert [len(lote) for lote in lotes] == [2, 2]
+        assert [s["id"] for lote in lotes for s in lote] == [0, 1, 2, 3]
+        assert lotes[-1][-1]["trecho"] == "RESUMO RESUMO RESUMO resumo"
+
+    @pytest.mark.asyncio
+    async def test_process_pdf_em_streaming(self, mocker):
+        mock_page = MagicMock()
+        mock_page.get_text.return_value = "Page content"
+        mock_pdf = MagicMock()
+        mock_pdf.__enter__.return_value = mock_pdf
+        mock_pdf.load_page.return_value = mock_page
+        mock_pdf.__len__.return_value = 3
+        mocker.patch("fitz.open", return_value=mock_pdf)
+
+        mock_sumarizador = MagicMock()
+        mock_sumarizador.sumarizar = AsyncMock(return_value=None)
+        mocker.patch(
+            "src.infrastructure.cognitive_search.local_file_processor.LocalFileProcessor._LocalFileProcessor__criar_sumarizador",
+            return_value=mock_sumarizador,
+        )
+
+        fn_text_spliter = AsyncMock(side_effect=lambda pages: pages)
+        fn_create_section = AsyncMock(
+            side_effect=lambda **kwargs: [
+                {"pagina": t.metadata["page"]} for t in kwargs["trechos"]
+            ]
+        )
+        fn_populate_intex = AsyncMock()
+
+        with NamedTemporaryFile(suffix=".pdf") as content:
+            content.write(b"%PDF-1.4")
+            content.seek(0)
+
+            await LocalFileProcessor.process(
+                content_bytes=content,
+                extensao="PDF",
+                real_filename="hash",
+                user_filename="arquivo.pdf",
+                token=None,
+                fn_text_spliter=fn_text_spliter,
+                fn_create_section=fn_create_section,
+                fn_populate_intex=fn_populate_intex,
+            )
+
+        # cada página é quebrada individualmente, assim que é lida
+        assert fn_text_spliter.await_count == 3
+        mock_sumarizador.sumarizar.assert_awaited_once()
+        fn_populate_intex.assert_awaited_once_with(
+            sections=[{"pagina": 1}, {"pagina": 2}, {"pagina": 3}]
+        )
@@ -1,12 +1,17 @@
+import json
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.domain.mensagem import Mensagem
+from src.domain.papel_enum import PapelEnum
 from src.domain.schemas import ReagirInput
+from src.exceptions import ElasticException
 from src.infrastructure.elasticsearch.mensagem_elasticsearch import (
     MensagemElasticSearchImpl,
 )
+from src.infrastructure.env import INDICE_ELASTIC_MENSAGENS
 
 
 class TestMensagemElasticSearch:
@@ -84,3 +89,166 @@ class TestMensagemElasticSearch:
 
         mock_elasticsearch_query.assert_called()
         mock_logger.info.assert_called()
+
+    @pytest.fixture
+    def mensagem(self):
+        return Mensagem(
+            chat_id="chat123",
+            codigo="c_chat123_202401011200_1",
+            papel=PapelEnum.USER,
+            conteudo="pergunta",
+            data_envio=datetime(2024, 1, 1, 12, 0, 0),
+            especialista_utilizado=None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_adicionar_mensagem_em_indice_proprio(self, mocker, mensagem):
+        mocker.patch(
+            "src.infrastructure.elasticsearch.mensagem_elasticsearch.ELASTIC_MENSAGENS_EM_INDICE_PROPRIO",
+            True,
+        )
+        elasticsearch = MensagemElasticSearchImpl()
+        elasticsearch.elasticsearch_query = AsyncMock(return_value={"result": "created"})
+        elasticsearch.insert_ou_update_campo = AsyncMock()
+
+        await elasticsearch.adicionar_mensagem("chat123", mensagem)
+
+        args, kwargs = elasticsearch.elasticsearch_query.await_args
+        documento = json.loads(args[1])
+
+        # a mensagem é um novo documento; o documento do chat não é reindexado
+        assert args[0] == "_doc"
+        assert kwargs["indice"] == INDICE_ELASTIC_MENSAGENS
+        assert documento["chat_id"] == "chat123"
+        assert documento["codigo"] == mensagem.codigo
+        assert isinstance(documento["ordem"], int)
+        elasticsearch.insert_ou_update_campo.assert_awaited_once_with(
+            "chat123", {"chat": {"data_ultima_iteracao": "2024-01-01 12:00:00"}}
+        )
+
+    @pytest.mark.asyncio
+    async def test_adicionar_mensagem_em_indice_proprio_falha(self, mocker, mensagem):
+        mocker.patch(
+            "src.infrastructure.elasticsearch.mensagem_elasticsearch.ELASTIC_MENSAGENS_EM_INDICE_PROPRIO",
+            True,
+        )
+        elasticsearch = MensagemElasticSearchImpl()
+        elasticsearch.elasticsearch_query = AsyncMock(
+            return_value={"error": {"reason": "falha"}}
+        )
+        elasticsearch.insert_ou_update_campo = AsyncMock()
+
+        with pytest.raises(ElasticException):
+            await elasticsearch.adicionar_mensagem("chat123", mensagem)
+
+        elasticsearch.insert_ou_update_campo.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_adicionar_mensagens_em_uma_requisicao(self, mensagem):
+        elasticsearch = MensagemElasticSearchImpl()
+        elasticsearch.elasticsearch_query = AsyncMock(return_value={"result": "updated"})
+        elasticsearch.insert_ou_update_campo = AsyncMock()
+
+        await elasticsearch.adicionar_mensagens("chat123", [mensagem, mensagem])
+
+        args, _ = elasticsearch.elasticsearch_query.await_args
+        params = json.loads(args[1])["script"]["params"]
+
+        elasticsearch.elasticsearch_query.assert_awaited_once()
+        elasticsearch.insert_ou_update_campo.assert_not_awaited()
+        assert args[0] == "_doc/chat123/_update"
+        assert len(params["mensagens"]) == 2
+        assert params["data_ultima_iteracao"] == "2024-01-01 12:00:00"
+
+    @pytest.mark.asyncio
+    async def test_adicionar_mensagens_falha(self, mensagem):
+        elasticsearch = MensagemElasticSearchImpl()
+        elasticsearch.elasticsearch_query = AsyncMock(
+            return_value={"error": {"reason": "falha"}}
+        )
+
+        with pytest.raises(ElasticException):
+            await elasticsearch.adicionar_mensagens("chat123", [mensagem])
+
+    @pytest.mark.asyncio
+    async def test_adicionar_mensagens_em_indice_proprio_bulk(self, mocker, mensagem):
+        mocker.patch(
+            "src.infrastructure.elasticsearch.mensagem_elasticsearch.ELASTIC_MENSAGENS_EM_INDICE_PROPRIO",
+            True,
+        )
+        elasticsearch = MensagemElasticSearchImpl()
+        elasticsearch.elasticsearch_query = AsyncMock(
+            side_effect=[
+                {
+                    "errors": True,
+                    "items": [
+                        {"index": {"result": "created"}},
+                        {"index": {"error": {"type": "es_rejected_execution"}}},
+                        {"update": {"result": "updated"}},
+                    ],
+                },
+                {"result": "created"},
+            ]
+        )
+        elasticsearch.insert_ou_update_campo = AsyncMock()
+
+        await elasticsearch.adicionar_mensagens("chat123", [mensagem, mensagem])
+
+        chamadas = elasticsearch.elasticsearch_query.await_args_list
+        (bulk_args, _), (reenvio_args, reenvio_kwargs) = chamadas
+        linhas = [json.loads(linha) for linha in bulk_args[1].decode().splitlines()]
+
+        assert bulk_args[0] == "_bulk"
+        assert linhas[0] == {"index": {"_index": INDICE_ELASTIC_MENSAGENS}}
+        assert linhas[1]["ordem"] < linhas[3]["ordem"]
+        assert linhas[4] == {"update": {"_id": "chat123"}}
+        assert linhas[5] == {
+            "doc": {"chat": {"data_ultima_iteracao": "2024-01-01 12:00:00"}}
+        }
+        # apenas a mensagem com falha é reenviada
+        assert reenvio_args[0] == "_doc"
+        assert reenvio_kwargs["indice"] == INDICE_ELASTIC_MENSAGENS
+        assert json.loads(reenvio_args[1])["ordem"] == linhas[3]["ordem"]
+        elasticsearch.insert_ou_update_campo.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_buscar_mensagens_do_indice(self):
+        elasticsearch = MensagemElasticSearchImpl()
+        elasticsearch.elasticsearch_query = AsyncMock(
+            return_value={"hits": {"hits": [{"_source": {"codigo": "1"}}]}}
+        )
+
+        assert await elasticsearch.buscar_mensagens_do_indice("chat123") == [
+            {"codigo": "1"}
+        ]
+
+        elasticsearch.elasticsearch_query.return_value = {
+            "error": {"type": "index_not_found_exception"}
+        }
+
+        assert await elasticsearch.buscar_mensagens_do_indice("chat123") == []
+
+    @pytest.mark.asyncio
+    async def test_migrar_mensagens_para_indice(self):
+        elasticsearch = MensagemElasticSearchImpl()
+        elasticsearch.elasticsearch_query = AsyncMock(
+            side_effect=[
+                {"_source": {"mensagens": [{"codigo": "1"}, {"codigo": "2"}]}},
+                {"errors": False},
+            ]
+        )
+        elasticsearch.insert_ou_update_campo = AsyncMock()
+
+        assert await elasticsearch.migrar_mensagens_para_indice("chat123") == 2
+
+        bulk = elasticsearch.elasticsearch_query.await_args_list[1]
+        linhas = bulk.args[1].decode("UTF-8").splitlines()
+
+        assert bulk.kwargs["indice"] == INDICE_ELASTIC_MENSAGENS
+        assert [json.loads(linha) for linha in linhas[1::2]] == [
+            {"codigo": "1", "chat_id": "chat123", "ordem": 0},
+            {"codigo": "2", "chat_id": "chat123", "ordem": 1},
+        ]
+        elasticsearch.insert_ou_update_campo.assert_awaited_once_with(
+            "chat123", {"mensagens": []}
+        )
@@ -120,3 +120,24 @@ class TestNormasRetriever:
             normas_retriever.system_message.parametro_quantidade_trechos_relevantes_busca
             is None
         )
+
+    @pytest.mark.asyncio
+    async def test_get_filtro_reaproveita_filtro_em_cache(
+        self, normas_retriever, _ainvoke
+    ):
+        _ainvoke.return_value = (
+            '{"ano_inicial": "2020", "ano_final": null, "pergunta": "férias"}'
+        )
+
+        primeiro = await normas_retriever._get_filtro()
+
+        # a mesma pergunta, reenviada com outra caixa e pontuação
+        normas_retriever.set_prompt_usuario(normas_retriever.prompt_usuario.upper())
+        segundo = await normas_retriever._get_filtro()
+
+        assert primeiro == segundo
+        assert segundo == (
+            "ano_norma ge '2020'",
+            {"ano_inicial": "2020", "ano_final": None, "pergunta": "férias"},
+        )
+        _ainvoke.assert_called_once()
@@ -2,7 +2,7 @@ import pytest
 from aioresponses import aioresponses
 
 from src.domain.schemas import DestinatarioOut
-from src.service import pessoas_service
+from src.service import pessoas_service, token_servico_broker
 
 MOCK_RESPOSTA_PADRAO = {
     "results": [
@@ -19,7 +19,7 @@ class TestPessoasService:
     @pytest.mark.asyncio
     async def test_buscar_pessoas_por_nome(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(pessoas_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         retorno_esperado = DestinatarioOut(codigo="P_1", nome="teste123")
         with aioresponses() as mocked:
             url = "http://propriedade-teste/pessoas/pesquisa-por-nome"
@@ -45,7 +45,7 @@ class TestPessoasService:
     @pytest.mark.asyncio
     async def test_buscar_pessoa_por_matricula(self, mocker):
         mock = mocker.AsyncMock()
-        mocker.patch.object(pessoas_service, "autenticar_servico", mock)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
         with aioresponses() as mocked:
             url = "http://propriedade-teste/pessoas/matricula/123"
             mocked.post(url, payload=MOCK_RESPOSTA_PADRAO, status=200)
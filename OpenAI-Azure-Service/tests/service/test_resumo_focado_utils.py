@@ -7,6 +7,10 @@ from src.domain.llm.util.resumo_focado_utils import ResumoFocadoUtils
 
 class TestResumoFocadoUtils:
 
+    @patch.dict(
+        "src.domain.llm.util.resumo_focado_utils.SUMARIZACAO_ESTRATEGIAS",
+        {"RESUMOFOCADODOCUMENTOS": "refine"},
+    )
     @patch("src.domain.llm.util.resumo_focado_utils.load_summarize_chain")
     @patch("src.domain.llm.util.resumo_focado_utils.PromptTemplate")
     @patch("src.domain.llm.util.resumo_focado_utils.logger")
@@ -44,6 +48,10 @@ class TestResumoFocadoUtils:
             return_only_outputs=(not return_intermediate_steps),
         )
 
+    @patch.dict(
+        "src.domain.llm.util.resumo_focado_utils.SUMARIZACAO_ESTRATEGIAS",
+        {"RESUMOFOCADODOCUMENTOS": "refine"},
+    )
     @patch("src.domain.llm.util.resumo_focado_utils.load_summarize_chain")
     @patch("src.domain.llm.util.resumo_focado_utils.PromptTemplate")
     @patch("src.domain.llm.util.resumo_focado_utils.logger")
@@ -166,7 +166,7 @@ class TestSegedamCS:
         mock_search_client.search.assert_called_once_with(
             "", order_by="id_num desc", top=1
         )
-        mock_search_client.close.assert_called_once()
+        mock_search_client.close.assert_not_called()
 
     @patch("src.infrastructure.cognitive_search.segedam_cs.SegedamCS._get_embeddings")
     @patch("src.infrastructure.cognitive_search.segedam_cs.SegedamCS.obtem_ultimo_id")
@@ -253,4 +253,4 @@ class TestSegedamCS:
         mock_search_client.search.assert_called_once_with(
             "", filter="codigo_servico eq 123", top=1
         )
-        mock_search_client.close.assert_called_once()
+        mock_search_client.close.assert_not_called()
@@ -1,6 +1,7 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage
 
 from src.domain.llm.tools.sumarizacao_peca_processo import SumarizacaoPecaProcesso
@@ -27,6 +28,10 @@ class TestSumarizacaoPecaProcesso:
         )
 
     @pytest.mark.asyncio
+    @patch.dict(
+        "src.domain.llm.tools.sumarizacao_peca_processo.SUMARIZACAO_ESTRATEGIAS",
+        {"SUMARIZACAO": "refine"},
+    )
     async def test_gerar_resumo_final_focado(self, sumarizacao_peca_processo):
         docs = [{"page_content": "Conteúdo do documento"}]
         result = {"output_text": "Resumo gerado"}
@@ -39,6 +44,31 @@ class TestSumarizacaoPecaProcesso:
             resumo = await sumarizacao_peca_processo._gerar_resumo_final_focado(docs)
             assert resumo == result
 
+    @pytest.mark.asyncio
+    async def test_gerar_resumo_final_focado_map_reduce(
+        self, sumarizacao_peca_processo
+    ):
+        docs = [Document(page_content="parte 1"), Document(page_content="parte 2")]
+
+        with patch(
+            "src.domain.llm.tools.sumarizacao_peca_processo.SumarizadorMapReduce"
+        ) as mock_sumarizador, patch(
+            "src.domain.llm.tools.sumarizacao_peca_processo.load_summarize_chain"
+        ) as mock_chain:
+            mock_sumarizador.return_value.executar = AsyncMock(
+                return_value={"output_text": "Resumo gerado"}
+            )
+            resumo = await sumarizacao_peca_processo._gerar_resumo_final_focado(
+                docs, preffix="Considerando", input_prompt="resuma"
+            )
+
+        assert resumo == {"output_text": "Resumo gerado"}
+        assert mock_sumarizador.call_args.kwargs == {"requisicao": "resuma"}
+        mock_sumarizador.return_value.executar.assert_called_once_with(
+            docs, return_intermediate_steps=False
+        )
+        mock_chain.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_sumarizar_documento_processo_focado_texto_longo(
         self, sumarizacao_peca_processo
@@ -76,6 +106,38 @@ class TestSumarizacaoPecaProcesso:
                         assert resumo == result.content
                         mock_gerar_resumo.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_sumarizar_documento_processo_focado_texto_curto(
+        self, sumarizacao_peca_processo
+    ):
+        sumarizacao_peca_processo.llm = MagicMock()
+        sumarizacao_peca_processo.llm.ainvoke = AsyncMock(
+            return_value=MagicMock(content="Resumo gerado")
+        )
+
+        with patch(
+            "src.service.documento_service.recuperar_peca_processo",
+            new_callable=AsyncMock,
+        ), patch(
+            "src.service.documento_service.obter_stream_documento",
+            new_callable=AsyncMock,
+        ), patch(
+            "src.domain.llm.tools.sumarizacao_peca_processo.ParserPool.executar",
+            new_callable=AsyncMock,
+            return_value=[Document(page_content="conteúdo da peça")],
+        ):
+            resumo = (
+                await sumarizacao_peca_processo._sumarizar_documento_processo_focado(
+                    "123", "456", "Resuma a peça"
+                )
+            )
+
+        assert resumo == "Resumo gerado"
+        # invocação assíncrona: o event loop não fica bloqueado durante a geração
+        sumarizacao_peca_processo.llm.assert_not_called()
+        mensagens = sumarizacao_peca_processo.llm.ainvoke.call_args.args[0]
+        assert "conteúdo da peça" in mensagens[0].content
+
     def test_get_tool_focado(self, sumarizacao_peca_processo):
         tool = sumarizacao_peca_processo.get_tool_focado()
         assert tool.func is None
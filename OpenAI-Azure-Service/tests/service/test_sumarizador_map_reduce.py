@@ -0,0 +1,143 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import PromptTemplate
+
+from src.domain.llm.util.sumarizador_map_reduce import (
+    LimitadorTPM,
+    SumarizadorMapReduce,
+)
+
+PROMPT = PromptTemplate.from_template("Resuma: {text}")
+
+
+@pytest.fixture(autouse=True)
+def limpar_metricas():
+    SumarizadorMapReduce.limpar()
+    LimitadorTPM.limpar()
+    yield
+    SumarizadorMapReduce.limpar()
+    LimitadorTPM.limpar()
+
+
+def criar_llm():
+    async def ainvoke(mensagens):
+        conteudo = mensagens[0].content
+
+        if conteudo.startswith("Resuma: "):
+            return AIMessage(content=f"R({conteudo[8:]})")
+
+        return AIMessage(content=f"C[{conteudo.count('R(') + conteudo.count('C[')}]")
+
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(side_effect=ainvoke)
+
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_executar_limita_concorrencia(mocker):
+    mocker.patch(
+        "src.domain.llm.util.sumarizador_map_reduce.SUMARIZACAO_MAP_REDUCE_CONCORRENCIA",
+        2,
+    )
+    em_execucao, maximo = 0, 0
+
+    async def ainvoke(mensagens):
+        nonlocal em_execucao, maximo
+        em_execucao += 1
+        maximo = max(maximo, em_execucao)
+        await asyncio.sleep(0.01)
+        em_execucao -= 1
+
+        return AIMessage(content="resumo")
+
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(side_effect=ainvoke)
+    docs = [Document(page_content=f"segmento {i}") for i in range(5)]
+
+    resultado = await SumarizadorMapReduce(llm, "GPT-4o", PROMPT).executar(docs)
+
+    assert resultado == {"output_text": "resumo"}
+    assert maximo == 2
+    # 5 segmentos + 1 redução
+    assert llm.ainvoke.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_executar_reducao_hierarquica(mocker):
+    mocker.patch(
+        "src.domain.llm.util.sumarizador_map_reduce.SUMARIZACAO_REDUCE_MAX_TOKENS", 5
+    )
+    llm = criar_llm()
+    docs = [Document(page_content=f"s{i}") for i in range(4)]
+
+    resultado = await SumarizadorMapReduce(
+        llm, "GPT-4o", PROMPT, requisicao="quais as conclusões?"
+    ).executar(docs, return_intermediate_steps=True)
+
+    # 4 resumos -> 2 grupos de 2 -> 1 resumo final
+    assert resultado == {
+        "output_text": "C[2]",
+        "intermediate_steps": ["R(s0)", "R(s1)", "R(s2)", "R(s3)"],
+    }
+
+    reducao = llm.ainvoke.call_args_list[4].args[0][0].content
+
+    assert 'requisição: \n"quais as conclusões?"' in reducao
+    assert reducao.index("R(s0)") < reducao.index("R(s1)")
+    assert SumarizadorMapReduce.metricas()["chamadas_reduce"] == 3
+    assert SumarizadorMapReduce.metricas()["niveis_reduce"] == 2
+
+
+@pytest.mark.asyncio
+async def test_executar_segmento_unico_sem_reducao():
+    llm = criar_llm()
+
+    resultado = await SumarizadorMapReduce(llm, "GPT-4o", PROMPT).executar(
+        [Document(page_content="único")]
+    )
+
+    assert resultado == {"output_text": "R(único)"}
+    assert llm.ainvoke.call_count == 1
+
+
+def test_agrupar_combina_ao_menos_dois_resumos(mocker):
+    mocker.patch(
+        "src.domain.llm.util.sumarizador_map_reduce.SUMARIZACAO_REDUCE_MAX_TOKENS", 1
+    )
+
+    assert SumarizadorMapReduce._agrupar(["a" * 30] * 5) == [
+        ["a" * 30] * 2,
+        ["a" * 30] * 3,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_limitador_tpm_aguarda_a_janela(mocker):
+    relogio = mocker.patch("src.domain.llm.util.sumarizador_map_reduce.time")
+    relogio.monotonic.side_effect = [0, 0, 61]
+    sleep = mocker.patch(
+        "src.domain.llm.util.sumarizador_map_reduce.asyncio.sleep",
+        new_callable=AsyncMock,
+    )
+    limitador = LimitadorTPM(100)
+
+    assert await limitador.adquirir(80) == 0
+    assert await limitador.adquirir(50) == 60
+
+    sleep.assert_called_once_with(60)
+
+
+def test_limitador_tpm_por_modelo(mocker):
+    mocker.patch.dict(
+        "src.domain.llm.util.sumarizador_map_reduce.SUMARIZACAO_TPM_MODELOS",
+        {"GPT-4o": 1000},
+    )
+
+    assert LimitadorTPM.get("GPT-4o") is LimitadorTPM.get("GPT-4o")
+    assert LimitadorTPM.get("GPT-4o").tpm == 1000
+    assert LimitadorTPM.get("outro").tpm == 150000
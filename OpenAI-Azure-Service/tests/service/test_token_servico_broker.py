@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import jwt
+import pytest
+
+from src.exceptions import ServiceException
+from src.service import token_servico_broker
+from src.service.token_servico_broker import TokenServicoBroker
+
+
+def gerar_token(exp: float) -> str:
+    return jwt.encode({"sub": "servico", "exp": int(exp)}, "segredo", algorithm="HS256")
+
+
+class TestTokenServicoBroker:
+    @pytest.mark.asyncio
+    async def test_obter_headers_reutiliza_token(self, mocker):
+        token = gerar_token(time.time() + 600)
+        mock = mocker.AsyncMock(return_value=token)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
+
+        headers_1 = await TokenServicoBroker.obter_headers("usuario", 394)
+        headers_2 = await TokenServicoBroker.obter_headers("usuario", 394)
+        headers_1["X-UFP"] = "ufp"
+
+        assert headers_2 == {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token}",
+        }
+        mock.assert_awaited_once_with("usuario", "394")
+
+    @pytest.mark.asyncio
+    async def test_obter_token_por_usuario_e_recurso(self, mocker):
+        mock = mocker.AsyncMock(side_effect=["token-a", "token-b", "token-c"])
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
+
+        assert await TokenServicoBroker.obter_token("usuario-a", 394) == "token-a"
+        assert await TokenServicoBroker.obter_token("usuario-b", 394) == "token-b"
+        assert await TokenServicoBroker.obter_token("usuario-a", 23) == "token-c"
+        assert await TokenServicoBroker.obter_token("usuario-a", 394) == "token-a"
+
+    @pytest.mark.asyncio
+    async def test_obter_token_renova_antes_do_exp(self, mocker):
+        # expira dentro da margem de renovação
+        token_expirando = gerar_token(time.time() + 30)
+        token_novo = gerar_token(time.time() + 600)
+        mock = mocker.AsyncMock(side_effect=[token_expirando, token_novo])
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
+
+        await TokenServicoBroker.obter_token("usuario", 394)
+
+        assert await TokenServicoBroker.obter_token("usuario", 394) == token_novo
+
+    @pytest.mark.asyncio
+    async def test_obter_token_concorrente_autentica_uma_vez(self, mocker):
+        chamadas = 0
+
+        async def autenticar(usuario, recurso):
+            nonlocal chamadas
+            chamadas += 1
+            await asyncio.sleep(0.05)
+            return "token"
+
+        mocker.patch.object(token_servico_broker, "autenticar_servico", autenticar)
+
+        tokens = await asyncio.gather(
+            *[TokenServicoBroker.obter_token("usuario", 394) for _ in range(5)]
+        )
+
+        assert tokens == ["token"] * 5
+        assert chamadas == 1
+        assert TokenServicoBroker.metricas()["em_andamento"] == 0
+
+    @pytest.mark.asyncio
+    async def test_obter_headers_sem_token(self, mocker):
+        mock = mocker.AsyncMock(return_value=None)
+        mocker.patch.object(token_servico_broker, "autenticar_servico", mock)
+
+        with pytest.raises(ServiceException):
+            await TokenServicoBroker.obter_headers("usuario", 394)
+
+        assert TokenServicoBroker.metricas()["tokens"] == 0
@@ -1,17 +1,29 @@
+import asyncio
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from langchain_core.documents import Document
 
 from src.domain.llm.tools.upload_documento_full_context import (
     UploadDocumentoFullContext,
 )
 from src.domain.mensagem import Mensagem
 from src.domain.papel_enum import PapelEnum
+from src.domain.schemas import ItemSistema
+from src.exceptions import ServiceException
 
 
 class TestUploadDocumentoFullContext:
 
+    @pytest.fixture(autouse=True)
+    def contar_tokens(self):
+        with patch(
+            "src.service.StreamFileLoader.num_tokens_from_string",
+            side_effect=len,
+        ):
+            yield
+
     @pytest.fixture
     def upload_documento_full_context(self):
         chat = MagicMock()
@@ -37,27 +49,28 @@ class TestUploadDocumentoFullContext:
         with patch(
             "src.domain.llm.tools.upload_documento_full_context.AzureBlob"
         ) as MockAzureBlob, patch(
-            "src.domain.llm.tools.upload_documento_full_context.StreamFileLoader"
-        ) as MockStreamFileLoader, patch(
-            "src.domain.llm.tools.upload_documento_full_context.asyncio.get_event_loop",
-            return_value=AsyncMock(),
-        ) as MockEventLoop, patch.object(
+            "src.domain.llm.tools.upload_documento_full_context.ParserPool.executar",
+            new_callable=AsyncMock,
+            return_value="fake_content",
+        ), patch(
+            "src.domain.llm.tools.upload_documento_full_context.montar_documentos",
+            return_value=[
+                Document(page_content="fake_content"),
+                Document(page_content="fake_content"),
+            ],
+        ), patch.object(
+            upload_documento_full_context,
+            "_find_documentos_utilizados",
+            new_callable=AsyncMock,
+            return_value=[ItemSistema(nome="a.pdf", usuario="u", nome_blob="a")],
+        ), patch.object(
             upload_documento_full_context,
             "_gerar_resumo_final_focado",
             return_value={"output_text": "fake_summary"},
         ) as mock_gerar_resumo:
 
             mock_azb_instance = MockAzureBlob.return_value
-            mock_azb_instance.download_blob_as_stream.return_value = b"fake_data"
-
-            mock_loader_instance = MockStreamFileLoader.return_value
-            mock_loader_instance.load_list.return_value = [
-                {"page_content": "fake_content"}
-            ]
-
-            upload_documento_full_context.llm.return_value = MagicMock(
-                content="fake_summary"
-            )
+            mock_azb_instance.download_blob = AsyncMock(return_value=b"fake_data")
 
             result = (
                 await upload_documento_full_context.sumarizar_upload_documento_focado()
@@ -67,6 +80,94 @@ class TestUploadDocumentoFullContext:
             assert result["output"] == "fake_summary"
             mock_gerar_resumo.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_carregar_documentos_paralelo_e_ordenado(
+        self, upload_documento_full_context
+    ):
+        em_download, maximo = 0, 0
+
+        async def download_blob(container_name, filename):
+            nonlocal em_download, maximo
+            em_download += 1
+            maximo = max(maximo, em_download)
+            # o primeiro documento é o último a ser baixado
+            await asyncio.sleep(0.03 if filename == "b0" else 0.01)
+            em_download -= 1
+
+            return filename.encode()
+
+        docs_sel = [
+            ItemSistema(nome=f"doc{i}.csv", usuario="u", nome_blob=f"b{i}")
+            for i in range(5)
+        ]
+
+        with patch(
+            "src.domain.llm.tools.upload_documento_full_context.AzureBlob"
+        ) as MockAzureBlob, patch(
+            "src.domain.llm.tools.upload_documento_full_context.FULL_CONTEXT_DOWNLOAD_CONCORRENCIA",
+            3,
+        ), patch(
+            "src.domain.llm.tools.upload_documento_full_context.extrair_conteudo",
+            side_effect=lambda data, nome: f"{nome}:{data.decode()}|",
+        ):
+            MockAzureBlob.return_value.download_blob = download_blob
+
+            docs = await upload_documento_full_context._carregar_documentos(docs_sel)
+
+        assert maximo == 3
+        assert docs[0].page_content == (
+            "doc0.csv:b0|doc1.csv:b1|doc2.csv:b2|doc3.csv:b3|doc4.csv:b4|\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_carregar_documentos_desconsidera_documento_lento(
+        self, upload_documento_full_context
+    ):
+        async def download_blob(container_name, filename):
+            if filename == "lento":
+                await asyncio.sleep(10)
+
+            return b"conteudo"
+
+        docs_sel = [
+            ItemSistema(nome="lento.csv", usuario="u", nome_blob="lento"),
+            ItemSistema(nome="rapido.csv", usuario="u", nome_blob="rapido"),
+        ]
+
+        with patch(
+            "src.domain.llm.tools.upload_documento_full_context.AzureBlob"
+        ) as MockAzureBlob, patch(
+            "src.domain.llm.tools.upload_documento_full_context.FULL_CONTEXT_TIMEOUT_DOCUMENTO",
+            0.05,
+        ), patch(
+            "src.domain.llm.tools.upload_documento_full_context.extrair_conteudo",
+            side_effect=lambda data, nome: nome,
+        ):
+            MockAzureBlob.return_value.download_blob = download_blob
+
+            docs = await upload_documento_full_context._carregar_documentos(docs_sel)
+
+        assert docs[0].page_content == "rapido.csv\n"
+
+    @pytest.mark.asyncio
+    async def test_carregar_documentos_nenhum_carregado(
+        self, upload_documento_full_context
+    ):
+        docs_sel = [ItemSistema(nome="a.csv", usuario="u", nome_blob="a")]
+
+        with patch(
+            "src.domain.llm.tools.upload_documento_full_context.AzureBlob"
+        ) as MockAzureBlob:
+            MockAzureBlob.return_value.download_blob = AsyncMock(return_value=None)
+
+            with pytest.raises(ServiceException) as exc_info:
+                await upload_documento_full_context._carregar_documentos(docs_sel)
+
+        assert (
+            exc_info.value.args[0]
+            == "Não foi possível carregar os documentos selecionados"
+        )
+
     @pytest.mark.asyncio
     async def test_execute(self, upload_documento_full_context):
         with patch.object(
@@ -1,9 +1,12 @@
+import asyncio
 import io
+import zipfile
 from io import BytesIO
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from aioresponses import aioresponses
+from azure.core.exceptions import HttpResponseError
 from fastapi import UploadFile
 from starlette import status
 
@@ -13,7 +16,7 @@ from src.infrastructure.azure_blob.azure_blob import AzureBlob
 from src.infrastructure.cognitive_search import cognitive_search
 from src.infrastructure.security_tokens import DecodedToken
 from src.service import upload_service
-from tests.util.mock_objects import MockObjects
+from tests.util.mock_objects import AsyncIterator, MockObjects
 
 
 @pytest.fixture
@@ -148,6 +151,14 @@ class TestUploadService:
         yield mock
         mocker.stopall()
 
+    @pytest.fixture
+    def _download_blob_em_partes(self, mocker):
+        mock = mocker.AsyncMock()
+        mocker.patch.object(AzureBlob, "download_blob_em_partes", mock)
+
+        yield mock
+        mocker.stopall()
+
     @pytest.fixture
     def _copiar_item(self, mocker):
         mock = mocker.AsyncMock()
@@ -577,18 +588,96 @@ class TestUploadService:
         assert resposta.headers.values()[0] == "attachment;filename=Teste.zip"
 
     @pytest.mark.asyncio
-    async def test_download_arquivo(self, _download_blob):
-        _download_blob.return_value = BytesIO()
+    async def test_download_arquivo(self, _download_blob_em_partes):
+        _download_blob_em_partes.return_value = (
+            MagicMock(size=10),
+            AsyncIterator([b"Teste", b"Teste"]),
+        )
         resposta = await upload_service.download_arquivo(MockObjects.mock_item_sistema)
         assert resposta.headers.values()[0] == "attachment;filename=Nome_Teste"
+        assert resposta.status_code == status.HTTP_200_OK
+        assert resposta.headers["content-length"] == "10"
+        assert [parte async for parte in resposta.body_iterator] == [
+            b"Teste",
+            b"Teste",
+        ]
 
     @pytest.mark.asyncio
-    async def test_download_arquivo_exception(self, _download_blob):
-        _download_blob.side_effect = Exception("Teste exception")
+    async def test_download_arquivo_exception(self, _download_blob_em_partes):
+        _download_blob_em_partes.side_effect = Exception("Teste exception")
         with pytest.raises(Exception) as exc_info:
             await upload_service.download_arquivo(MockObjects.mock_item_sistema)
         assert exc_info.value.args[0] == "Teste exception"
 
+    @pytest.mark.asyncio
+    async def test_download_arquivo_intervalo(self, _download_blob_em_partes):
+        arquivo = ItemSistema(
+            nome="Teste", usuario="Teste", nome_blob="abc123-1000.pdf"
+        )
+        _download_blob_em_partes.return_value = (
+            MagicMock(size=100, properties=MagicMock(size=1000)),
+            AsyncIterator([b"x" * 100]),
+        )
+
+        resposta = await upload_service.download_arquivo(arquivo, "bytes=100-199")
+
+        _download_blob_em_partes.assert_awaited_once_with(
+            container_name=upload_service.CONTAINER_NAME,
+            filename="abc123-1000.pdf",
+            offset=100,
+            length=100,
+        )
+        assert resposta.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert resposta.headers["content-range"] == "bytes 100-199/1000"
+        assert resposta.headers["etag"] == '"abc123-1000"'
+        assert resposta.headers["accept-ranges"] == "bytes"
+
+    @pytest.mark.asyncio
+    async def test_download_arquivo_intervalo_nao_suportado(
+        self, _download_blob_em_partes
+    ):
+        _download_blob_em_partes.return_value = (MagicMock(size=10), AsyncIterator([]))
+
+        resposta = await upload_service.download_arquivo(
+            MockObjects.mock_item_sistema, "bytes=-500"
+        )
+
+        assert resposta.status_code == status.HTTP_200_OK
+        assert _download_blob_em_partes.call_args.kwargs["offset"] is None
+
+    @pytest.mark.asyncio
+    async def test_download_arquivo_intervalo_alem_do_fim(
+        self, _download_blob_em_partes
+    ):
+        erro = HttpResponseError("InvalidRange")
+        erro.status_code = status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        _download_blob_em_partes.side_effect = [
+            erro,
+            (MagicMock(size=10), AsyncIterator([])),
+        ]
+
+        resposta = await upload_service.download_arquivo(
+            MockObjects.mock_item_sistema, "bytes=5000-"
+        )
+
+        assert resposta.status_code == status.HTTP_200_OK
+        assert "content-range" not in resposta.headers
+        assert _download_blob_em_partes.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_download_arquivo_nao_modificado(self, _download_blob_em_partes):
+        arquivo = ItemSistema(
+            nome="Teste", usuario="Teste", nome_blob="abc123-1000.pdf"
+        )
+
+        resposta = await upload_service.download_arquivo(
+            arquivo, if_none_match='W/"outro", "abc123-1000"'
+        )
+
+        assert resposta.status_code == status.HTTP_304_NOT_MODIFIED
+        assert resposta.headers["etag"] == '"abc123-1000"'
+        _download_blob_em_partes.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_download_pasta_zipada(self, _download_blob):
         _download_blob.return_value = b"Teste: \x00\x01"
@@ -597,6 +686,12 @@ class TestUploadService:
         resposta = await upload_service.download_pasta_zipada(mock_pasta)
         assert resposta.headers.values()[0] == "attachment;filename=Nome_Teste.zip"
 
+        conteudo = b"".join([parte async for parte in resposta.body_iterator])
+
+        with zipfile.ZipFile(BytesIO(conteudo)) as zip_file:
+            assert zip_file.namelist() == ["Nome Teste"]
+            assert zip_file.read("Nome Teste") == b"Teste: \x00\x01"
+
     @pytest.mark.asyncio
     async def test_download_pasta_zipada_falha_ao_selecionar_arquivos(
         self, _download_blob
@@ -616,10 +711,91 @@ class TestUploadService:
         _download_blob.side_effect = Exception("Teste Exception")
         mock_pasta = MockObjects.mock_item_sistema
         mock_pasta.arquivos = [MockObjects.mock_item_sistema]
+        resposta = await upload_service.download_pasta_zipada(mock_pasta)
+        # a resposta é iniciada antes do download dos arquivos
         with pytest.raises(Exception) as exc_info:
-            await upload_service.download_pasta_zipada(mock_pasta)
+            async for _ in resposta.body_iterator:
+                pass
         assert exc_info.value.args[0] == "Teste Exception"
 
+    @pytest.mark.asyncio
+    async def test_download_pasta_zipada_excede_tamanho_maximo(
+        self, _download_blob, mocker
+    ):
+        mocker.patch.object(upload_service, "ZIP_TAMANHO_MAXIMO", 100)
+        mock_pasta = ItemSistema(nome="Pasta", usuario="Teste")
+        mock_pasta.arquivos = [
+            ItemSistema(nome="a.txt", usuario="Teste", tamanho="60"),
+            ItemSistema(nome="b.txt", usuario="Teste", tamanho="60"),
+        ]
+        with pytest.raises(ServiceException) as exc_info:
+            await upload_service.download_pasta_zipada(mock_pasta)
+        assert (
+            exc_info.value.args[0]
+            == "A pasta excede o tamanho máximo permitido para download"
+        )
+        _download_blob.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generate_zip_stream_limita_downloads_antecipados(self, mocker):
+        mocker.patch.object(upload_service, "ZIP_DOWNLOAD_CONCORRENCIA", 2)
+        mocker.patch.object(upload_service, "BLOB_DOWNLOAD_TAMANHO_PARTE", 4)
+        iniciados = []
+
+        async def download_blob(container_name, filename):
+            iniciados.append(filename)
+            return filename.encode() * 3
+
+        azb = MagicMock()
+        azb.download_blob = download_blob
+        arquivos = [
+            ItemSistema(nome=f"arquivo{i}.txt", usuario="Teste", nome_blob=f"b{i}")
+            for i in range(4)
+        ]
+
+        zip_stream = upload_service.generate_zip_stream(arquivos, azb)
+
+        # o cabeçalho do primeiro arquivo é enviado antes do seu download
+        primeiro = await zip_stream.__anext__()
+        assert primeiro.startswith(b"PK\x03\x04")
+        assert iniciados == []
+
+        partes = [primeiro] + [parte async for parte in zip_stream]
+
+        assert iniciados == ["b0", "b1", "b2", "b3"]
+        with zipfile.ZipFile(BytesIO(b"".join(partes))) as zip_file:
+            assert zip_file.testzip() is None
+            assert zip_file.read("arquivo3.txt") == b"b3b3b3"
+
+    @pytest.mark.asyncio
+    async def test_generate_zip_stream_cancela_downloads_ao_encerrar(self):
+        download = asyncio.Event()
+
+        async def download_blob(container_name, filename):
+            await download.wait()
+
+        azb = MagicMock()
+        azb.download_blob = download_blob
+        arquivos = [
+            ItemSistema(nome=f"arquivo{i}.txt", usuario="Teste", nome_blob=f"b{i}")
+            for i in range(3)
+        ]
+
+        zip_stream = upload_service.generate_zip_stream(arquivos, azb)
+        await zip_stream.__anext__()
+        tarefas = [
+            tarefa
+            for tarefa in asyncio.all_tasks()
+            if tarefa is not asyncio.current_task()
+        ]
+
+        # desconexão do cliente
+        await zip_stream.aclose()
+        await asyncio.sleep(0)
+
+        assert tarefas
+        assert all(tarefa.cancelled() for tarefa in tarefas)
+
     @pytest.mark.asyncio
     async def test_copiar_itens(self, _copiar_item):
         _copiar_item.return_value = MockObjects.mock_item_sistema
@@ -0,0 +1,78 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+
+from src.exceptions import ServiceException
+from src.util.zip_stream import METODO_DEFLATE, METODO_STORED, ZipStreamWriter
+
+
+def gerar_zip(escritor, arquivos):
+    partes = []
+
+    for nome, conteudo in arquivos:
+        partes.append(escritor.iniciar_entrada(nome))
+
+        for inicio in range(0, len(conteudo), 3):
+            partes.append(escritor.escrever(conteudo[inicio : inicio + 3]))
+
+        partes.append(escritor.finalizar_entrada())
+
+    partes.append(escritor.finalizar())
+
+    return b"".join(partes)
+
+
+def test_zip_gerado_e_valido():
+    arquivos = [
+        ("relatório.txt", "conteúdo do relatório ".encode() * 50),
+        ("acórdão.pdf", b"%PDF-1.7 conteudo"),
+        ("vazio.txt", b""),
+    ]
+
+    conteudo = gerar_zip(ZipStreamWriter(), arquivos)
+
+    with zipfile.ZipFile(BytesIO(conteudo)) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == [nome for nome, _ in arquivos]
+
+        for nome, dados in arquivos:
+            assert zip_file.read(nome) == dados
+
+        infos = zip_file.infolist()
+
+        assert infos[0].compress_type == METODO_DEFLATE
+        assert infos[0].compress_size < infos[0].file_size
+        # formatos já comprimidos são armazenados sem compressão
+        assert infos[1].compress_type == METODO_STORED
+
+
+def test_cabecalho_emitido_antes_do_conteudo():
+    escritor = ZipStreamWriter()
+
+    cabecalho = escritor.iniciar_entrada("a.txt")
+
+    assert cabecalho.startswith(b"PK\x03\x04")
+    assert cabecalho.endswith(b"a.txt")
+
+
+def test_entrada_nao_finalizada():
+    escritor = ZipStreamWriter()
+    escritor.iniciar_entrada("a.txt")
+
+    with pytest.raises(ServiceException) as exc_info:
+        escritor.iniciar_entrada("b.txt")
+
+    assert exc_info.value.args[0] == "A entrada anterior do zip não foi finalizada"
+
+
+def test_tamanho_maximo():
+    escritor = ZipStreamWriter(tamanho_maximo=100)
+    escritor.iniciar_entrada("a.pdf")
+
+    with pytest.raises(ServiceException) as exc_info:
+        escritor.escrever(b"x" * 100)
+
+    assert (
+        exc_info.value.args[0] == "O arquivo zip excede o tamanho máximo permitido"
+    )